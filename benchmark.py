@@ -0,0 +1,214 @@
+import argparse
+import contextlib
+import glob
+import json
+import os
+import statistics
+import sys
+import time
+
+from lien_extraction import (
+    extract_company_name,
+    extract_address,
+    extract_dollar_amount,
+    extract_full_name,
+    get_merged_text,
+    get_claimant,
+    get_contractor,
+    get_owner,
+    get_property_address,
+    get_claimant_phone,
+)
+
+FIXTURES_DIR = "fixtures"
+STRUCTURED_DIR = os.path.join(FIXTURES_DIR, "structured")
+MERGED_TEXT_DIR = os.path.join(FIXTURES_DIR, "merged_text")
+BASELINE_FILE = os.path.join(FIXTURES_DIR, "benchmark_baseline.json")
+# The baseline holds outputs only. Timings differ between machines, so latency is only
+# compared against an earlier --output run passed as --timings.
+
+# Each benchmark is (input kind, function). "text" functions run over the merged-text
+# samples plus the merged text of every structuredData.json fixture, "json" functions
+# run over the structuredData.json paths directly.
+BENCHMARKS = {
+    "extract_company_name": ("text", extract_company_name),
+    "extract_address": ("text", extract_address),
+    "extract_dollar_amount": ("json", extract_dollar_amount),
+    "extract_full_name": ("json", extract_full_name),
+    "get_merged_text": ("json", get_merged_text),
+    "get_claimant": ("text", get_claimant),
+    "get_contractor": ("text", get_contractor),
+    "get_owner": ("text", get_owner),
+    "get_property_address": ("text", get_property_address),
+    "get_claimant_phone": ("text", get_claimant_phone),
+}
+
+def load_corpus():
+    json_inputs = {}
+    for path in sorted(glob.glob(os.path.join(STRUCTURED_DIR, "*.json"))):
+        json_inputs[os.path.basename(path)] = path
+
+    text_inputs = {}
+    for path in sorted(glob.glob(os.path.join(MERGED_TEXT_DIR, "*.txt"))):
+        with open(path, "r", encoding="utf-8") as file:
+            text_inputs[os.path.basename(path)] = file.read().strip()
+    for name, path in json_inputs.items():
+        text_inputs[name] = get_merged_text(path)
+
+    return {"text": text_inputs, "json": json_inputs}
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    index = (len(ordered) - 1) * pct / 100
+    lower = int(index)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (index - lower)
+
+def normalize_output(value):
+    # Tuples and lists compare equal once they have been through JSON.
+    return json.loads(json.dumps(value))
+
+def run_benchmark(fn, inputs, iterations, warmup):
+    latencies = []
+    outputs = {}
+
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        for _ in range(warmup):
+            for value in inputs.values():
+                fn(value)
+
+        started = time.perf_counter()
+        for iteration in range(iterations):
+            for name, value in inputs.items():
+                call_started = time.perf_counter()
+                result = fn(value)
+                latencies.append(time.perf_counter() - call_started)
+                if iteration == 0:
+                    outputs[name] = normalize_output(result)
+        elapsed = time.perf_counter() - started
+
+    return {
+        "calls": len(latencies),
+        "throughput": len(latencies) / elapsed if elapsed else 0.0,
+        "mean_ms": statistics.fmean(latencies) * 1000 if latencies else 0.0,
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p90_ms": percentile(latencies, 90) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+        "outputs": outputs,
+    }
+
+def compare_outputs(name, result, baseline):
+    failures = []
+    for input_name, expected in baseline.get("outputs", {}).items():
+        actual = result["outputs"].get(input_name)
+        if actual != expected:
+            failures.append(f"{name}[{input_name}]: output changed {expected!r} -> {actual!r}")
+    return failures
+
+def compare_timings(name, result, previous_result, threshold):
+    """
+    Latency regressions against an earlier run of this benchmark on the same machine.
+    """
+    failures = []
+    for metric in ("p50_ms", "p90_ms"):
+        previous = previous_result.get(metric)
+        if previous and result[metric] > previous * (1 + threshold):
+            failures.append(f"{name}: {metric} regressed {previous:.2f} -> {result[metric]:.2f} "
+                            f"(threshold {threshold:.0%})")
+    return failures
+
+def print_report(results):
+    print(f"{'function':<24}{'calls':>7}{'calls/s':>10}{'p50 ms':>10}{'p90 ms':>10}{'p99 ms':>10}")
+    for name, result in results.items():
+        if "error" in result:
+            print(f"{name:<24}  failed: {result['error']}")
+            continue
+        print(f"{name:<24}{result['calls']:>7}{result['throughput']:>10.1f}"
+              f"{result['p50_ms']:>10.2f}{result['p90_ms']:>10.2f}{result['p99_ms']:>10.2f}")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the field-extraction functions over the fixture corpus.")
+    parser.add_argument("--iterations", type=int, default=5)
+    parser.add_argument("--warmup", type=int, default=1)
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="allowed latency regression over --timings, as a fraction")
+    parser.add_argument("--only", nargs="*", choices=sorted(BENCHMARKS), help="run only these functions")
+    parser.add_argument("--baseline", default=BASELINE_FILE)
+    parser.add_argument("--update-baseline", action="store_true",
+                        help="record the current outputs as the new baseline")
+    parser.add_argument("--output", help="write the full results as JSON to this path")
+    parser.add_argument("--timings",
+                        help="an earlier --output file from this machine; fail on latency regressions against it")
+    args = parser.parse_args(argv)
+
+    corpus = load_corpus()
+    names = args.only or list(BENCHMARKS)
+
+    results = {}
+    for name in names:
+        kind, fn = BENCHMARKS[name]
+        try:
+            results[name] = run_benchmark(fn, corpus[kind], args.iterations, args.warmup)
+        except Exception as e:
+            results[name] = {"error": f"{type(e).__name__}: {e}"}
+
+    print_report(results)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(results, file, indent=2)
+
+    if args.update_baseline:
+        failed = [name for name, result in results.items() if "error" in result]
+        if failed:
+            print(f"❌ Not recording a baseline, {', '.join(failed)} failed.")
+            return 1
+        baseline = {}
+        if os.path.isfile(args.baseline):
+            with open(args.baseline, "r", encoding="utf-8") as file:
+                baseline = json.load(file)
+        # Only outputs: timings depend on the machine and are compared with --timings.
+        baseline.update({name: {"outputs": result["outputs"]} for name, result in results.items()})
+        with open(args.baseline, "w", encoding="utf-8") as file:
+            json.dump(baseline, file, indent=2)
+        print(f"Baseline written to {args.baseline}")
+        return 0
+
+    if not os.path.isfile(args.baseline):
+        print(f"❌ No baseline at {args.baseline}; run with --update-baseline to record one.")
+        return 1
+
+    with open(args.baseline, "r", encoding="utf-8") as file:
+        baseline = json.load(file)
+
+    previous_results = {}
+    if args.timings:
+        with open(args.timings, "r", encoding="utf-8") as file:
+            previous_results = json.load(file)
+
+    failures = []
+    for name, result in results.items():
+        if "error" in result:
+            failures.append(f"{name}: {result['error']}")
+        elif name not in baseline:
+            failures.append(f"{name}: no baseline entry; record it with --update-baseline --only {name}")
+        else:
+            failures.extend(compare_outputs(name, result, baseline[name]))
+            if name in previous_results and "error" not in previous_results[name]:
+                failures.extend(compare_timings(name, result, previous_results[name], args.threshold))
+
+    for failure in failures:
+        print(f"❌ {failure}")
+    if failures:
+        return 1
+
+    if args.timings:
+        print("✅ Outputs match the baseline and no latency regressions found.")
+    else:
+        print("✅ Outputs match the baseline (timings reported only; pass --timings to compare them).")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
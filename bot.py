@@ -1,90 +1,70 @@
+import argparse
 import asyncio
+import calendar
 import os
-from datetime import datetime
+from datetime import date
 import re
+import shutil
 import subprocess
-from sdk.extract_text_info_from_pdf import ExtractTextInfoFromPDF
-from sdk.extract_text_info_with_char_bounds_from_pdf import ExtractTextInfoWithCharBoundsFromPDF
-import json
-import spacy
-from spacy.matcher import Matcher
-import zipfile
-import usaddress
-import phonenumbers
-import pandas as pd
-from openpyxl import load_workbook, Workbook
+from sdk.extraction_service import (ExtractionError, ExtractionQuotaError, get_extraction_service,
+                                    get_scanned_extraction_service)
+from lien_extraction import (get_gazetteer, get_merged_text, parse_cheap_fields, parse_document, read_page_texts,
+                             remove_watermark, remove_zip_file, unzip_file)
+from dedup import (DEDUP_FILE, FLAG_THRESHOLD, REUSE_THRESHOLD, DuplicateIndex, diff_fields, minhash_signature,
+                   text_hash)
+from page_select import build_subset_pdf, missing_required_fields, select_pages
 from playwright.async_api import async_playwright
-
-TARGET_URL = "https://www.okcc.online/index.php"
+from throttle import (AdaptiveLimiter, RetryPolicy, RetryQueue, RetryableError, THROTTLE_STATUSES,
+                      TRANSIENT_STATUSES, call_with_retry, parse_retry_after)
+from journal import JOURNAL_FILE, CheckpointJournal
+from lien_extraction.tracing import span, traced, tracer
+from result_store import HEADERS as RESULT_HEADERS, RESULT_DB, ResultStore
+from session import BrowserSession
+
+# Point OKCC_BASE_URL at mock_okcc.py to run the whole pipeline offline.
+BASE_URL = os.getenv("OKCC_BASE_URL", "https://www.okcc.online").rstrip("/")
+TARGET_URL = f"{BASE_URL}/index.php"
+DOCUMENT_URL = f"{BASE_URL}/document.php"
+HEADLESS = os.getenv("OKCC_HEADLESS", "0") == "1"
+SEARCH_WAIT_SECONDS = float(os.getenv("OKCC_SEARCH_WAIT", "120"))
+VIEWER_WAIT_SECONDS = float(os.getenv("OKCC_VIEWER_WAIT", "5"))
+ROW_DELAY_SECONDS = float(os.getenv("OKCC_ROW_DELAY", "2"))
 CSV_FILE = "result.csv"
+# Exported from the result store at the end of every run.
 XLSX_FILE = "result.xlsx"
+EXTRACTION_CACHE_DIR = os.getenv("EXTRACTION_CACHE_DIR", "extraction_cache")
 
 TABLE_HEADER_SELECTOR = "#rod-table thead tr th"
 TABLE_ROW_SELECTOR = "#rodinitialbody tr"
 TABLE_CELL_SELECTOR = "td"
+NEXT_PAGE_SELECTOR = '#rod_type_table_row > div > div div.rod-pages:first-of-type i.fa-angle-right'
 
-nlp = spacy.load("en_core_web_sm")
 months = 3
 
-def extract_company_name(text):
-    doc = nlp(text)
-    matcher = Matcher(nlp.vocab)
-
-    company_suffixes = ["INC", "LLC", "CORP", "CORPORATION", "GROUP", "ENTERPRISES", "HOLDINGS", "DBA", "CO",
-                        "LIMITED", "PARTNERSHIP", "ASSOCIATION", "COMPANY"]
-
-    company_patterns = [
-        [{"IS_ALPHA": True, "OP": "+"}, {"TEXT": {"in": company_suffixes}}],  
-        [{"IS_ALPHA": True, "OP": "+"}, {"IS_PUNCT": True}, {"IS_ALPHA": True, "OP": "+"}, {"TEXT": {"in": company_suffixes}}],
-        [{"TEXT": {"in": ["DBA"]}}, {"IS_ALPHA": True, "OP": "+"}, {"IS_ALPHA": True, "OP": "+"}],
-    ]
-
-    for pattern in company_patterns:
-        matcher.add("COMPANY_NAME_PATTERN", [pattern])
-
-    matches = matcher(doc)
-    company_names = []
-
-    for match_id, start, end in matches:
-        span = doc[start:end]
-        
-        if span.text.strip() in company_suffixes and start > 0:
-            span = doc[start - 1:end] 
-
-        elif span.text.split()[-1] in company_suffixes and start > 0:
-            prev_token = doc[start - 1]
-            if prev_token.is_alpha:
-                span = doc[start - 1:end]
-
-        company_names.append(span.text.strip())
-
-    company_names = [name for name in company_names if not re.search(r'\d{1,5}\s\w+(\s\w+)*', name)]
-
-    if company_names:
-        company_names.sort(key=len, reverse=True)
-        return company_names[0]
-
-    match = re.search(r"([A-Za-z\s]+(?:,\s[A-Za-z\s]+)*\s*,?\s*(?:LLC|INC|CORP|CORPORATION|GROUP|ENTERPRISES|HOLDINGS|DBA|CO|LIMITED|PARTNERSHIP|ASSOCIATION)(?:\s*\([^)]+\))?)", text)
-    
-    if match:
-        return match.group(0).strip()
-
-    for ent in doc.ents:
-        if ent.label_ == "PERSON" and ent.text not in company_names:
-            company_names.append(ent.text.strip())
-
-    if company_names:
-        company_names.sort(key=len, reverse=True)
-        return company_names[0]
-
-    return None
-
-def extract_phone_number(text):
-    numbers = [match.number for match in phonenumbers.PhoneNumberMatcher(text, "US")]
-    if numbers:
-        phone_number = phonenumbers.format_number(numbers[0], phonenumbers.PhoneNumberFormat.INTERNATIONAL)
-        return phone_number.replace(" ", "-")
-    return None
+retry_policy = RetryPolicy(max_attempts=int(os.getenv("RETRY_MAX_ATTEMPTS", "5")))
+okcc_limiter = AdaptiveLimiter("okcc", initial=1, max_limit=int(os.getenv("OKCC_MAX_CONCURRENCY", "4")))
+adobe_limiter = AdaptiveLimiter("adobe", initial=2, max_limit=int(os.getenv("ADOBE_MAX_CONCURRENCY", "8")))
+
+# Set by open_services() when a run starts, so importing bot (worker.py does) creates no
+# databases or extraction credentials.
+extraction_service = None
+scanned_extraction_service = None
+duplicate_index = None
+gazetteer = None
+result_store = None
+# worker.py sets a work_queue.PolitenessGate here so all workers share one okcc request rate.
+okcc_gate = None
+
+def open_services():
+    global extraction_service, scanned_extraction_service, duplicate_index, gazetteer, result_store
+    # EXTRACTION_SERVICE=fake swaps Adobe for fixture-backed local extraction.
+    extraction_service = get_extraction_service()
+    # OCR_SCANNED=1 sends image-only liens to local Tesseract instead.
+    scanned_extraction_service = get_scanned_extraction_service()
+    duplicate_index = DuplicateIndex(DEDUP_FILE)
+    # Claimants, contractors and owners of earlier liens, matched before spaCy runs.
+    gazetteer = get_gazetteer()
+    result_store = ResultStore(RESULT_DB)
 
 def ensure_playwright_browsers():
     try:
@@ -122,252 +102,6 @@ def clear_downloads_output_folder(download_path, output_path):
     else:
         print(f"Directory {output_path} does not exist.")
 
-def clear_xlsx_file():
-    if os.path.isfile(XLSX_FILE):
-        wb = Workbook()  
-        wb.save(XLSX_FILE)
-
-def fix_misplaced_decimal(amount):
-    """
-    Fix misplaced decimal formatting like "22.692.92" -> "22692.92"
-    """
-    amount = amount.replace(" ", "").replace(",", "")  
-    parts = amount.split(".")
-    
-    if len(parts) > 2:  
-        amount = parts[0] + parts[1] + "." + parts[-1]  
-    
-    return amount
-
-def extract_dollar_amount(json_file_path):
-    with open(json_file_path, 'r', encoding='utf-8') as file:
-        data = json.load(file)
-
-    patterns = [
-        r"of \$\s?([\d,]+\.\d{1,2})",
-        r"\(\$\s?([\d,]+\.\d{1,2})\)",
-        r"\$\s?([\d,]+\.\d{1,2}) due",
-        r"is \$\s?([\d,]+\.\d{1,2})",
-        r"total \$\s?([\d,]+\.\d{1,2})",
-        r"is\$\s?([\d,]+\.\d{1,2})",
-        r"of\$\s?([\d,]+\.\d{1,2})",
-        r"j\$([\d,]+\.\d{1,2})",
-        r"j \$([\d,]+\.\d{1,2})"
-    ]
-
-    all_amounts = []
-    elements = data.get("elements", [])
-    
-    for i, element in enumerate(elements):
-        text = element.get("Text", "")
-
-        for pattern in patterns:
-            match = re.search(pattern, text)
-            if match:
-                return fix_misplaced_decimal(match.group(1))
-
-        dollar_matches = re.findall(r"\$\s?([\d,]+\.\d{1,2})", text)
-        all_amounts.extend(fix_misplaced_decimal(m) for m in dollar_matches)
-
-        if "Principal amount of claim:" in text:
-            for j in range(1, 3):
-                if i + j < len(elements):
-                    next_text = elements[i + j].get("Text", "")
-                    next_dollar_matches = re.findall(r"\$\s?([\d,]+\.\d{1,2})", next_text)
-                    if next_dollar_matches:
-                        return fix_misplaced_decimal(next_dollar_matches[0]) 
-
-    if all_amounts:
-        return max(all_amounts, key=lambda x: float(x.replace(",", "")))
-
-    return "0"
-
-def extract_full_name(json_file_path):
-    with open(json_file_path, 'r', encoding='utf-8') as file:
-        data = json.load(file)
-
-    full_names = []  
-    priority_name = None  
-
-    for element in data.get("elements", []):
-        text = element.get("Text", "")
-        doc = nlp(text)
-
-        for ent in doc.ents:
-            if ent.label_ == "PERSON":
-                name_parts = ent.text.split()
-
-                if len(name_parts) > 1:  
-                    full_names.append(ent.text)
-                
-                match = re.search(r"against\s+" + re.escape(ent.text), text, re.IGNORECASE)
-                if match:
-                    priority_name = ent.text  
-
-    return priority_name if priority_name else (full_names[0] if full_names else None)
-
-def extract_address(text):
-    try:
-        if not text:
-            return None, None, None, None
-
-        def clean_text(text):
-            return re.sub(r'[^\x00-\x7F]+', ' ', text).strip()
-
-        text = clean_text(text)
-        text = re.sub(r'\s+', ' ', text)
-
-        print("Cleaned Text:", text)  
-
-        try:
-            parsed_address = usaddress.parse(text)
-            print("usaddress.parse output:", parsed_address) 
-
-            address_number = None
-            street_name = []
-            street_name_post_type = None
-            place_name = None
-            state_name = None
-            zip_code = None
-
-            for component, label in parsed_address:
-                if label == "AddressNumber" and not address_number:
-                    address_number = component
-                elif label == "StreetName" and not street_name:
-                    street_name.append(component)
-                elif label == "StreetNamePostType" and not street_name_post_type:
-                    street_name_post_type = component
-                elif label == "PlaceName" and not place_name:
-                    place_name = component.strip(",")
-                elif label == "StateName" and not state_name:
-                    state_name = component
-                elif label == "ZipCode" and not zip_code:
-                    zip_code = component
-
-            if address_number and street_name and street_name_post_type:
-                best_address = " ".join([address_number] + street_name + [street_name_post_type])
-            elif street_name:
-                best_address = " ".join([address_number] + street_name) if address_number else " ".join(street_name)
-
-            best_city = place_name
-            best_state = state_name
-            best_zipcode = zip_code
-
-            print("Final Address:", best_address, best_city, best_state, best_zipcode)
-
-        except usaddress.RepeatedLabelError:
-            print("usaddress.parse failed")
-
-        return best_address, best_city, best_state, best_zipcode
-
-    except Exception as e:
-        print(f"Error in extract_address: {e}")
-        return None, None, None, None
-        
-def get_merged_text(file_path: str) -> str:
-    with open(file_path, 'r') as file:
-        json_data = json.load(file)
-
-    merged_text = ""
-    for element in json_data.get("elements", []):
-        if "Text" in element:
-            merged_text += element["Text"] + " "
-    
-    return merged_text.strip()
-
-def get_claimant(text):
-    claimant_match = re.search(r'claimant:\s*(\S+(?:\s+\S+){0,19})', text, re.IGNORECASE | re.DOTALL)
-    if claimant_match:
-        claimant_text = claimant_match.group(1).strip()
-        print("~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~")
-        print(f"claimant: {claimant_text}")
-        claimant_name = extract_company_name(claimant_text)
-        if claimant_name:
-            return claimant_name
-
-    claims_match = re.search(r'(\S+(?:\s+\S+){0,19})\s+\b(?:claims|against|upon)\b', text, re.IGNORECASE | re.DOTALL)
-    if claims_match:
-        claimant_text = claims_match.group(1).strip()
-        print("~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~")
-        print(f"claimant: {claimant_text}")
-        claimant_name = extract_company_name(claimant_text)
-        if claimant_name:
-            return claimant_name
-
-    return None
-
-def get_contractor(text):
-    contractor_match = re.search(r'\b(?:Contractor|Customer|claims|against|upon):?\s*(\S+(?:\s+\S+){0,29})', text, re.IGNORECASE | re.DOTALL)
-    if contractor_match:
-        contractor_text = contractor_match.group(1).strip()
-        print("~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~")
-        print(f"contractor: {contractor_text}")
-        contractor_name = extract_company_name(contractor_text)
-        if contractor_name:
-            return contractor_name
-
-    return None
-
-def get_owner(text):
-    owner_match = re.search(r'\b(?:Owner|Owners|owned by|owned)\b:?\s*(\S+(?:\s+\S+){0,29})', text, re.IGNORECASE | re.DOTALL)
-    if owner_match:
-        owner_text = owner_match.group(1).strip()
-        print("~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~")
-        print(f"owner: {owner_text}")
-        owner_name = extract_company_name(owner_text)
-        if owner_name:
-            return owner_name
-
-    return None
-
-def get_property_address(text):
-    property_match = re.search(r'\b(?:property:|contract:|notice to:|prepared by:|following:)\b:?\s*(\S+(?:\s+\S+){0,29})', text, re.IGNORECASE | re.DOTALL)
-    if property_match:
-        property_text = property_match.group(1).strip()
-        print("~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~")
-        print(f"property: {property_text}")
-        address, city, state, zip = extract_address(property_text)
-        if address or city or state or zip:
-            return address, city, state, zip
-
-    property_match = re.search(r'\b(?:against|upon)\b:?\s*(\S+(?:\s+\S+){0,49})', text, re.IGNORECASE | re.DOTALL)
-    if property_match:
-        property_text = property_match.group(1).strip()
-        print("~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~")
-        print(f"property: {property_text}")
-        address, city, state, zip = extract_address(property_text)
-        if address or city or state or zip:
-            return address, city, state, zip
-
-    return None, None, None, None
-
-def get_claimant_phone(text):
-    claimant_match = re.search(r'claimant:\s*(\S+(?:\s+\S+){0,29})', text, re.IGNORECASE | re.DOTALL)
-    if claimant_match:
-        claimant_text = claimant_match.group(1)
-        phone = extract_phone_number(claimant_text)
-        if phone:
-            return phone
-
-    claims_match = re.search(r'(\S+(?:\s+\S+){0,29})\s+\b(?:claims|against|upon)\b', text, re.IGNORECASE | re.DOTALL)
-    if claims_match:
-        claimant_text = claims_match.group(1)
-        phone = extract_phone_number(claimant_text)
-        if phone:
-            return phone
-
-    return None
-
-def unzip_file(zip_file_path, output_folder):
-    with zipfile.ZipFile(zip_file_path, 'r') as zip_ref:
-        zip_ref.extractall(output_folder)
-
-def remove_zip_file(zip_file_path):
-    try:
-        os.remove(zip_file_path)
-    except Exception as e:
-        print(f"Error removing zip file: {e}")
-
 async def set_table_headers(page) -> list:
     header_titles = []
     header_titles.append("File")
@@ -385,268 +119,523 @@ async def set_table_headers(page) -> list:
     header_titles.append("Property Zip")
     header_titles.append("Dollar Amount")
     header_titles.append("Phone Number")
+    header_titles.append("Duplicate Of")
     return header_titles
 
-async def download_pdf(page, key: str, docid: str) -> bool:
+async def open_pdf_viewer(page, key: str, docid: str):
+    if okcc_gate:
+        await okcc_gate.wait()
+
     pdf_url = None
     def response_handler(response):
         nonlocal pdf_url
-        if response.url.startswith("https://www.okcc.online/document.php") and response.headers.get('content-type', '').startswith('application/pdf'):
+        if response.url.startswith(DOCUMENT_URL) and response.headers.get('content-type', '').startswith('application/pdf'):
             pdf_url = response.url
 
     page.on('response', response_handler)
+    try:
+        await page.evaluate(f'OpenP("{key}", document.body, "{docid}");')
+        await asyncio.sleep(VIEWER_WAIT_SECONDS)
+    finally:
+        # One handler per row would otherwise stay attached for the rest of the run.
+        page.remove_listener('response', response_handler)
 
-    await page.evaluate(f'OpenP("{key}", document.body, "{docid}");')
-    await asyncio.sleep(5)
+    if pdf_url:
+        await page.click(".pdf-close")
+        await asyncio.sleep(ROW_DELAY_SECONDS)
 
+    return pdf_url
+
+@traced("download")
+async def fetch_pdf(page, pdf_url: str, docid: str) -> str:
     download_path = os.path.join(os.getcwd(), 'downloads')
     os.makedirs(download_path, exist_ok=True)
 
-    if pdf_url:
+    async def fetch():
+        if okcc_gate:
+            await okcc_gate.wait()
         response = await page.request.get(pdf_url)
+        if response.status in THROTTLE_STATUSES:
+            retry_after = parse_retry_after(response.headers.get('retry-after'))
+            raise RetryableError(f"okcc returned {response.status}", retry_after=retry_after, throttled=True)
+        if response.status in TRANSIENT_STATUSES:
+            raise RetryableError(f"okcc returned {response.status}")
+        if not response.ok:
+            raise RuntimeError(f"okcc returned {response.status}")
+        return await response.body()
+
+    pdf_content = await call_with_retry(okcc_limiter, fetch, retry_policy)
+    pdf_path = os.path.join(download_path, f"{docid}.pdf")
+
+    with open(pdf_path, 'wb') as pdf_file:
+        pdf_file.write(pdf_content)
+
+    return pdf_path
+
+def classify_extraction_error(error):
+    if isinstance(error, ExtractionError) and error.retryable:
+        throttled = isinstance(error, ExtractionQuotaError) or error.status_code in THROTTLE_STATUSES
+        retry_after = retry_policy.max_delay if isinstance(error, ExtractionQuotaError) else None
+        return RetryableError(str(error), retry_after=retry_after, throttled=throttled)
+    return None
 
-        if response.ok:
-            pdf_content = await response.body()
-            pdf_path = os.path.join(download_path, f"{docid}.pdf")
-            
-            with open(pdf_path, 'wb') as pdf_file:
-                pdf_file.write(pdf_content)     
-        else:
-            print("❌ Failed to fetch PDF.")
-        
-        await page.click(".pdf-close")
-        await asyncio.sleep(2)
-        return True
+@traced("extract")
+async def extract_pdf(docid: str, pages: list = None, scanned: bool = False) -> str:
+    """
+    Extract the document, or only the given zero-based pages of it, into {docid}.json.
+    """
+    input_pdf_path = f"downloads/{docid}.pdf"
+    pdf_filename = os.path.splitext(os.path.basename(input_pdf_path))[0]
+
+    upload_path = input_pdf_path
+    if pages:
+        upload_path = f"downloads/pages/{docid}.pdf"
+        os.makedirs("downloads/pages", exist_ok=True)
+        with span("build_page_subset", pages=pages):
+            build_subset_pdf(input_pdf_path, upload_path, pages)
+        print(f"Uploading pages {[page + 1 for page in pages]} of {input_pdf_path} "
+              f"({os.path.getsize(upload_path)} of {os.path.getsize(input_pdf_path)} bytes).")
+
+    if scanned and scanned_extraction_service:
+        # Local OCR is bounded by its own process pool, not by an upstream's rate limits.
+        print(f"{input_pdf_path} has no text layer, running local OCR.")
+        with span("local_ocr"):
+            zip_file_path = await asyncio.to_thread(scanned_extraction_service.extract, input_pdf_path)
     else:
-        return False
+        try:
+            # The span covers upload, job submission, polling and download of the service call.
+            with span("extraction_service", bytes=os.path.getsize(upload_path)):
+                zip_file_path = await call_with_retry(
+                    adobe_limiter,
+                    lambda: asyncio.to_thread(extraction_service.extract, upload_path),
+                    retry_policy,
+                    classify=classify_extraction_error,
+                )
+        finally:
+            if upload_path != input_pdf_path and os.path.exists(upload_path):
+                os.remove(upload_path)
 
-def remove_watermark(wm_text, inputFile, outputFile):
-    from PyPDF4 import PdfFileReader, PdfFileWriter
-    from PyPDF4.pdf import ContentStream
-    from PyPDF4.generic import TextStringObject, NameObject
-    from PyPDF4.utils import b_
-    
-    with open(inputFile, "rb") as f:
-        source = PdfFileReader(f, "rb")
-        output = PdfFileWriter()
+    output_folder = "output/ExtractTextInfoWithCharBoundsFromPDF"
+        
+    # Unzip into a folder of the document's own: workers share output/.
+    unzip_folder = f"{output_folder}/{pdf_filename}"
+    with span("unzip"):
+        unzip_file(zip_file_path, unzip_folder)
+        remove_zip_file(zip_file_path)
 
-        for page in range(source.getNumPages()):
-            page = source.getPage(page)
-            content_object = page["/Contents"].getObject()
-            content = ContentStream(content_object, source)
+    json_file_path = f"{unzip_folder}/structuredData.json"
+    renamed_json_path = f"{output_folder}/{pdf_filename}.json"
 
-            for operands, operator in content.operations:
-                if operator == b_("Tj"):
-                    text = operands[0]
+    os.replace(json_file_path, renamed_json_path)
+    shutil.rmtree(unzip_folder, ignore_errors=True)
 
-                    if isinstance(text, str) and text.startswith(wm_text):
-                        operands[0] = TextStringObject('')
+    # output/ is cleared on every fresh run; the cache keeps the corpus for reprocess.py.
+    os.makedirs(EXTRACTION_CACHE_DIR, exist_ok=True)
+    shutil.copyfile(renamed_json_path, os.path.join(EXTRACTION_CACHE_DIR, f"{pdf_filename}.json"))
+    return renamed_json_path
 
-            page.__setitem__(NameObject('/Contents'), content)
-            output.addPage(page)
+async def process_pdf(docid: str) -> dict:
+    return parse_document(await extract_pdf(docid), gazetteer=gazetteer)
 
-        with open(outputFile, "wb") as outputStream:
-            output.write(outputStream)
+@traced("dedup_text_layer")
+def reuse_text_layer_duplicate(instrument_number: str, page_texts: list):
+    """
+    Fields of an already processed document with the identical PDF text layer, or None.
+    """
+    digest = text_hash(" ".join(page_texts))
+    duplicate_index.add_hash(instrument_number, "text_layer", digest)
+    match = duplicate_index.query_exact("text_layer", digest, exclude=instrument_number)
+    if not match or not match[1]:
+        return None
+
+    duplicate_of, fields = match
+    print(f"♻️ {instrument_number} has the same text as {duplicate_of}, skipping extraction.")
+    info = dict(fields, duplicate_of=f"{duplicate_of} (1.00)")
+    duplicate_index.add(instrument_number, "text_layer", None, fields=info)
+    return info
 
-async def process_pdf(docid: str) -> tuple:
-    input_pdf_path = f"downloads/{docid}.pdf"
-    pdf_filename = os.path.splitext(os.path.basename(input_pdf_path))[0]
-    ExtractTextInfoWithCharBoundsFromPDF(input_pdf_path)
-    
-    output_folder = "output/ExtractTextInfoWithCharBoundsFromPDF"
-    time_stamp = datetime.now().strftime("%Y-%m-%dT%H-%M-%S")
-    zip_file_path = f"{output_folder}/extract{time_stamp}.zip"
-        
-    unzip_file(zip_file_path, output_folder)
-    remove_zip_file(zip_file_path)
+@traced("parse")
+def parse_or_reuse(instrument_number: str, json_file_path: str) -> dict:
+    """
+    Parse the extracted document, reusing the NLP fields of a near-duplicate when close enough.
+    """
+    signature = minhash_signature(get_merged_text(json_file_path))
+    match = duplicate_index.query("merged", signature, FLAG_THRESHOLD, exclude=instrument_number)
+
+    if match and match[1] >= REUSE_THRESHOLD and match[2]:
+        duplicate_of, score, fields = match
+        # Names come from the near-duplicate; amended liens mostly change the amount, phone
+        # or address, and their extractors need no spaCy, so those are read from this one.
+        info = dict(fields, **parse_cheap_fields(json_file_path, gazetteer=gazetteer))
+        print(f"♻️ {instrument_number} near-duplicates {duplicate_of} ({score:.2f}), reusing parsed fields.")
+    else:
+        info = parse_document(json_file_path, gazetteer=gazetteer)
 
-    json_file_path = f"{output_folder}/structuredData.json"
-    renamed_json_path = f"{output_folder}/{pdf_filename}.json"
+    if match:
+        duplicate_of, score, fields = match
+        info["duplicate_of"] = f"{duplicate_of} ({score:.2f})"
+        changes = diff_fields(fields, info)
+        if changes:
+            print(f"Changes from {duplicate_of}: {changes}")
+    else:
+        info["duplicate_of"] = None
 
-    os.rename(json_file_path, renamed_json_path)    
-
-    full_text = get_merged_text(renamed_json_path)
-
-    claimant = get_claimant(full_text)
-    contractor = get_contractor(full_text)
-    owner = get_owner(full_text)
-    address, city, state, zipcode = get_property_address(full_text)
-    dollar_amount = f"${extract_dollar_amount(renamed_json_path)}"
-    phone_number = get_claimant_phone(full_text)
-
-    info: dict[str, any] = {
-        "claimant": claimant,
-        "contractor": contractor,
-        "owner": owner,
-        "address": address,
-        "city": city,
-        "state": state,
-        "zipcode": zipcode,
-        "dollar": dollar_amount,
-        "phone": phone_number,
-    }
-
-    print (f"info: {info}")
+    duplicate_index.add(instrument_number, "merged", signature, fields=info)
     return info
 
-async def scrape_table(page, headers):
-    rows = await page.query_selector_all(TABLE_ROW_SELECTOR)
+@traced("remove_watermark")
+def dewatermark_pdf(doc_id: str):
+    input_path = f"downloads/{doc_id}.pdf"
+    temp_output_path = f"downloads/{doc_id}_no_watermark.pdf"
 
-    for row in rows:
-        cells = await row.query_selector_all(TABLE_CELL_SELECTOR)
-        cell_values = [((await cell.text_content()) or "").strip() or "N/A" for cell in cells]
+    remove_watermark("UNOFFICIAL", input_path, temp_output_path)
 
-        pdf_html_element = await cells[0].query_selector("div > button:first-of-type")
-        pdf_html = await pdf_html_element.evaluate("element => element.outerHTML")
+    if os.path.exists(temp_output_path):
+        os.remove(input_path) 
+        os.rename(temp_output_path, input_path) 
+        print(f"Successfully replaced {input_path} with watermark-free version.")
+    else:
+        print("Error: Watermark removal failed, new file not created.")
 
-        match = re.search(r"OpenP\('([^']+)',this,'([^']+)'\)", str(pdf_html))
+async def handle_document(page, journal, instrument_number, cell_values, doc_id, pdf_url) -> list:
+    """
+    Fetch, de-watermark and extract one listed document, filling in its row.
 
-        if match:
-            instrument_number = match.group(1) 
-            doc_id = match.group(2) 
+    Stages already recorded in the journal are skipped, so a resumed run only does the
+    remaining work. Raises RetryableError when okcc or the extraction service kept failing.
+    """
+    with tracer.document(instrument_number, doc_id=doc_id):
+        return await run_document_stages(page, journal, instrument_number, cell_values, doc_id, pdf_url)
+
+async def run_document_stages(page, journal, instrument_number, cell_values, doc_id, pdf_url) -> list:
+    if not journal.reached(instrument_number, "downloaded"):
+        await fetch_pdf(page, pdf_url, doc_id)
+        journal.record(instrument_number, "downloaded")
+
+    if not journal.reached(instrument_number, "dewatermarked"):
+        dewatermark_pdf(doc_id)
+        journal.record(instrument_number, "dewatermarked")
+
+    cell_values[0] = f"{doc_id}.pdf"
+    print (f"cell values 0: ", cell_values)
+
+    if not journal.reached(instrument_number, "extracted"):
+        with span("read_text_layer"):
+            page_texts = read_page_texts(f"downloads/{doc_id}.pdf")
+        info = reuse_text_layer_duplicate(instrument_number, page_texts)
+        if info:
+            journal.record(instrument_number, "parsed", info=info)
         else:
-            print("Document not found!")
+            pages = select_pages(page_texts)
+            scanned = not any(text.strip() for text in page_texts)
+            json_file_path = await extract_pdf(doc_id, pages=pages, scanned=scanned)
+            journal.record(instrument_number, "extracted", json_path=json_file_path, partial=bool(pages))
 
-        downloaded = await download_pdf(page, key=instrument_number, docid=doc_id)
-        if downloaded:
-            input_path = f"downloads/{doc_id}.pdf"
-            temp_output_path = f"downloads/{doc_id}_no_watermark.pdf"
+    if journal.reached(instrument_number, "parsed"):
+        info = journal.data(instrument_number)["info"]
+    else:
+        info = parse_or_reuse(instrument_number, journal.data(instrument_number)["json_path"])
+        missing = missing_required_fields(info)
+        if journal.data(instrument_number).get("partial") and missing:
+            print(f"{instrument_number}: {missing} missing from the selected pages, extracting the full document.")
+            json_file_path = await extract_pdf(doc_id)
+            journal.record(instrument_number, "extracted", json_path=json_file_path, partial=False)
+            info = parse_or_reuse(instrument_number, json_file_path)
+        # One sighting per instrument, of its final fields; a (near-)duplicate's fields
+        # are another filing's, not a new sighting. The listing's claimant, contractor
+        # and owner cells confirm which of the extracted names are learned.
+        if gazetteer and not info.get("duplicate_of"):
+            gazetteer.learn(info, {"claimant": cell_values[6], "contractor": cell_values[7], "owner": cell_values[8]})
+        journal.record(instrument_number, "parsed", info=info)
+
+    if not cell_values[6]:
+        cell_values[6] = info["claimant"]
+    if not cell_values[7]:
+        cell_values[7] = info["contractor"]
+    # if not cell_values[8]:
+    cell_values[8] = info["owner"]
+    cell_values[9] = info["address"]
+    cell_values.append(info["city"])
+    cell_values.append(info["state"])
+    cell_values.append(info["zipcode"])
+    cell_values.append(info["dollar"])
+    cell_values.append(info["phone"])
+    cell_values.append(info.get("duplicate_of"))
+    return cell_values
+
+async def handle_document_or_queue(page, journal, instrument_number, cell_values, doc_id, pdf_url, retry_queue):
+    """
+    (row, complete) for the document, or None when it was queued for a retry.
+    """
+    try:
+        return await handle_document(page, journal, instrument_number, list(cell_values), doc_id, pdf_url), True
+    except RetryableError as e:
+        print(f"❌ {doc_id}: {e}, queued for retry.")
+        retry_queue.push((instrument_number, cell_values, doc_id, pdf_url), retry_after=e.retry_after)
+        return None
+    except Exception as e:
+        print(f"❌ {doc_id}: {e}")
+        return cell_values, False
 
-            remove_watermark("UNOFFICIAL", input_path, temp_output_path)
+async def completed(value):
+    return value
 
-            if os.path.exists(temp_output_path):
-                os.remove(input_path) 
-                os.rename(temp_output_path, input_path) 
-                print(f"Successfully replaced {input_path} with watermark-free version.")
-            else:
-                print("Error: Watermark removal failed, new file not created.")
-
-            cell_values[0] = f"{doc_id}.pdf"
-            print (f"cell values 0: ", cell_values)
-
-            info = await process_pdf(docid=doc_id)
-            if cell_values[6] == "N/A":
-                cell_values[6] = info["claimant"]
-            if cell_values[7] == "N/A":
-                cell_values[7] = info["contractor"]
-            # if cell_values[8] == "N/A":
-            cell_values[8] = info["owner"]
-            cell_values[9] = info["address"]
-            cell_values.append(info["city"])
-            cell_values.append(info["state"])
-            cell_values.append(info["zipcode"])
-            cell_values.append(info["dollar"])
-            cell_values.append(info["phone"])
-
-        save_to_xlsx([cell_values], headers=None, append=True)
-        await asyncio.sleep(2)
-
-def save_to_xlsx(data, headers, append=True):
-    if append and os.path.isfile(XLSX_FILE):
-        wb = load_workbook(XLSX_FILE)
-        ws = wb.active
-        start_row = ws.max_row 
-    else:
-        wb = Workbook()  
-        ws = wb.active
-        start_row = 1  
+def write_rows(journal, rows):
+    """
+    Upsert finished (instrument_number, cell_values, complete) rows into the store and checkpoint them as written.
 
-    if headers and start_row == 1:
-        ws.append(headers) 
+    complete marks a row whose document was extracted and parsed; the others (no PDF, an
+    error, retries given up) stay incomplete in the store and are picked up by the next run.
+    """
+    with tracer.run_span("write_rows", rows=len(rows)):
+        for complete in (True, False):
+            # Keyed on the viewer's instrument number, which the skip check in scrape_table looks up.
+            result_store.upsert_rows([dict(zip(RESULT_HEADERS, cell_values), **{"Instrument Number": instrument_number})
+                                      if instrument_number else cell_values
+                                      for instrument_number, cell_values, row_complete in rows
+                                      if row_complete == complete], complete=complete)
+        for instrument_number, _, _ in rows:
+            if instrument_number:
+                journal.record(instrument_number, "written")
+        journal.flush()
+        duplicate_index.save()
+        if gazetteer:
+            gazetteer.save()
+
+async def read_row(row) -> tuple:
+    """
+    (instrument_number, doc_id, cell_values) of a results row; the ids are None without a PDF button.
+    """
+    cells = await row.query_selector_all(TABLE_CELL_SELECTOR)
+    cell_values = [((await cell.text_content()) or "").strip() for cell in cells]
 
-    if data:
-        for row in data:
-            ws.append(row)
+    pdf_html_element = await cells[0].query_selector("div > button:first-of-type")
+    pdf_html = await pdf_html_element.evaluate("element => element.outerHTML") if pdf_html_element else ""
 
-    wb.save(XLSX_FILE)
+    match = re.search(r"OpenP\('([^']+)',this,'([^']+)'\)", str(pdf_html))
 
-    print(f"Updated {XLSX_FILE} with new data: {data if data else 'No data'} and headers: {headers if headers else 'No headers'}")
+    if match:
+        return match.group(1), match.group(2), cell_values
+    return None, None, cell_values
 
-async def main():    
-    clear_xlsx_file()
+async def scrape_table(page, headers, retry_queue, journal, refresh=False) -> int:
+    """
+    Process one results page; returns the number of documents it handled.
+    """
+    rows = await page.query_selector_all(TABLE_ROW_SELECTOR)
+    pending = []
+    documents = 0
 
-    download_path = os.path.join(os.getcwd(), 'downloads')
-    output_path = os.path.join(os.getcwd(), 'output/ExtractTextInfoWithCharBoundsFromPDF')
-    os.makedirs(download_path, exist_ok=True)
-    clear_downloads_output_folder(download_path, output_path)
+    for row in rows:
+        instrument_number, doc_id, cell_values = await read_row(row)
+        if not instrument_number:
+            print("Document not found!")
+            pending.append((None, completed((cell_values, False))))
+            continue
 
-    async with async_playwright() as p:
-        browser = await p.chromium.launch(headless=False)
-        page = await browser.new_page()
+        if journal.reached(instrument_number, "written"):
+            print(f"Skipping {instrument_number}, already written.")
+            continue
 
-        await page.goto(TARGET_URL, timeout=60000)
+        if not refresh and journal.stage(instrument_number) is None and result_store.is_complete(instrument_number):
+            print(f"Skipping {instrument_number}, already complete in {RESULT_DB}.")
+            continue
 
-        await page.click("div#areastyle > div.col-md-4:first-of-type ul.text-start i.fa-file-magnifying-glass")
-        await page.wait_for_selector("input#rodDocTypeTxt")
-        await page.fill("input#rodDocTypeTxt", "ml")
-        await page.click("text='ML - MECHANIC LIEN'")
-        await page.click("#date_range_rod_type")
+        if journal.stage(instrument_number) is None:
+            journal.record(instrument_number, "listed", doc_id=doc_id, cell_values=cell_values)
 
-        today = str(datetime.today().day)
+        # The viewer is driven one row at a time on the shared page; fetching, Adobe
+        # extraction and parsing then run concurrently under the adaptive limiters.
+        if journal.reached(instrument_number, "downloaded"):
+            pdf_url = journal.data(instrument_number).get("pdf_url")
+        else:
+            with tracer.run_span("open_pdf_viewer", instrument=instrument_number):
+                pdf_url = await open_pdf_viewer(page, key=instrument_number, docid=doc_id)
+            if pdf_url:
+                journal.record(instrument_number, "listed", pdf_url=pdf_url)
+            await asyncio.sleep(ROW_DELAY_SECONDS)
+
+        if pdf_url or journal.reached(instrument_number, "downloaded"):
+            task = handle_document_or_queue(page, journal, instrument_number, cell_values, doc_id, pdf_url, retry_queue)
+            pending.append((instrument_number, asyncio.create_task(task)))
+            documents += 1
+        else:
+            pending.append((instrument_number, completed((cell_values, False))))
 
-        await page.click('#drwrapper-rod-type #rodDateFromTxt')
-        await asyncio.sleep(1)
-        
-        for i in range(months):
-            await page.click('div.flatpickr-calendar.open .flatpickr-months .flatpickr-prev-month svg')
-        
-        ### From Date Click ###
-        dayContainer_from = page.locator('div.flatpickr-calendar.open .flatpickr-innerContainer .dayContainer')
-        all_spans = dayContainer_from.locator('span')
-        from_date = None
-
-        for index in range(await all_spans.count()):  
-            span_element = all_spans.nth(index) 
-            text_content = await span_element.inner_text() 
-            class_attribute = await span_element.get_attribute("class") 
-
-            if text_content == today and ("prevMonthDay" not in (class_attribute or "")) and ("nextMonthDay" not in (class_attribute or "")):
-                from_date = span_element
-                break  
-
-        if from_date:
-            await from_date.click()
+    results = await asyncio.gather(*(awaitable for _, awaitable in pending))
+    write_rows(journal, [(instrument_number, *result)
+                         for (instrument_number, _), result in zip(pending, results) if result is not None])
+    return documents
+
+async def retry_failed_documents(page, retry_queue, journal):
+    async def retry(item):
+        instrument_number, cell_values, doc_id, pdf_url = item
+        try:
+            row = await handle_document(page, journal, instrument_number, list(cell_values), doc_id, pdf_url)
+        except RetryableError:
+            raise
+        except Exception as e:
+            # Like handle_document_or_queue: keep the listed row and carry on with the queue.
+            print(f"❌ {doc_id}: {e}")
+            write_rows(journal, [(instrument_number, cell_values, False)])
         else:
-            print("No valid date found!")
-        ###################
+            write_rows(journal, [(instrument_number, row, True)])
 
-        await page.click('#drwrapper-rod-type #rodToDateTxt')
-        await asyncio.sleep(1)
+    async def give_up(item):
+        instrument_number, cell_values, doc_id, pdf_url = item
+        print(f"❌ {doc_id}: giving up after {retry_policy.max_attempts} retries.")
+        write_rows(journal, [(instrument_number, cell_values, False)])
 
-        ### To Date Click ###
-        dayContainer_to = page.locator('div.flatpickr-calendar.open .flatpickr-innerContainer .dayContainer')
-        all_spans = dayContainer_to.locator('span')
-        to_date = None
+    if len(retry_queue):
+        print(f"Retrying {len(retry_queue)} failed documents...")
+    await retry_queue.drain(retry, on_give_up=give_up)
+
+def default_date_range() -> tuple:
+    """
+    The last `months` months up to today, clamping the start day to the month's length.
+    """
+    today = date.today()
+    year, month = divmod(today.year * 12 + today.month - 1 - months, 12)
+    day = min(today.day, calendar.monthrange(year, month + 1)[1])
+    return date(year, month + 1, day), today
+
+async def select_date(page, input_selector: str, target: date):
+    await page.click(input_selector)
+    await asyncio.sleep(1)
+
+    today = date.today()
+    for i in range((today.year - target.year) * 12 + today.month - target.month):
+        await page.click('div.flatpickr-calendar.open .flatpickr-months .flatpickr-prev-month svg')
+
+    dayContainer = page.locator('div.flatpickr-calendar.open .flatpickr-innerContainer .dayContainer')
+    all_spans = dayContainer.locator('span')
+    day_element = None
+
+    for index in range(await all_spans.count()):  
+        span_element = all_spans.nth(index) 
+        text_content = await span_element.inner_text() 
+        class_attribute = await span_element.get_attribute("class") 
+
+        if text_content == str(target.day) and ("prevMonthDay" not in (class_attribute or "")) and ("nextMonthDay" not in (class_attribute or "")):
+            day_element = span_element
+            break  
+
+    if day_element:
+        await day_element.click()
+    else:
+        print("No valid date found!")
 
-        for index in range(await all_spans.count()):  
-            span_element = all_spans.nth(index) 
-            text_content = await span_element.inner_text() 
-            class_attribute = await span_element.get_attribute("class") 
+async def run_search(page, date_from: date, date_to: date):
+    await page.goto(TARGET_URL, timeout=60000)
 
-            if text_content == today and ("prevMonthDay" not in (class_attribute or "")) and ("nextMonthDay" not in (class_attribute or "")):
-                to_date = span_element
-                break  
+    await page.click("div#areastyle > div.col-md-4:first-of-type ul.text-start i.fa-file-magnifying-glass")
+    await page.wait_for_selector("input#rodDocTypeTxt")
+    await page.fill("input#rodDocTypeTxt", "ml")
+    await page.click("text='ML - MECHANIC LIEN'")
+    await page.click("#date_range_rod_type")
 
-        if to_date:
-            await to_date.click()
-        else:
-            print("No valid date found!")
-        ###################
+    await select_date(page, '#drwrapper-rod-type #rodDateFromTxt', date_from)
+    await select_date(page, '#drwrapper-rod-type #rodToDateTxt', date_to)
 
-        await page.click("#rod-submit-type-search")
-        await asyncio.sleep(120)
+    await page.click("#rod-submit-type-search")
+    await asyncio.sleep(SEARCH_WAIT_SECONDS)
 
-        num_pages_element = page.locator('#rod_type_table_row > div > div div.rod-pages:first-of-type label.rodMxPgLbl')
-        num_pages = await num_pages_element.text_content()
+async def count_results_pages(page) -> int:
+    num_pages_element = page.locator('#rod_type_table_row > div > div div.rod-pages:first-of-type label.rodMxPgLbl')
+    return int(await num_pages_element.text_content())
 
-        headers = await set_table_headers(page)
-        save_to_xlsx(data=None, headers=headers, append=True)
+async def goto_results_page(page, page_index: int):
+    for i in range(page_index):
+        await page.click(NEXT_PAGE_SELECTOR)
 
-        for i in range(int(num_pages)):
-            await scrape_table(page, headers=headers)
-            await page.click('#rod_type_table_row > div > div div.rod-pages:first-of-type i.fa-angle-right')
+async def main(resume=False, refresh=False):    
+    open_services()
+    journal = CheckpointJournal(JOURNAL_FILE)
 
+    download_path = os.path.join(os.getcwd(), 'downloads')
+    output_path = os.path.join(os.getcwd(), 'output/ExtractTextInfoWithCharBoundsFromPDF')
+    os.makedirs(download_path, exist_ok=True)
+
+    if resume and journal.run:
+        date_from = date.fromisoformat(journal.run["date_from"])
+        date_to = date.fromisoformat(journal.run["date_to"])
+        start_page = journal.run.get("page", 0)
+        print(f"Resuming {date_from} - {date_to} from results page {start_page + 1}.")
+    else:
+        clear_downloads_output_folder(download_path, output_path)
+        journal.reset()
+        date_from, date_to = default_date_range()
+        start_page = 0
+        journal.record_run(date_from=date_from.isoformat(), date_to=date_to.isoformat(), page=0)
+
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(headless=HEADLESS)
+        current_page = start_page
+
+        async def restore(page):
+            print(f"Restoring the search on results page {current_page + 1}.")
+            await run_search(page, date_from, date_to)
+            await goto_results_page(page, current_page)
+
+        session = BrowserSession(browser, restore=restore)
+        page = await session.open()
+
+        await run_search(page, date_from, date_to)
+
+        num_pages = await count_results_pages(page)
+
+        headers = await set_table_headers(page)
+
+        await goto_results_page(page, start_page)
+
+        retry_queue = RetryQueue(retry_policy)
+        for i in range(start_page, num_pages):
+            journal.record_run(page=i)
+            with tracer.run_span("scrape_table", page=i + 1):
+                documents = await scrape_table(page, headers=headers, retry_queue=retry_queue, journal=journal,
+                                               refresh=refresh)
+            session.count_documents(documents)
+            current_page = i + 1
+            # A fresh page is restored straight onto the next results page.
+            reason = session.recycle_reason()
+            if reason:
+                with tracer.run_span("recycle_browser", reason=reason):
+                    page = await session.recycle(reason)
+            else:
+                await page.click(NEXT_PAGE_SELECTOR)
+
+        # Documents a crashed run left half-done on pages we skipped past.
+        queued = {item[0] for item in retry_queue.pending()}
+        for instrument_number in journal.unfinished():
+            data = journal.data(instrument_number)
+            if instrument_number in queued:
+                continue
+            if data.get("pdf_url") or journal.reached(instrument_number, "downloaded"):
+                retry_queue.push((instrument_number, data["cell_values"], data["doc_id"], data.get("pdf_url")))
+
+        await retry_failed_documents(page, retry_queue, journal)
+        print(f"okcc limiter: {okcc_limiter.limit:.2f} {okcc_limiter.stats}, adobe limiter: {adobe_limiter.limit:.2f} {adobe_limiter.stats}")
+        print(f"browser session: {session.stats}")
+        if gazetteer:
+            print(f"gazetteer: {len(gazetteer.entities)} entities, {gazetteer.stats}")
+        if scanned_extraction_service:
+            print(f"local OCR: {scanned_extraction_service.stats}")
+            scanned_extraction_service.close()
+
+        result_store.normalize(date_from=date_from, date_to=date_to)
+        result_store.export(XLSX_FILE)
+        tracer.export()
+        journal.close()
+        await session.close()
         await browser.close()
 
-ensure_playwright_browsers()
-asyncio.run(main())
\ No newline at end of file
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Scrape mechanic liens from okcc.online.")
+    parser.add_argument("--resume", action="store_true",
+                        help=f"continue the interrupted run recorded in {JOURNAL_FILE} instead of starting over")
+    parser.add_argument("--refresh", action="store_true",
+                        help=f"re-process instruments already complete in {RESULT_DB} instead of skipping them")
+    args = parser.parse_args()
+
+    ensure_playwright_browsers()
+    asyncio.run(main(resume=args.resume, refresh=args.refresh))
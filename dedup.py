@@ -0,0 +1,169 @@
+"""
+Near-duplicate detection for amended liens and repeated lien/release packets.
+
+Documents are reduced to MinHash signatures over word shingles of the merged
+structuredData text (before parsing) and bucketed with LSH so a new document is compared
+only against likely matches. MinHash scores are estimates (1.0 over 64 permutations does
+not mean identical text), so skipping extraction altogether is keyed on an exact hash of
+the normalized PDF text layer instead.
+
+duplicates.json is shared by every bot worker: save() merges this process' documents into
+what the others saved, under the file's lock (lien_extraction.shared_file).
+"""
+
+import hashlib
+import random
+import re
+import zlib
+
+from lien_extraction.shared_file import locked, read_json, write_json
+
+DEDUP_FILE = "duplicates.json"
+NUM_PERM = 64
+BANDS = 16
+ROWS = NUM_PERM // BANDS
+SHINGLE_SIZE = 5
+MIN_SHINGLES = 20
+FLAG_THRESHOLD = 0.8
+# Reuse the NLP fields of a merged-text near-duplicate (cheap fields are still recomputed).
+REUSE_THRESHOLD = 0.95
+
+MERSENNE_PRIME = (1 << 61) - 1
+_coefficients = random.Random(20250325)
+PERMUTATIONS = [(_coefficients.randrange(1, MERSENNE_PRIME), _coefficients.randrange(0, MERSENNE_PRIME))
+                for _ in range(NUM_PERM)]
+WORD_PATTERN = re.compile(r"[a-z0-9$.,]+")
+
+
+def minhash_signature(text: str):
+    """
+    MinHash of the text's word 5-shingles, or None when there is too little text to judge.
+    """
+    tokens = WORD_PATTERN.findall(text.lower())
+    shingles = {zlib.crc32(" ".join(tokens[i:i + SHINGLE_SIZE]).encode())
+                for i in range(max(0, len(tokens) - SHINGLE_SIZE + 1))}
+    if len(shingles) < MIN_SHINGLES:
+        return None
+    return [min((a * shingle + b) % MERSENNE_PRIME for shingle in shingles) for a, b in PERMUTATIONS]
+
+
+def text_hash(text: str):
+    """
+    SHA-256 of the text's normalized words, or None when there is too little text to judge.
+    """
+    tokens = WORD_PATTERN.findall(text.lower())
+    if len(tokens) < MIN_SHINGLES:
+        return None
+    return hashlib.sha256(" ".join(tokens).encode()).hexdigest()
+
+
+def similarity(signature, other) -> float:
+    return sum(1 for x, y in zip(signature, other) if x == y) / NUM_PERM
+
+
+class DuplicateIndex:
+    """
+    Persistent LSH index of processed documents' signatures and their extracted fields.
+    """
+
+    def __init__(self, path=DEDUP_FILE):
+        self.path = path
+        self.documents = {}
+        self.buckets = {}
+        self.hashes = {}
+        # Keys added or updated by this process since the last save.
+        self.changed = set()
+        for key, document in read_json(path, {}).items():
+            self.load(key, document)
+        self.changed = set()
+
+    def load(self, key, document):
+        self.documents[key] = {"signatures": {}, "hashes": {}, "fields": document.get("fields")}
+        for kind, signature in document.get("signatures", {}).items():
+            self.add(key, kind, signature)
+        for kind, digest in document.get("hashes", {}).items():
+            self.add_hash(key, kind, digest)
+
+    @staticmethod
+    def bands(signature):
+        for band in range(BANDS):
+            yield band, tuple(signature[band * ROWS:(band + 1) * ROWS])
+
+    def add(self, key, kind, signature, fields=None):
+        document = self.documents.setdefault(key, {"signatures": {}, "hashes": {}, "fields": None})
+        self.changed.add(key)
+        if fields is not None:
+            document["fields"] = fields
+        if signature is None:
+            return
+        document["signatures"][kind] = signature
+        for band, rows in self.bands(signature):
+            self.buckets.setdefault((kind, band, rows), set()).add(key)
+
+    def add_hash(self, key, kind, digest):
+        document = self.documents.setdefault(key, {"signatures": {}, "hashes": {}, "fields": None})
+        self.changed.add(key)
+        document.setdefault("hashes", {})
+        if digest is None:
+            return
+        document["hashes"][kind] = digest
+        keys = self.hashes.setdefault((kind, digest), [])
+        if key not in keys:
+            keys.append(key)
+
+    def query_exact(self, kind, digest, exclude=None):
+        """
+        A processed document with exactly this hash as (key, fields), or None.
+
+        The first one with parsed fields wins, then the first one seen.
+        """
+        if digest is None:
+            return None
+        keys = [key for key in self.hashes.get((kind, digest), []) if key != exclude]
+        for key in keys:
+            if self.documents[key]["fields"] is not None:
+                return key, self.documents[key]["fields"]
+        return (keys[0], None) if keys else None
+
+    def query(self, kind, signature, threshold=FLAG_THRESHOLD, exclude=None):
+        """
+        The most similar processed document as (key, similarity, fields), or None.
+        """
+        if signature is None:
+            return None
+        candidates = set()
+        for band, rows in self.bands(signature):
+            candidates |= self.buckets.get((kind, band, rows), set())
+        candidates.discard(exclude)
+
+        best = None
+        for key in candidates:
+            score = similarity(signature, self.documents[key]["signatures"][kind])
+            if score >= threshold and (best is None or score > best[1]):
+                best = (key, score, self.documents[key]["fields"])
+        return best
+
+    def save(self):
+        """
+        Merge this process' documents into the file; documents other workers saved are loaded too.
+        """
+        with locked(self.path):
+            stored = read_json(self.path, {})
+            changed = set(self.changed)
+            for key, document in stored.items():
+                if key not in changed:
+                    self.load(key, document)
+            for key in changed:
+                stored[key] = self.documents[key]
+            write_json(self.path, stored)
+        self.changed = set()
+
+
+def diff_fields(old, new) -> dict:
+    """
+    Fields whose values differ between two extractions, as {field: (old, new)}.
+    """
+    old, new = old or {}, new or {}
+    return {field: (old.get(field), new.get(field))
+            for field in sorted(set(old) | set(new))
+            if field != "duplicate_of" and old.get(field) != new.get(field)}
@@ -0,0 +1,115 @@
+"""
+Append-only checkpoint journal so an interrupted run can resume where it stopped.
+
+Every line is one JSON record: either run metadata ({"run": {...}}), an instrument
+reaching a pipeline stage ({"instrument": ..., "stage": ..., "data": {...}}) or an
+instrument's checkpoints being dropped so it starts over ({"forget": ...}). Replaying
+the file gives the last completed stage of every instrument; fsyncs are batched.
+"""
+
+import json
+import os
+import time
+
+JOURNAL_FILE = "checkpoint.jsonl"
+STAGES = ("listed", "downloaded", "dewatermarked", "extracted", "parsed", "written")
+
+
+class CheckpointJournal:
+    def __init__(self, path=JOURNAL_FILE, fsync_every=20, fsync_interval=2.0):
+        self.path = path
+        self.fsync_every = fsync_every
+        self.fsync_interval = fsync_interval
+        self.run = {}
+        self.state = {}
+        self.pending = 0
+        self.last_sync = time.monotonic()
+        self.load()
+        self.file = open(self.path, "a", encoding="utf-8")
+        if self.file.tell() > 0 and not self.ends_with_newline():
+            # Terminate a torn last line so the next record starts cleanly.
+            self.file.write("\n")
+
+    def load(self):
+        if not os.path.isfile(self.path):
+            return
+        with open(self.path, "r", encoding="utf-8") as file:
+            for line in file:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    # A torn final line from a crash mid-write; everything before it is valid.
+                    continue
+                self.apply(record)
+
+    def ends_with_newline(self) -> bool:
+        with open(self.path, "rb") as file:
+            file.seek(-1, os.SEEK_END)
+            return file.read(1) == b"\n"
+
+    def apply(self, record):
+        if "run" in record:
+            self.run.update(record["run"])
+            return
+        if "forget" in record:
+            self.state.pop(record["forget"], None)
+            return
+        entry = self.state.setdefault(record["instrument"], {"stage": None, "data": {}})
+        entry["stage"] = record["stage"]
+        entry["data"].update(record.get("data", {}))
+
+    def write(self, record):
+        self.apply(record)
+        self.file.write(json.dumps(record, default=str) + "\n")
+        self.pending += 1
+        if self.pending >= self.fsync_every or time.monotonic() - self.last_sync >= self.fsync_interval:
+            self.flush()
+
+    def record(self, instrument, stage, **data):
+        if stage not in STAGES:
+            raise ValueError(f"Unknown stage {stage!r}")
+        self.write({"instrument": instrument, "stage": stage, "ts": time.time(), "data": data})
+
+    def forget(self, instrument):
+        """
+        Drop the instrument's checkpoints, so its next pass redoes every stage.
+        """
+        self.write({"forget": instrument, "ts": time.time()})
+
+    def record_run(self, **data):
+        self.write({"run": data, "ts": time.time()})
+
+    def stage(self, instrument):
+        entry = self.state.get(instrument)
+        return entry["stage"] if entry else None
+
+    def data(self, instrument) -> dict:
+        entry = self.state.get(instrument)
+        return entry["data"] if entry else {}
+
+    def reached(self, instrument, stage) -> bool:
+        current = self.stage(instrument)
+        return current is not None and STAGES.index(current) >= STAGES.index(stage)
+
+    def unfinished(self) -> list:
+        return [instrument for instrument, entry in self.state.items() if entry["stage"] != "written"]
+
+    def flush(self):
+        self.file.flush()
+        os.fsync(self.file.fileno())
+        self.pending = 0
+        self.last_sync = time.monotonic()
+
+    def reset(self):
+        """
+        Start a fresh journal, discarding the previous run's checkpoints.
+        """
+        self.file.close()
+        self.run = {}
+        self.state = {}
+        self.file = open(self.path, "w", encoding="utf-8")
+        self.flush()
+
+    def close(self):
+        self.flush()
+        self.file.close()
@@ -0,0 +1,43 @@
+"""
+Field extraction for okcc mechanic's lien filings, importable without side effects.
+
+spaCy is loaded on first use, not at import. extract_batch turns many structuredData.json
+files into a DataFrame of fields; the single-document extractors are the ones bot.py runs, and
+normalize_results formats a whole result table at the end of a run.
+"""
+
+from lien_extraction.address import AddressLocator, normalize_span, parse_address
+from lien_extraction.batch import FIELD_COLUMNS, extract_batch, extract_chunk
+from lien_extraction.fields import (
+    CLAIMANT_LABELS,
+    CONTRACTOR_LABELS,
+    OWNER_LABELS,
+    PROPERTY_ANCHOR_PATTERNS,
+    extract_address,
+    extract_company_name,
+    extract_dollar_amount,
+    extract_full_name,
+    extract_phone_number,
+    fix_misplaced_decimal,
+    get_claimant,
+    get_claimant_phone,
+    get_contractor,
+    get_owner,
+    get_property_address,
+    parse_cheap_fields,
+    parse_document,
+)
+from lien_extraction.gazetteer import Gazetteer, get_gazetteer
+from lien_extraction.nlp import get_nlp
+from lien_extraction.pdf import (
+    get_merged_text,
+    load_structured_data,
+    merge_text,
+    read_page_texts,
+    remove_watermark,
+    remove_zip_file,
+    unzip_file,
+)
+from lien_extraction.postprocess import normalize_results
+from lien_extraction.spatial_index import ElementIndex
+from lien_extraction.tracing import Tracer, tracer
@@ -0,0 +1,178 @@
+"""
+Anchor-indexed address lookup over a document's merged text.
+
+Instead of running usaddress' CRF over 30-50 token windows, the text is indexed once for
+address anchors (ZIP codes right after a state, OK/Oklahoma state tokens, street
+suffixes) and only short spans around those anchors are parsed. A window where no anchor
+span yields a street is parsed whole, as before, so results match the window parse.
+Parses are memoized on the normalized span text, so boilerplate addresses repeated
+across filings are parsed once.
+"""
+
+import logging
+import re
+from bisect import bisect_left, bisect_right
+from functools import lru_cache
+
+import usaddress
+
+logger = logging.getLogger(__name__)
+
+# Recording stamps ("B: 16042 P: 803") carry five-digit book numbers that are not ZIPs.
+ZIP_PATTERN = re.compile(r'(?<![BP]:)(?<![BP]: )\b\d{5}(?:-\d{4})?\b')
+# The token right before a ZIP that anchors an address: "OK", "Oklahoma," or another state code.
+ZIP_STATE_PATTERN = re.compile(r'^(?:OK|Okla\.?|Oklahoma|OKLAHOMA|[A-Z]{2}),?$')
+STATE_PATTERN = re.compile(r'\b(?:OK|Okla\.|Oklahoma|OKLAHOMA)(?=\W|$)')
+STREET_SUFFIX_PATTERN = re.compile(
+    r'\b(?:St|Street|Ave|Avenue|Rd|Road|Dr|Drive|Blvd|Boulevard|Ln|Lane|Ct|Court|Way|Pkwy|Parkway|'
+    r'Ter|Terrace|Pl|Place|Cir|Circle|Hwy|Highway|Trl|Trail|Expy|Expressway)\b\.?',
+    re.IGNORECASE,
+)
+TOKEN_PATTERN = re.compile(r'\S+')
+
+# Tokens kept around each anchor: enough for "12101 N. MacArthur Blvd, Oklahoma City, OK 73162".
+ZIP_TOKENS_BEFORE = 12
+STATE_TOKENS_BEFORE = 10
+STATE_TOKENS_AFTER = 2
+SUFFIX_TOKENS_BEFORE = 4
+SUFFIX_TOKENS_AFTER = 6
+
+EMPTY_ADDRESS = (None, None, None, None)
+
+
+def normalize_span(text: str) -> str:
+    text = re.sub(r'[^\x00-\x7F]+', ' ', text)
+    return re.sub(r'\s+', ' ', text).strip()
+
+
+@lru_cache(maxsize=4096)
+def parse_address(span: str) -> tuple:
+    """
+    Parse a normalized span into (street address, city, state, zip); missing parts are None.
+
+    A span without a street yields no address at all, like the original window parse.
+    """
+    if not span:
+        return EMPTY_ADDRESS
+
+    try:
+        parsed_address = usaddress.parse(span)
+    except Exception as e:
+        logger.warning("usaddress.parse failed: %s", e)
+        return EMPTY_ADDRESS
+
+    address_number = None
+    street_name = []
+    street_name_post_type = None
+    place_name = None
+    state_name = None
+    zip_code = None
+
+    for component, label in parsed_address:
+        if label == "AddressNumber" and not address_number:
+            address_number = component
+        elif label == "StreetName" and not street_name:
+            street_name.append(component)
+        elif label == "StreetNamePostType" and not street_name_post_type:
+            street_name_post_type = component
+        elif label == "PlaceName" and not place_name:
+            place_name = component.strip(",")
+        elif label == "StateName" and not state_name:
+            state_name = component
+        elif label == "ZipCode" and not zip_code:
+            zip_code = component
+
+    if address_number and street_name and street_name_post_type:
+        best_address = " ".join([address_number] + street_name + [street_name_post_type])
+    elif street_name:
+        best_address = " ".join([address_number] + street_name) if address_number else " ".join(street_name)
+    else:
+        return EMPTY_ADDRESS
+
+    return best_address, place_name, state_name, zip_code
+
+
+class AddressLocator:
+    """
+    Index of candidate address spans in one document's merged text.
+    """
+
+    def __init__(self, text: str):
+        self.text = text
+        tokens = [(m.start(), m.end()) for m in TOKEN_PATTERN.finditer(text)]
+        self.token_starts = [start for start, _ in tokens]
+        self.token_ends = [end for _, end in tokens]
+        self.candidates = self.index_candidates()
+
+    def token_at(self, position: int) -> int:
+        return max(0, bisect_right(self.token_starts, position) - 1)
+
+    def token_text(self, token: int) -> str:
+        return self.text[self.token_starts[token]:self.token_ends[token]]
+
+    def index_candidates(self) -> list:
+        """
+        Return (anchor position, first token, end token) spans sorted by anchor position.
+        """
+        zip_tokens = [token for token in (self.token_at(m.start()) for m in ZIP_PATTERN.finditer(self.text))
+                      if token > 0 and ZIP_STATE_PATTERN.match(self.token_text(token - 1))]
+        state_tokens = [self.token_at(m.start()) for m in STATE_PATTERN.finditer(self.text)]
+        suffix_tokens = [self.token_at(m.start()) for m in STREET_SUFFIX_PATTERN.finditer(self.text)]
+
+        spans = []
+        previous_zip = -1
+        for token in zip_tokens:
+            spans.append((token, max(token - ZIP_TOKENS_BEFORE, previous_zip + 1), token + 1))
+            previous_zip = token
+
+        zip_set = set(zip_tokens)
+        covered = set()
+        for _, first, end in spans:
+            covered.update(range(first, end))
+
+        for token in state_tokens:
+            # A state followed by a ZIP is already inside that ZIP's span.
+            if any(token + offset in zip_set for offset in range(1, STATE_TOKENS_AFTER + 1)):
+                continue
+            spans.append((token, max(0, token - STATE_TOKENS_BEFORE), token + STATE_TOKENS_AFTER))
+            covered.update(range(max(0, token - STATE_TOKENS_BEFORE), token + STATE_TOKENS_AFTER))
+
+        for token in suffix_tokens:
+            if token in covered:
+                continue
+            spans.append((token, max(0, token - SUFFIX_TOKENS_BEFORE), token + SUFFIX_TOKENS_AFTER + 1))
+
+        token_count = len(self.token_starts)
+        return sorted((self.token_starts[anchor], first, min(end, token_count)) for anchor, first, end in spans)
+
+    def span_text(self, first: int, end: int, start_char: int, end_char: int) -> str:
+        begin = max(self.token_starts[first], start_char)
+        finish = min(self.token_ends[end - 1], end_char)
+        return normalize_span(self.text[begin:finish]) if begin < finish else ""
+
+    def find(self, start_char: int = 0, end_char: int = None) -> tuple:
+        """
+        Best address whose anchor lies in text[start_char:end_char], parsing only anchor spans.
+
+        A full street with city/state/ZIP wins over a bare street; ties go to the earliest
+        anchor. When no anchor span yields a street, the whole range is parsed instead.
+        """
+        if end_char is None:
+            end_char = len(self.text)
+
+        anchors = [position for position, _, _ in self.candidates]
+        lower = bisect_left(anchors, start_char)
+        upper = bisect_left(anchors, end_char)
+
+        best, best_rank = EMPTY_ADDRESS, 0
+        for _, first, end in self.candidates[lower:upper]:
+            result = parse_address(self.span_text(first, end, start_char, end_char))
+            address, city, state, zip_code = result
+            rank = 2 if address and (state or zip_code) else 1 if address else 0
+            if rank > best_rank:
+                best, best_rank = result, rank
+                if rank == 2:
+                    break
+        if not best_rank:
+            return parse_address(normalize_span(self.text[start_char:end_char]))
+        return best
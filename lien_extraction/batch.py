@@ -0,0 +1,73 @@
+"""
+Batch field extraction over many structuredData.json files.
+
+Every document's name windows are collected first and parsed together with nlp.pipe,
+then the per-document extractors run against those pre-parsed Docs. With processes > 1
+the paths are split into chunks handled by a process pool, each worker loading spaCy once.
+"""
+
+import contextlib
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+from lien_extraction.fields import name_windows, parse_document
+from lien_extraction.nlp import get_nlp
+from lien_extraction.pdf import load_structured_data, merge_text
+from lien_extraction.spatial_index import ElementIndex
+
+FIELD_COLUMNS = ["claimant", "contractor", "owner", "address", "city", "state", "zipcode", "dollar", "phone"]
+PIPE_BATCH_SIZE = 64
+MAX_CHUNK_SIZE = 200
+
+
+def extract_chunk(paths: list, batch_size=PIPE_BATCH_SIZE, quiet=True) -> list:
+    """
+    Field dicts (plus "path" and "error") for paths, parsing all name windows in one nlp.pipe.
+    """
+    loaded = {}
+    rows = []
+    windows = set()
+    for path in paths:
+        try:
+            data = load_structured_data(path)
+        except Exception as e:
+            rows.append({"path": path, "error": str(e)})
+            continue
+        loaded[path] = data
+        windows.update(name_windows(merge_text(data), ElementIndex(data.get("elements", []))))
+
+    windows = sorted(windows)
+    docs = dict(zip(windows, get_nlp().pipe(windows, batch_size=batch_size)))
+
+    with open(os.devnull, "w") as devnull, (contextlib.redirect_stdout(devnull) if quiet else contextlib.nullcontext()):
+        for path, data in loaded.items():
+            try:
+                rows.append(dict(parse_document(data, docs), path=path, error=None))
+            except Exception as e:
+                rows.append({"path": path, "error": str(e)})
+    return rows
+
+
+def extract_batch(paths, processes=None, chunk_size=None, batch_size=PIPE_BATCH_SIZE, quiet=True) -> pd.DataFrame:
+    """
+    Extract the fields of every structuredData.json in paths into a DataFrame, one row per path.
+
+    processes > 1 spreads chunks of chunk_size paths (by default an even share per process,
+    at most MAX_CHUNK_SIZE) over a process pool.
+    """
+    paths = list(paths)
+    if processes and processes > 1 and len(paths) > 1:
+        chunk_size = chunk_size or min(MAX_CHUNK_SIZE, math.ceil(len(paths) / processes))
+        chunks = [paths[i:i + chunk_size] for i in range(0, len(paths), chunk_size)]
+        with ProcessPoolExecutor(max_workers=processes) as executor:
+            results = executor.map(extract_chunk, chunks, [batch_size] * len(chunks), [quiet] * len(chunks))
+            rows = [row for chunk_rows in results for row in chunk_rows]
+    else:
+        rows = extract_chunk(paths, batch_size, quiet)
+
+    order = {path: position for position, path in enumerate(paths)}
+    rows.sort(key=lambda row: order[row["path"]])
+    return pd.DataFrame(rows, columns=["path"] + FIELD_COLUMNS + ["error"])
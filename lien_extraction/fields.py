@@ -0,0 +1,344 @@
+"""
+Field extractors for one lien's structuredData.json and merged text.
+
+Claimant, contractor and owner are found by locating a text window (label position in
+the char-bound layout first, then regex windows over the merged text) and running the
+company-name extraction over it. The extractors accept an optional `docs` mapping of
+window text to an already parsed spaCy Doc, which is how the batch API feeds them
+documents parsed together with nlp.pipe, and an optional `gazetteer`: windows naming an
+entity it already knows in the extracted role skip spaCy altogether. Without one (the
+batch API, reprocess.py, benchmark.py) every field comes from the heuristics alone.
+"""
+
+import logging
+import re
+
+import phonenumbers
+
+from lien_extraction.address import AddressLocator, normalize_span, parse_address
+from lien_extraction.nlp import COMPANY_SUFFIXES, get_company_matcher, get_nlp
+from lien_extraction.pdf import load_structured_data, merge_text
+from lien_extraction.spatial_index import ElementIndex
+from lien_extraction.tracing import traced, tracer
+
+logger = logging.getLogger(__name__)
+
+# Labels looked up by position in the char-bound layout before the regex windows.
+CLAIMANT_LABELS = ["Claimant"]
+CONTRACTOR_LABELS = ["Original Contractor", "Contractor", "Customer"]
+OWNER_LABELS = ["Property Owner", "Owner", "Owners"]
+
+CLAIMANT_PATTERN = re.compile(r'claimant:\s*(\S+(?:\s+\S+){0,19})', re.IGNORECASE | re.DOTALL)
+CLAIMS_PATTERN = re.compile(r'(\S+(?:\s+\S+){0,19})\s+\b(?:claims|against|upon)\b', re.IGNORECASE | re.DOTALL)
+CONTRACTOR_PATTERN = re.compile(r'\b(?:Contractor|Customer|claims|against|upon):?\s*(\S+(?:\s+\S+){0,29})', re.IGNORECASE | re.DOTALL)
+OWNER_PATTERN = re.compile(r'\b(?:Owner|Owners|owned by|owned)\b:?\s*(\S+(?:\s+\S+){0,29})', re.IGNORECASE | re.DOTALL)
+CLAIMANT_PHONE_PATTERN = re.compile(r'claimant:\s*(\S+(?:\s+\S+){0,29})', re.IGNORECASE | re.DOTALL)
+CLAIMS_PHONE_PATTERN = re.compile(r'(\S+(?:\s+\S+){0,29})\s+\b(?:claims|against|upon)\b', re.IGNORECASE | re.DOTALL)
+
+PROPERTY_ANCHOR_PATTERNS = [
+    re.compile(r'\b(?:property:|contract:|notice to:|prepared by:|following:)\b:?\s*(\S+(?:\s+\S+){0,29})', re.IGNORECASE | re.DOTALL),
+    re.compile(r'\b(?:against|upon)\b:?\s*(\S+(?:\s+\S+){0,49})', re.IGNORECASE | re.DOTALL),
+]
+
+STREET_NUMBER_PATTERN = re.compile(r'\d{1,5}\s\w+(\s\w+)*')
+COMPANY_FALLBACK_PATTERN = re.compile(r"([A-Za-z\s]+(?:,\s[A-Za-z\s]+)*\s*,?\s*(?:LLC|INC|CORP|CORPORATION|GROUP|ENTERPRISES|HOLDINGS|DBA|CO|LIMITED|PARTNERSHIP|ASSOCIATION)(?:\s*\([^)]+\))?)")
+
+DOLLAR_PATTERNS = [re.compile(pattern) for pattern in (
+    r"of \$\s?([\d,]+\.\d{1,2})",
+    r"\(\$\s?([\d,]+\.\d{1,2})\)",
+    r"\$\s?([\d,]+\.\d{1,2}) due",
+    r"is \$\s?([\d,]+\.\d{1,2})",
+    r"total \$\s?([\d,]+\.\d{1,2})",
+    r"is\$\s?([\d,]+\.\d{1,2})",
+    r"of\$\s?([\d,]+\.\d{1,2})",
+    r"j\$([\d,]+\.\d{1,2})",
+    r"j \$([\d,]+\.\d{1,2})",
+)]
+DOLLAR_PATTERN = re.compile(r"\$\s?([\d,]+\.\d{1,2})")
+
+
+def as_structured_data(source) -> dict:
+    return load_structured_data(source) if isinstance(source, str) else source
+
+
+def extract_company_name(text, docs=None):
+    doc = docs.get(text) if docs else None
+    if doc is None:
+        doc = get_nlp()(text)
+
+    matches = get_company_matcher()(doc)
+    company_names = []
+
+    for match_id, start, end in matches:
+        span = doc[start:end]
+
+        if span.text.strip() in COMPANY_SUFFIXES and start > 0:
+            span = doc[start - 1:end]
+
+        elif span.text.split()[-1] in COMPANY_SUFFIXES and start > 0:
+            prev_token = doc[start - 1]
+            if prev_token.is_alpha:
+                span = doc[start - 1:end]
+
+        company_names.append(span.text.strip())
+
+    company_names = [name for name in company_names if not STREET_NUMBER_PATTERN.search(name)]
+
+    if company_names:
+        company_names.sort(key=len, reverse=True)
+        return company_names[0]
+
+    match = COMPANY_FALLBACK_PATTERN.search(text)
+
+    if match:
+        return match.group(0).strip()
+
+    for ent in doc.ents:
+        if ent.label_ == "PERSON" and ent.text not in company_names:
+            company_names.append(ent.text.strip())
+
+    if company_names:
+        company_names.sort(key=len, reverse=True)
+        return company_names[0]
+
+    return None
+
+
+def extract_phone_number(text):
+    numbers = [match.number for match in phonenumbers.PhoneNumberMatcher(text, "US")]
+    if numbers:
+        phone_number = phonenumbers.format_number(numbers[0], phonenumbers.PhoneNumberFormat.INTERNATIONAL)
+        return phone_number.replace(" ", "-")
+    return None
+
+
+def fix_misplaced_decimal(amount):
+    """
+    Fix misplaced decimal formatting like "22.692.92" -> "22692.92"
+    """
+    amount = amount.replace(" ", "").replace(",", "")
+    parts = amount.split(".")
+
+    if len(parts) > 2:
+        amount = parts[0] + parts[1] + "." + parts[-1]
+
+    return amount
+
+
+@traced()
+def extract_dollar_amount(source):
+    """
+    Claimed amount from a structuredData.json path or its loaded dict, "0" when none is found.
+    """
+    all_amounts = []
+    elements = as_structured_data(source).get("elements", [])
+
+    for i, element in enumerate(elements):
+        text = element.get("Text", "")
+
+        for pattern in DOLLAR_PATTERNS:
+            match = pattern.search(text)
+            if match:
+                return fix_misplaced_decimal(match.group(1))
+
+        dollar_matches = DOLLAR_PATTERN.findall(text)
+        all_amounts.extend(fix_misplaced_decimal(m) for m in dollar_matches)
+
+        if "Principal amount of claim:" in text:
+            for j in range(1, 3):
+                if i + j < len(elements):
+                    next_text = elements[i + j].get("Text", "")
+                    next_dollar_matches = DOLLAR_PATTERN.findall(next_text)
+                    if next_dollar_matches:
+                        return fix_misplaced_decimal(next_dollar_matches[0])
+
+    if all_amounts:
+        return max(all_amounts, key=lambda x: float(x.replace(",", "")))
+
+    return "0"
+
+
+def extract_full_name(source):
+    full_names = []
+    priority_name = None
+
+    texts = [element.get("Text", "") for element in as_structured_data(source).get("elements", [])]
+    for text, doc in zip(texts, get_nlp().pipe(texts)):
+        for ent in doc.ents:
+            if ent.label_ == "PERSON":
+                name_parts = ent.text.split()
+
+                if len(name_parts) > 1:
+                    full_names.append(ent.text)
+
+                match = re.search(r"against\s+" + re.escape(ent.text), text, re.IGNORECASE)
+                if match:
+                    priority_name = ent.text
+
+    return priority_name if priority_name else (full_names[0] if full_names else None)
+
+
+def extract_address(text):
+    if not text:
+        return None, None, None, None
+    return parse_address(normalize_span(text))
+
+
+def claimant_windows(text, index=None):
+    """
+    Candidate claimant text windows as (source, window), in the order they are tried.
+    """
+    if index is not None:
+        window = index.value_for(CLAIMANT_LABELS)
+        if window:
+            yield "claimant (layout)", window
+    for pattern in (CLAIMANT_PATTERN, CLAIMS_PATTERN):
+        match = pattern.search(text)
+        if match:
+            yield "claimant", match.group(1).strip()
+
+
+def contractor_windows(text, index=None):
+    if index is not None:
+        window = index.value_for(CONTRACTOR_LABELS)
+        if window:
+            yield "contractor (layout)", window
+    match = CONTRACTOR_PATTERN.search(text)
+    if match:
+        yield "contractor", match.group(1).strip()
+
+
+def owner_windows(text, index=None):
+    if index is not None:
+        window = index.value_for(OWNER_LABELS)
+        if window:
+            yield "owner (layout)", window
+    match = OWNER_PATTERN.search(text)
+    if match:
+        yield "owner", match.group(1).strip()
+
+
+def first_company_name(windows, docs=None, gazetteer=None, role=None):
+    for source, window in windows:
+        logger.debug("%s: %s", source, window)
+        name = gazetteer.lookup_name(window, role) if gazetteer else None
+        if name:
+            logger.debug("known entity: %s", name)
+            return name
+        name = extract_company_name(window, docs)
+        if name:
+            return name
+    return None
+
+
+@traced()
+def get_claimant(text, index=None, docs=None, gazetteer=None):
+    return first_company_name(claimant_windows(text, index), docs, gazetteer, "claimant")
+
+
+@traced()
+def get_contractor(text, index=None, docs=None, gazetteer=None):
+    return first_company_name(contractor_windows(text, index), docs, gazetteer, "contractor")
+
+
+@traced()
+def get_owner(text, index=None, docs=None, gazetteer=None):
+    return first_company_name(owner_windows(text, index), docs, gazetteer, "owner")
+
+
+@traced()
+def get_property_address(text):
+    locator = AddressLocator(text)
+
+    for pattern in PROPERTY_ANCHOR_PATTERNS:
+        property_match = pattern.search(text)
+        if property_match:
+            logger.debug("property: %s", property_match.group(1).strip())
+            address, city, state, zip = locator.find(property_match.start(1), property_match.end(1))
+            if address or city or state or zip:
+                return address, city, state, zip
+
+    return None, None, None, None
+
+
+def phone_in_window(window, gazetteer=None):
+    return (gazetteer.phone_in(window) if gazetteer else None) or extract_phone_number(window)
+
+
+@traced()
+def get_claimant_phone(text, index=None, gazetteer=None):
+    if index is not None:
+        claimant_text = index.value_for(CLAIMANT_LABELS, lines=4)
+        if claimant_text:
+            phone = phone_in_window(claimant_text, gazetteer)
+            if phone:
+                return phone
+
+    for pattern in (CLAIMANT_PHONE_PATTERN, CLAIMS_PHONE_PATTERN):
+        match = pattern.search(text)
+        if match:
+            phone = phone_in_window(match.group(1), gazetteer)
+            if phone:
+                return phone
+
+    return None
+
+
+def name_windows(text, index=None, gazetteer=None) -> list:
+    """
+    Every window the claimant, contractor and owner extractors may parse with spaCy,
+    leaving out those the gazetteer resolves for the window's role.
+    """
+    windows = []
+    for role, generator in (("claimant", claimant_windows), ("contractor", contractor_windows),
+                            ("owner", owner_windows)):
+        windows.extend(window for _, window in generator(text, index)
+                       if not (gazetteer and gazetteer.matches(window, role)))
+    return windows
+
+
+def index_document(source) -> tuple:
+    """
+    (structured data, merged text, element index) of one lien.
+    """
+    with tracer.span("index_elements"):
+        data = as_structured_data(source)
+        full_text = merge_text(data)
+        index = ElementIndex(data.get("elements", []))
+    return data, full_text, index
+
+
+def cheap_fields(data, full_text, index, gazetteer=None) -> dict:
+    address, city, state, zipcode = get_property_address(full_text)
+    return {
+        "address": address,
+        "city": city,
+        "state": state,
+        "zipcode": zipcode,
+        "dollar": extract_dollar_amount(data),
+        "phone": get_claimant_phone(full_text, index, gazetteer),
+    }
+
+
+def parse_cheap_fields(source, gazetteer=None) -> dict:
+    """
+    The fields that need no spaCy (property address, amount, claimant phone) of one lien.
+    """
+    return cheap_fields(*index_document(source), gazetteer=gazetteer)
+
+
+def parse_document(source, docs=None, gazetteer=None) -> dict:
+    """
+    All fields of one lien from its structuredData.json path or loaded dict.
+    """
+    data, full_text, index = index_document(source)
+
+    info: dict[str, any] = {
+        "claimant": get_claimant(full_text, index, docs, gazetteer),
+        "contractor": get_contractor(full_text, index, docs, gazetteer),
+        "owner": get_owner(full_text, index, docs, gazetteer),
+    }
+    info.update(cheap_fields(data, full_text, index, gazetteer))
+
+    logger.debug("info: %s", info)
+    return info
@@ -0,0 +1,240 @@
+"""
+Persistent gazetteer of companies and people already resolved in earlier filings.
+
+The same contractors, suppliers and lien-filing services recur across hundreds of liens.
+A claimant/contractor/owner is learned into GAZETTEER_FILE, with its spellings, the
+claimant's phone numbers and the owner's property addresses, only once confirmed: the
+name extracted for the role is the one the okcc listing shows for it. Once an entity has
+been seen in GAZETTEER_MIN_SEEN documents its spellings join a token-level Aho-Corasick
+automaton, and the name windows are scanned against it in one pass before spaCy runs.
+A window only resolves to an entity already confirmed in the role being extracted
+(an owner named in the claimant's window is not the claimant); spaCy parses the rest.
+Only bot.py passes the gazetteer to the extractors; batch re-extraction and benchmarks
+run without it.
+
+Matching is case- and punctuation-insensitive ("ACME ROOFING, INC." finds "Acme Roofing
+Inc"). Spellings can be added by hand to an entity's "aliases" (spelling -> count) in the
+JSON file. Every bot worker saves into the same file: save() replays this process'
+sightings onto the saved entities under the file's lock, so the counts of all workers add up.
+"""
+
+import os
+import re
+from collections import deque
+from functools import lru_cache
+
+from lien_extraction.shared_file import locked, read_json, write_json
+
+# An empty GAZETTEER_FILE turns the gazetteer off.
+GAZETTEER_FILE = os.getenv("GAZETTEER_FILE", "gazetteer.json")
+GAZETTEER_MIN_SEEN = int(os.getenv("GAZETTEER_MIN_SEEN", "2"))
+# Single words ("Owner", "Oklahoma") are too ambiguous to match on their own.
+MIN_TOKENS = 2
+ROLES = ("claimant", "contractor", "owner")
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9&]+")
+
+
+def tokenize(text: str) -> list:
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+def entity_key(name: str) -> str:
+    return " ".join(tokenize(name))
+
+
+def phone_digits(text: str) -> str:
+    digits = re.sub(r"\D", "", text)
+    return digits[-10:] if len(digits) >= 10 else ""
+
+
+class TokenAutomaton:
+    """
+    Aho-Corasick automaton over word tokens: all phrases found in one left-to-right pass.
+    """
+
+    def __init__(self):
+        self.goto = [{}]
+        self.fail = [0]
+        self.own = [[]]
+        self.output = [[]]
+
+    def add(self, tokens, value):
+        node = 0
+        for token in tokens:
+            next_node = self.goto[node].get(token)
+            if next_node is None:
+                next_node = len(self.goto)
+                self.goto[node][token] = next_node
+                self.goto.append({})
+                self.fail.append(0)
+                self.own.append([])
+                self.output.append([])
+            node = next_node
+        self.own[node].append((len(tokens), value))
+
+    def build(self):
+        self.output = [list(own) for own in self.own]
+        queue = deque(self.goto[0].values())
+        for node in queue:
+            self.fail[node] = 0
+        while queue:
+            node = queue.popleft()
+            for token, child in self.goto[node].items():
+                fallback = self.fail[node]
+                while fallback and token not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                self.fail[child] = self.goto[fallback].get(token, 0)
+                self.output[child].extend(self.output[self.fail[child]])
+                queue.append(child)
+        return self
+
+    def find(self, tokens):
+        """
+        Yield (start, length, value) for every phrase occurrence in tokens.
+        """
+        node = 0
+        for i, token in enumerate(tokens):
+            while node and token not in self.goto[node]:
+                node = self.fail[node]
+            node = self.goto[node].get(token, 0)
+            for length, value in self.output[node]:
+                yield i - length + 1, length, value
+
+
+class Gazetteer:
+    def __init__(self, path=GAZETTEER_FILE, min_seen=GAZETTEER_MIN_SEEN):
+        self.path = path
+        self.min_seen = min_seen
+        self.entities = {}
+        self.automaton = None
+        self.stats = {"hits": 0, "misses": 0, "learned": 0}
+        # Confirmed fields learned since the last save, replayed onto the file's entities by save().
+        self.unsaved = []
+        if path:
+            self.entities = read_json(path, {})
+
+    def index(self) -> TokenAutomaton:
+        if self.automaton is None:
+            automaton = TokenAutomaton()
+            for key, entity in self.entities.items():
+                if entity["seen"] < self.min_seen:
+                    continue
+                for alias in {key, *(entity_key(alias) for alias in entity["aliases"])}:
+                    tokens = alias.split()
+                    if len(tokens) >= MIN_TOKENS:
+                        automaton.add(tokens, key)
+            self.automaton = automaton.build()
+        return self.automaton
+
+    def matches(self, window: str, role=None) -> list:
+        """
+        Known entities in the window, earliest first and the longest spelling first at each position.
+
+        With a role, only the entities confirmed in that role.
+        """
+        found = sorted(self.index().find(tokenize(window)), key=lambda match: (match[0], -match[1]))
+        keys = []
+        for _, _, key in found:
+            if key not in keys:
+                keys.append(key)
+        return [self.entities[key] for key in keys if role is None or self.entities[key]["roles"].get(role)]
+
+    def lookup_name(self, window: str, role: str):
+        """
+        Canonical name of the first entity known in the role in the window, or None.
+        """
+        matches = self.matches(window, role)
+        if not matches:
+            self.stats["misses"] += 1
+            return None
+        self.stats["hits"] += 1
+        return matches[0]["name"]
+
+    def phone_in(self, window: str):
+        """
+        A known phone of a claimant in the window whose digits the window also contains, or None.
+        """
+        digits = re.sub(r"\D", "", window)
+        if len(digits) < 10:
+            return None
+        for entity in self.matches(window, "claimant"):
+            for phone in entity["phones"]:
+                if phone_digits(phone) and phone_digits(phone) in digits:
+                    return phone
+        return None
+
+    def learn(self, info: dict, listed: dict):
+        """
+        Add the claimant, contractor and owner of a parsed document that the listing confirms.
+
+        listed maps each role to the name the okcc listing shows for it. A role whose
+        extracted name differs (compared like lookups are) or is not listed is left out,
+        and with it the claimant's phone or the owner's address.
+        """
+        confirmed = dict(info)
+        for role in ROLES:
+            name = info.get(role)
+            if not name or not listed.get(role) or entity_key(name) != entity_key(listed[role]):
+                confirmed[role] = None
+        if not any(confirmed[role] for role in ROLES):
+            return
+        self.stats["learned"] += self.add(self.entities, confirmed)
+        self.unsaved.append(confirmed)
+
+    def add(self, entities: dict, info: dict) -> int:
+        """
+        Count one sighting of the document's entities into entities; returns how many were new.
+        """
+        new = 0
+        seen = set()
+        for role in ROLES:
+            name = info.get(role)
+            key = entity_key(name) if name and name != "N/A" else ""
+            if not key:
+                continue
+            entity = entities.get(key)
+            if entity is None:
+                entity = entities[key] = {"name": name, "aliases": {}, "phones": [], "addresses": [],
+                                          "roles": {}, "seen": 0}
+                new += 1
+            if key not in seen:
+                seen.add(key)
+                entity["seen"] += 1
+                entity["aliases"][name] = entity["aliases"].get(name, 0) + 1
+                entity["name"] = max(entity["aliases"], key=entity["aliases"].get)
+                if entity["seen"] == self.min_seen:
+                    self.automaton = None
+            entity["roles"][role] = entity["roles"].get(role, 0) + 1
+
+            if role == "claimant" and info.get("phone") and info["phone"] not in entity["phones"]:
+                entity["phones"].append(info["phone"])
+            if role == "owner" and info.get("address"):
+                address = ", ".join(str(part) for part in (info.get("address"), info.get("city"),
+                                                           info.get("state"), info.get("zipcode")) if part)
+                if address not in entity["addresses"]:
+                    entity["addresses"].append(address)
+        return new
+
+    def save(self):
+        """
+        Add this process' unsaved sightings to the file and load what other workers saved.
+        """
+        if not self.path or not self.unsaved:
+            return
+        with locked(self.path):
+            entities = read_json(self.path, {})
+            for info in self.unsaved:
+                self.add(entities, info)
+            write_json(self.path, entities)
+        self.entities = entities
+        self.automaton = None
+        self.unsaved = []
+
+
+@lru_cache(maxsize=1)
+def get_gazetteer():
+    """
+    The shared gazetteer loaded from GAZETTEER_FILE, or None when it is turned off.
+    """
+    return Gazetteer() if GAZETTEER_FILE else None
@@ -0,0 +1,37 @@
+"""
+Lazily loaded spaCy pipeline and the company-name Matcher built on it.
+
+Nothing is loaded at import time; the first caller pays for spacy.load and every later
+call, batch or process-pool worker reuses the same pipeline and compiled Matcher.
+"""
+
+import os
+from functools import lru_cache
+
+SPACY_MODEL = os.getenv("SPACY_MODEL", "en_core_web_sm")
+
+COMPANY_SUFFIXES = ["INC", "LLC", "CORP", "CORPORATION", "GROUP", "ENTERPRISES", "HOLDINGS", "DBA", "CO",
+                    "LIMITED", "PARTNERSHIP", "ASSOCIATION", "COMPANY"]
+
+COMPANY_PATTERNS = [
+    [{"IS_ALPHA": True, "OP": "+"}, {"TEXT": {"in": COMPANY_SUFFIXES}}],
+    [{"IS_ALPHA": True, "OP": "+"}, {"IS_PUNCT": True}, {"IS_ALPHA": True, "OP": "+"}, {"TEXT": {"in": COMPANY_SUFFIXES}}],
+    [{"TEXT": {"in": ["DBA"]}}, {"IS_ALPHA": True, "OP": "+"}, {"IS_ALPHA": True, "OP": "+"}],
+]
+
+
+@lru_cache(maxsize=1)
+def get_nlp():
+    import spacy
+
+    return spacy.load(SPACY_MODEL)
+
+
+@lru_cache(maxsize=1)
+def get_company_matcher():
+    from spacy.matcher import Matcher
+
+    matcher = Matcher(get_nlp().vocab)
+    for pattern in COMPANY_PATTERNS:
+        matcher.add("COMPANY_NAME_PATTERN", [pattern])
+    return matcher
@@ -0,0 +1,88 @@
+"""
+PDF and extraction-result file helpers: watermark removal, text layers, result zips.
+"""
+
+import json
+import logging
+import os
+import zipfile
+
+logger = logging.getLogger(__name__)
+
+
+def load_structured_data(json_file_path: str) -> dict:
+    """
+    Load a structuredData.json, or the one inside an extraction result zip.
+    """
+    if json_file_path.endswith(".zip"):
+        with zipfile.ZipFile(json_file_path, 'r') as zip_ref:
+            return json.loads(zip_ref.read("structuredData.json").decode("utf-8"))
+    with open(json_file_path, 'r', encoding='utf-8') as file:
+        return json.load(file)
+
+
+def merge_text(data: dict) -> str:
+    return " ".join(element["Text"] for element in data.get("elements", []) if "Text" in element).strip()
+
+
+def get_merged_text(file_path: str) -> str:
+    return merge_text(load_structured_data(file_path))
+
+
+def unzip_file(zip_file_path, output_folder):
+    with zipfile.ZipFile(zip_file_path, 'r') as zip_ref:
+        zip_ref.extractall(output_folder)
+
+
+def remove_zip_file(zip_file_path):
+    try:
+        os.remove(zip_file_path)
+    except Exception as e:
+        logger.warning("Error removing zip file: %s", e)
+
+
+def remove_watermark(wm_text, inputFile, outputFile):
+    from PyPDF4 import PdfFileReader, PdfFileWriter
+    from PyPDF4.pdf import ContentStream
+    from PyPDF4.generic import TextStringObject, NameObject
+    from PyPDF4.utils import b_
+
+    with open(inputFile, "rb") as f:
+        source = PdfFileReader(f, "rb")
+        output = PdfFileWriter()
+
+        for page in range(source.getNumPages()):
+            page = source.getPage(page)
+            content_object = page["/Contents"].getObject()
+            content = ContentStream(content_object, source)
+
+            for operands, operator in content.operations:
+                if operator == b_("Tj"):
+                    text = operands[0]
+
+                    if isinstance(text, str) and text.startswith(wm_text):
+                        operands[0] = TextStringObject('')
+
+            page.__setitem__(NameObject('/Contents'), content)
+            output.addPage(page)
+
+        with open(outputFile, "wb") as outputStream:
+            output.write(outputStream)
+
+
+def read_page_texts(pdf_path: str) -> list:
+    """
+    The PDF's own text layer, one string per page; scanned pages come back empty.
+    """
+    from PyPDF4 import PdfFileReader
+
+    page_texts = []
+    with open(pdf_path, "rb") as f:
+        source = PdfFileReader(f, strict=False)
+        for page_number in range(source.getNumPages()):
+            try:
+                page_texts.append(source.getPage(page_number).extractText() or "")
+            except Exception as e:
+                logger.warning("Error reading text layer of %s page %d: %s", pdf_path, page_number + 1, e)
+                page_texts.append("")
+    return page_texts
@@ -0,0 +1,102 @@
+"""
+End-of-run normalization of result rows as column operations on a DataFrame.
+
+The extractors return raw values (amount digits as matched, empty table cells as "");
+this stage repairs and formats them for the whole table at once: amounts get their
+decimal repaired and a "$" prefix, phones and ZIP codes a single format, company names
+one canonical spelling per name and empty okcc table cells "N/A". Fields the extractors
+found nothing for stay empty. Columns are the result headers bot.py writes.
+"""
+
+import pandas as pd
+
+DOLLAR_COLUMN = "Dollar Amount"
+PHONE_COLUMN = "Phone Number"
+ZIP_COLUMN = "Property Zip"
+COMPANY_COLUMNS = ["Claimant", "Contractor", "Owner"]
+# Cells that only come from the okcc results table and read "N/A" when empty.
+TABLE_COLUMNS = ["File", "Instrument Number", "Type", "Date Recorded", "Book", "Page"]
+
+# Blank cells as they come back from the page, the journal or an older result.xlsx.
+MISSING = ["", "N/A", "NONE", "NAN"]
+COMPANY_SUFFIXES = {
+    "inc": "INC", "incorporated": "INC", "llc": "LLC", "l.l.c": "LLC", "corp": "CORP",
+    "corporation": "CORPORATION", "co": "CO", "company": "COMPANY", "ltd": "LTD", "pllc": "PLLC",
+}
+
+
+def blank_to_none(values: pd.Series) -> pd.Series:
+    values = values.astype("object").where(values.notna(), None)
+    text = values.astype(str).str.strip()
+    return text.where(~text.str.upper().isin(MISSING) & values.notna(), None)
+
+
+def normalize_amounts(values: pd.Series) -> pd.Series:
+    """
+    "22.692.92" -> "$22692.92", "$ 1,650.00" -> "$1650.00"; unparseable amounts become "$0".
+    """
+    values = blank_to_none(values)
+    digits = values.str.replace(r"[\s,$]", "", regex=True)
+    # Every "." followed by another "." is a misplaced thousands separator.
+    digits = digits.str.replace(r"\.(?=.*\.)", "", regex=True)
+    valid = pd.to_numeric(digits, errors="coerce").notna()
+    return ("$" + digits.where(valid, "0")).where(values.notna(), None)
+
+
+def normalize_phones(values: pd.Series) -> pd.Series:
+    """
+    Any US number (older results, hand edits) -> "+1-405-606-4448", the extractor's format;
+    other values are kept.
+    """
+    values = blank_to_none(values)
+    digits = values.str.replace(r"\D", "", regex=True).str.replace(r"^1(?=\d{10}$)", "", regex=True)
+    formatted = "+1-" + digits.str[:3] + "-" + digits.str[3:6] + "-" + digits.str[6:]
+    return formatted.where(digits.str.len() == 10, values)
+
+
+def normalize_zips(values: pd.Series) -> pd.Series:
+    values = blank_to_none(values)
+    parts = values.str.extract(r"(\d{5})(?:\s*-?\s*(\d{4}))?")
+    zips = parts[0].where(parts[1].isna(), parts[0] + "-" + parts[1])
+    return zips.where(parts[0].notna(), values)
+
+
+def canonicalize_companies(values: pd.Series) -> pd.Series:
+    """
+    Tidy whitespace, punctuation and suffixes, then give every spelling of the same name
+    (compared case- and punctuation-insensitively) its most frequent form in the table.
+    """
+    values = blank_to_none(values)
+    names = values.str.replace(r"\s+", " ", regex=True).str.strip(" ,.;:")
+    suffix = names.str.extract(r"[\s,]+([A-Za-z.]+)$")[0]
+    canonical_suffix = suffix.str.lower().str.rstrip(".").map(COMPANY_SUFFIXES)
+    names = names.where(canonical_suffix.isna(),
+                        names.str.replace(r"[\s,]+[A-Za-z.]+$", "", regex=True) + " " + canonical_suffix)
+
+    key = names.str.lower().str.replace(r"[^a-z0-9]", "", regex=True)
+    counts = pd.DataFrame({"key": key, "name": names}).dropna().groupby(["key", "name"]).size()
+    best = counts.reset_index(name="count").sort_values(["count", "name"], ascending=[False, True])
+    best = best.drop_duplicates("key").set_index("key")["name"]
+    return key.map(best).where(names.notna(), None)
+
+
+def normalize_results(frame: pd.DataFrame) -> pd.DataFrame:
+    """
+    Normalized copy of a result table.
+    """
+    frame = frame.copy()
+    if DOLLAR_COLUMN in frame:
+        frame[DOLLAR_COLUMN] = normalize_amounts(frame[DOLLAR_COLUMN])
+    if PHONE_COLUMN in frame:
+        frame[PHONE_COLUMN] = normalize_phones(frame[PHONE_COLUMN])
+    if ZIP_COLUMN in frame:
+        frame[ZIP_COLUMN] = normalize_zips(frame[ZIP_COLUMN])
+    for column in COMPANY_COLUMNS:
+        if column in frame:
+            # Names left as the okcc table had them ("N/A") or as None stay that way.
+            frame[column] = canonicalize_companies(frame[column]).where(
+                blank_to_none(frame[column]).notna(), frame[column])
+    for column in TABLE_COLUMNS:
+        if column in frame:
+            frame[column] = blank_to_none(frame[column]).fillna("N/A")
+    return frame
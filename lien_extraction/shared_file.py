@@ -0,0 +1,63 @@
+"""
+JSON state files written by several bot workers, on one host or on several sharing a volume.
+
+Each writer takes an exclusive lock on a sidecar "<path>.lock" file, re-reads the file,
+merges its own changes into what it finds and replaces the file atomically, so no worker
+overwrites entries another one saved in the meantime. The lock is a POSIX record lock
+(fcntl.lockf), which NFS and SMB volumes pass on to every host.
+"""
+
+import json
+import os
+import time
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+    import msvcrt
+
+
+@contextmanager
+def locked(path: str):
+    """
+    Hold the exclusive lock of path for the duration of the block.
+    """
+    with open(f"{path}.lock", "a+b") as lock_file:
+        if fcntl is not None:
+            fcntl.lockf(lock_file, fcntl.LOCK_EX)
+        else:
+            lock_file.seek(0)
+            while True:
+                try:
+                    msvcrt.locking(lock_file.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    # LK_LOCK gives up after ten seconds; keep waiting like lockf does.
+                    time.sleep(0.1)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.lockf(lock_file, fcntl.LOCK_UN)
+            else:
+                lock_file.seek(0)
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def read_json(path: str, default=None):
+    if not os.path.isfile(path):
+        return default
+    with open(path, "r", encoding="utf-8") as file:
+        return json.load(file)
+
+
+def write_json(path: str, data):
+    """
+    Replace path with data in one step; call it under locked(path).
+    """
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "w", encoding="utf-8") as file:
+        json.dump(data, file)
+    os.replace(temp_path, path)
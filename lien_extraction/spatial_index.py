@@ -0,0 +1,185 @@
+"""
+Per-document spatial index over Adobe's char-bound text elements.
+
+Elements are bucketed by page into a uniform grid (PDF points, origin bottom-left as in
+structuredData.json) and their words into an inverted index, so "text to the right of /
+below the label 'Owner:'" is a handful of bucket lookups instead of a regex window over
+the whole merged text.
+"""
+
+import json
+import math
+import re
+
+CELL_SIZE = 72.0
+LINE_TOLERANCE = 4.0
+MAX_RIGHT_GAP = 300.0
+MAX_BELOW_GAP = 40.0
+WORD_PATTERN = re.compile(r"[a-z0-9]+")
+
+
+class ElementIndex:
+    def __init__(self, elements, cell_size=CELL_SIZE):
+        self.cell_size = cell_size
+        self.elements = []
+        self.grid = {}
+        self.words = {}
+
+        for element in elements:
+            text = element.get("Text")
+            bounds = element.get("Bounds")
+            if not text or not bounds:
+                continue
+            element_id = len(self.elements)
+            self.elements.append({
+                "page": element.get("Page", 0),
+                "bounds": tuple(bounds),
+                "text": text,
+                "chars": element.get("CharBounds"),
+            })
+            for cell in self.cells(element.get("Page", 0), bounds):
+                self.grid.setdefault(cell, []).append(element_id)
+            for word in set(WORD_PATTERN.findall(text.lower())):
+                self.words.setdefault(word, []).append(element_id)
+
+    @classmethod
+    def from_json(cls, json_file_path):
+        with open(json_file_path, 'r', encoding='utf-8') as file:
+            data = json.load(file)
+        return cls(data.get("elements", []))
+
+    def cells(self, page, bounds):
+        x0, y0, x1, y1 = bounds
+        for cx in range(int(x0 // self.cell_size), int(x1 // self.cell_size) + 1):
+            for cy in range(int(y0 // self.cell_size), int(y1 // self.cell_size) + 1):
+                yield page, cx, cy
+
+    def query(self, page, bounds) -> list:
+        """
+        Ids of elements on page whose bounds intersect the rectangle (x0, y0, x1, y1).
+        """
+        x0, y0, x1, y1 = bounds
+        found = set()
+        for cell in self.cells(page, bounds):
+            for element_id in self.grid.get(cell, ()):
+                ex0, ey0, ex1, ey1 = self.elements[element_id]["bounds"]
+                if ex0 <= x1 and ex1 >= x0 and ey0 <= y1 and ey1 >= y0:
+                    found.add(element_id)
+        return sorted(found)
+
+    def find_label(self, label) -> list:
+        """
+        Label occurrences as (element id, char start, char end), label-like ones only:
+        followed by a colon, or starting a short element ("Claimant", "Property Owner").
+        """
+        words = WORD_PATTERN.findall(label.lower())
+        if not words:
+            return []
+        candidates = set(self.words.get(words[0], ()))
+        for word in words[1:]:
+            candidates &= set(self.words.get(word, ()))
+
+        pattern = re.compile(r"\b" + re.escape(label) + r"\b(\s*:)?", re.IGNORECASE)
+        occurrences = []
+        for element_id in sorted(candidates):
+            text = self.elements[element_id]["text"]
+            for match in pattern.finditer(text):
+                starts_short_element = not text[:match.start()].strip() and len(text.strip()) <= len(label) + 40
+                if match.group(1) or starts_short_element:
+                    occurrences.append((element_id, match.start(), match.end()))
+        return occurrences
+
+    def label_bounds(self, element_id, start, end):
+        element = self.elements[element_id]
+        chars = element["chars"]
+        if chars and len(chars) == len(element["text"]) and end > start:
+            boxes = chars[start:end]
+            return (min(b[0] for b in boxes), min(b[1] for b in boxes),
+                    max(b[2] for b in boxes), max(b[3] for b in boxes))
+        return element["bounds"]
+
+    def right_of(self, element_id, bounds, max_gap=MAX_RIGHT_GAP) -> list:
+        """
+        Elements on the same line as bounds and to its right, nearest first.
+        """
+        page = self.elements[element_id]["page"]
+        x0, y0, x1, y1 = bounds
+        middle = (y0 + y1) / 2
+        found = []
+        for other in self.query(page, (x1, y0 - LINE_TOLERANCE, x1 + max_gap, y1 + LINE_TOLERANCE)):
+            ox0, oy0, ox1, oy1 = self.elements[other]["bounds"]
+            if other != element_id and ox0 >= x1 - LINE_TOLERANCE and oy0 - LINE_TOLERANCE <= middle <= oy1 + LINE_TOLERANCE:
+                found.append((ox0 - x1, other))
+        return [other for _, other in sorted(found)]
+
+    def below(self, element_id, bounds, lines=1, max_gap=MAX_BELOW_GAP) -> list:
+        """
+        Up to `lines` elements stacked directly under bounds, top to bottom.
+        """
+        page = self.elements[element_id]["page"]
+        x0, y0, x1, y1 = bounds
+        stacked = []
+        top = y0
+        for _ in range(lines):
+            found = []
+            for other in self.query(page, (x0 - LINE_TOLERANCE, top - max_gap, x0 + MAX_RIGHT_GAP, top)):
+                ox0, oy0, ox1, oy1 = self.elements[other]["bounds"]
+                if other != element_id and other not in stacked and oy1 <= top + LINE_TOLERANCE:
+                    found.append((top - oy1, ox0, other))
+            if not found:
+                break
+            _, _, nearest = min(found)
+            stacked.append(nearest)
+            top = self.elements[nearest]["bounds"][1]
+        return stacked
+
+    def nearest(self, element_id, bounds, max_distance=CELL_SIZE * 4):
+        """
+        The element closest to bounds on the same page, searching grid rings outward.
+        """
+        page = self.elements[element_id]["page"]
+        x0, y0, x1, y1 = bounds
+        best = None
+        rings = int(math.ceil(max_distance / self.cell_size))
+        for ring in range(rings + 1):
+            pad = ring * self.cell_size
+            for other in self.query(page, (x0 - pad, y0 - pad, x1 + pad, y1 + pad)):
+                if other == element_id:
+                    continue
+                distance = box_distance(bounds, self.elements[other]["bounds"])
+                if distance <= max_distance and (best is None or distance < best[0]):
+                    best = (distance, other)
+            # Anything in a farther ring is at least `pad` away.
+            if best is not None and best[0] <= pad:
+                break
+        return best[1] if best else None
+
+    def value_for(self, labels, lines=3) -> str:
+        """
+        Text that a label introduces: what follows it in its own element, else the
+        element to its right on the same line, else up to `lines` elements below it.
+        """
+        if isinstance(labels, str):
+            labels = [labels]
+        for label in labels:
+            for element_id, start, end in self.find_label(label):
+                text = self.elements[element_id]["text"]
+                trailing = text[end:].strip(" :\n")
+                if len(trailing) >= 2:
+                    return trailing
+
+                bounds = self.label_bounds(element_id, start, end)
+                right = self.right_of(element_id, bounds)
+                if right:
+                    return self.elements[right[0]]["text"].strip()
+
+                below = self.below(element_id, bounds, lines=lines)
+                if below:
+                    return " ".join(self.elements[other]["text"].strip() for other in below)
+        return None
+
+
+def box_distance(a, b) -> float:
+    dx = max(0.0, b[0] - a[2], a[0] - b[2])
+    dy = max(0.0, b[1] - a[3], a[1] - b[3])
+    return math.hypot(dx, dy)
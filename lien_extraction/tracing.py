@@ -0,0 +1,133 @@
+"""
+Sampled per-document tracing exported as Chrome trace-event JSON.
+
+With TRACE_SAMPLE_RATE > 0, each document is traced with that probability: its spans
+(download, watermark removal, the extraction service call, unzip, every get_*
+extractor, ...) land on their own track named after the instrument, so a whole run opens
+in chrome://tracing or Perfetto as one row per lien. Spans outside a sampled document
+cost one context-variable lookup. Run-level spans (results pages, writes) go on track 0.
+"""
+
+import asyncio
+import contextlib
+import contextvars
+import functools
+import itertools
+import json
+import os
+import random
+import threading
+import time
+
+TRACE_FILE = os.getenv("TRACE_FILE", "trace.json")
+TRACE_SAMPLE_RATE = float(os.getenv("TRACE_SAMPLE_RATE", "0"))
+
+RUN_TRACK = 0
+
+current_track = contextvars.ContextVar("current_track", default=None)
+
+
+class Tracer:
+    def __init__(self, sample_rate=TRACE_SAMPLE_RATE, path=TRACE_FILE):
+        self.sample_rate = sample_rate
+        self.path = path
+        self.events = []
+        self.lock = threading.Lock()
+        self.tracks = itertools.count(RUN_TRACK + 1)
+        self.pid = os.getpid()
+        self.origin = time.perf_counter()
+        if self.enabled:
+            self.name_track(RUN_TRACK, "run")
+
+    @property
+    def enabled(self) -> bool:
+        return self.sample_rate > 0
+
+    def now(self) -> float:
+        return (time.perf_counter() - self.origin) * 1_000_000
+
+    def add(self, event):
+        with self.lock:
+            self.events.append(event)
+
+    def name_track(self, track, name):
+        self.add({"name": "thread_name", "ph": "M", "pid": self.pid, "tid": track, "args": {"name": name}})
+
+    @contextlib.contextmanager
+    def document(self, name, **args):
+        """
+        Trace everything inside the block on a new track, if this document is sampled.
+        """
+        if not self.enabled or random.random() >= self.sample_rate:
+            yield False
+            return
+        track = next(self.tracks)
+        self.name_track(track, name)
+        token = current_track.set(track)
+        try:
+            with self.record(track, name, "document", args):
+                yield True
+        finally:
+            current_track.reset(token)
+
+    def span(self, name, **args):
+        track = current_track.get()
+        if track is None:
+            return contextlib.nullcontext()
+        return self.record(track, name, "step", args)
+
+    def run_span(self, name, **args):
+        if not self.enabled:
+            return contextlib.nullcontext()
+        return self.record(RUN_TRACK, name, "run", args)
+
+    @contextlib.contextmanager
+    def record(self, track, name, category, args):
+        started = self.now()
+        try:
+            yield
+        except BaseException as e:
+            args = dict(args, error=repr(e))
+            raise
+        finally:
+            self.add({"name": name, "cat": category, "ph": "X", "ts": started, "dur": self.now() - started,
+                      "pid": self.pid, "tid": track, "args": args})
+
+    def traced(self, name=None):
+        """
+        Decorator recording every call of a sync or async function as a span.
+        """
+        def decorate(fn):
+            span_name = name or fn.__name__
+            if asyncio.iscoroutinefunction(fn):
+                @functools.wraps(fn)
+                async def async_wrapper(*args, **kwargs):
+                    with self.span(span_name):
+                        return await fn(*args, **kwargs)
+                return async_wrapper
+
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                with self.span(span_name):
+                    return fn(*args, **kwargs)
+            return wrapper
+        return decorate
+
+    def export(self, path=None):
+        """
+        Write the collected events as Chrome trace-event JSON; a no-op when tracing is off.
+        """
+        if not self.enabled:
+            return None
+        path = path or self.path
+        with self.lock:
+            events = list(self.events)
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, file, default=str)
+        print(f"Trace with {len(events)} events written to {path}")
+        return path
+
+
+tracer = Tracer()
+span = tracer.span
+traced = tracer.traced
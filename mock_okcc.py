@@ -0,0 +1,483 @@
+"""
+Local stand-in for the parts of okcc.online that bot.py drives.
+
+Serves the search form, flatpickr-style date pickers, the paginated #rod-table with
+OpenP buttons and document.php returning PDFs, with configurable latency and error
+rates. Run it and point the bot at it:
+
+    python mock_okcc.py --port 8765 --liens 300 --latency 0.2 --error-rate 0.05
+    OKCC_BASE_URL=http://127.0.0.1:8765 OKCC_SEARCH_WAIT=2 python bot.py
+"""
+
+import argparse
+import glob
+import json
+import os
+import random
+import threading
+import time
+import zlib
+from datetime import date, datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+MERGED_TEXT_DIR = os.path.join("fixtures", "merged_text")
+PAGE_SIZE = 25
+WATERMARK = "UNOFFICIAL"
+
+TABLE_HEADERS = ["File", "Instrument Number", "Type", "Date Recorded", "Book", "Page",
+                 "Grantor", "Grantee", "Owner", "Legal Description"]
+
+INDEX_HTML = """<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<title>Oklahoma County Clerk - Records (mock)</title>
+<style>
+  body { font-family: Arial, sans-serif; margin: 20px; }
+  .hidden { display: none; }
+  #areastyle .col-md-4 { display: inline-block; width: 30%; vertical-align: top; }
+  #areastyle i { cursor: pointer; font-style: normal; padding: 4px; border: 1px solid #999; }
+  #rodDocTypeList div { cursor: pointer; padding: 2px; }
+  .flatpickr-calendar { display: none; position: absolute; background: #fff; border: 1px solid #888; z-index: 10; width: 240px; }
+  .flatpickr-calendar.open { display: block; }
+  .flatpickr-months { display: flex; justify-content: space-between; padding: 4px; }
+  .flatpickr-prev-month, .flatpickr-next-month { cursor: pointer; }
+  .dayContainer span { display: inline-block; width: 30px; text-align: center; cursor: pointer; }
+  .dayContainer span.prevMonthDay, .dayContainer span.nextMonthDay { color: #bbb; }
+  .rod-pages i { cursor: pointer; font-style: normal; padding: 0 6px; }
+  #rod-table td, #rod-table th { border: 1px solid #ccc; padding: 2px 6px; }
+  .pdf-viewer { position: fixed; top: 5%; left: 5%; width: 90%; height: 90%; background: #fff; border: 2px solid #333; z-index: 20; }
+  .pdf-viewer iframe { width: 100%; height: 90%; }
+</style>
+</head>
+<body>
+<div id="areastyle">
+  <div class="col-md-4">
+    <h4>Real Estate</h4>
+    <ul class="text-start">
+      <li><i class="fa-solid fa-file-magnifying-glass" onclick="showTypeSearch()">Search by Document Type</i></li>
+    </ul>
+  </div>
+  <div class="col-md-4"><h4>Court Records</h4></div>
+  <div class="col-md-4"><h4>Marriage</h4></div>
+</div>
+
+<div id="rod-type-search" class="hidden">
+  <label>Document Type <input id="rodDocTypeTxt" autocomplete="off" oninput="filterDocTypes()"></label>
+  <div id="rodDocTypeList"></div>
+  <label><input type="radio" id="date_range_rod_type" name="rod_type_range" onclick="showDateRange()"> Date Range</label>
+  <div id="drwrapper-rod-type" class="hidden">
+    <input id="rodDateFromTxt" readonly placeholder="From">
+    <input id="rodToDateTxt" readonly placeholder="To">
+  </div>
+  <button id="rod-submit-type-search" onclick="submitTypeSearch()">Search</button>
+</div>
+
+<div id="rod_type_table_row" class="hidden">
+  <div>
+    <div>
+      <div class="rod-pages">
+        <i class="fa-solid fa-angle-left" onclick="gotoPage(currentPage - 1)">&lsaquo;</i>
+        Page <label class="rodCurPgLbl">1</label> of <label class="rodMxPgLbl">1</label>
+        <i class="fa-solid fa-angle-right" onclick="gotoPage(currentPage + 1)">&rsaquo;</i>
+      </div>
+      <table id="rod-table">
+        <thead><tr>__HEADERS__</tr></thead>
+        <tbody id="rodinitialbody"></tbody>
+      </table>
+      <div class="rod-pages">
+        Page <label class="rodCurPgLbl">1</label> of <label class="rodMxPgLbl">1</label>
+      </div>
+    </div>
+  </div>
+</div>
+
+<script>
+var DOC_TYPES = ["MD - MORTGAGE DEED", "ML - MECHANIC LIEN", "MLR - MECHANIC LIEN RELEASE", "WD - WARRANTY DEED"];
+var selectedDocType = null;
+var results = [];
+var currentPage = 1;
+var pageSize = __PAGE_SIZE__;
+
+function showTypeSearch() {
+  document.getElementById("rod-type-search").classList.remove("hidden");
+}
+
+function filterDocTypes() {
+  var query = document.getElementById("rodDocTypeTxt").value.trim().toUpperCase();
+  var list = document.getElementById("rodDocTypeList");
+  list.innerHTML = "";
+  DOC_TYPES.filter(function (t) { return query && t.indexOf(query) === 0; }).forEach(function (t) {
+    var option = document.createElement("div");
+    option.textContent = t;
+    option.onclick = function () {
+      selectedDocType = t.split(" - ")[0];
+      document.getElementById("rodDocTypeTxt").value = t;
+      list.innerHTML = "";
+    };
+    list.appendChild(option);
+  });
+}
+
+function showDateRange() {
+  document.getElementById("drwrapper-rod-type").classList.remove("hidden");
+}
+
+function pad(n) { return (n < 10 ? "0" : "") + n; }
+
+function Picker(input) {
+  var self = this;
+  self.input = input;
+  self.el = document.createElement("div");
+  self.el.className = "flatpickr-calendar";
+  self.el.innerHTML =
+    '<div class="flatpickr-months">' +
+    '<span class="flatpickr-prev-month"><svg width="14" height="14" viewBox="0 0 17 17"><path d="M5.207 8.471l7.146 7.147-0.707 0.707-7.853-7.854 7.854-7.853 0.707 0.707-7.147 7.146z"></path></svg></span>' +
+    '<span class="flatpickr-current-month"></span>' +
+    '<span class="flatpickr-next-month"><svg width="14" height="14" viewBox="0 0 17 17"><path d="M13.207 8.472l-7.854 7.854-0.707-0.707 7.146-7.146-7.146-7.148 0.707-0.707 7.854 7.854z"></path></svg></span>' +
+    '</div>' +
+    '<div class="flatpickr-innerContainer"><div class="dayContainer"></div></div>';
+  document.body.appendChild(self.el);
+  self.el.querySelector(".flatpickr-prev-month").onclick = function () { self.shift(-1); };
+  self.el.querySelector(".flatpickr-next-month").onclick = function () { self.shift(1); };
+  input.addEventListener("click", function () { self.open(); });
+}
+
+Picker.all = [];
+
+Picker.prototype.open = function () {
+  Picker.all.forEach(function (p) { p.el.classList.remove("open"); });
+  var today = new Date();
+  this.view = new Date(today.getFullYear(), today.getMonth(), 1);
+  var rect = this.input.getBoundingClientRect();
+  this.el.style.top = (rect.bottom + window.scrollY) + "px";
+  this.el.style.left = (rect.left + window.scrollX) + "px";
+  this.el.classList.add("open");
+  this.render();
+};
+
+Picker.prototype.shift = function (months) {
+  this.view = new Date(this.view.getFullYear(), this.view.getMonth() + months, 1);
+  this.render();
+};
+
+Picker.prototype.render = function () {
+  var self = this;
+  var year = self.view.getFullYear();
+  var month = self.view.getMonth();
+  self.el.querySelector(".flatpickr-current-month").textContent = year + "-" + pad(month + 1);
+  var container = self.el.querySelector(".dayContainer");
+  container.innerHTML = "";
+  var start = new Date(year, month, 1 - new Date(year, month, 1).getDay());
+  for (var i = 0; i < 42; i++) {
+    var day = new Date(start.getFullYear(), start.getMonth(), start.getDate() + i);
+    var span = document.createElement("span");
+    span.className = "flatpickr-day";
+    if (day.getMonth() !== month) {
+      span.className += day < self.view ? " prevMonthDay" : " nextMonthDay";
+    }
+    span.textContent = String(day.getDate());
+    span.onclick = (function (d) {
+      return function () {
+        self.input.value = pad(d.getMonth() + 1) + "/" + pad(d.getDate()) + "/" + d.getFullYear();
+        self.el.classList.remove("open");
+      };
+    })(day);
+    container.appendChild(span);
+  }
+};
+
+Picker.all.push(new Picker(document.getElementById("rodDateFromTxt")));
+Picker.all.push(new Picker(document.getElementById("rodToDateTxt")));
+
+function submitTypeSearch() {
+  var params = new URLSearchParams({
+    type: selectedDocType || "",
+    from: document.getElementById("rodDateFromTxt").value,
+    to: document.getElementById("rodToDateTxt").value
+  });
+  fetch("search.php?" + params.toString())
+    .then(function (r) { return r.json(); })
+    .then(function (data) {
+      results = data.rows;
+      document.getElementById("rod_type_table_row").classList.remove("hidden");
+      gotoPage(1);
+    });
+}
+
+function maxPage() { return Math.max(1, Math.ceil(results.length / pageSize)); }
+
+function gotoPage(page) {
+  if (page < 1 || page > maxPage()) { return; }
+  currentPage = page;
+  document.querySelectorAll(".rodCurPgLbl").forEach(function (l) { l.textContent = String(page); });
+  document.querySelectorAll(".rodMxPgLbl").forEach(function (l) { l.textContent = String(maxPage()); });
+  var body = document.getElementById("rodinitialbody");
+  body.innerHTML = "";
+  results.slice((page - 1) * pageSize, page * pageSize).forEach(function (row) {
+    var tr = document.createElement("tr");
+    var first = document.createElement("td");
+    first.innerHTML = "<div><button class=\\"btn btn-sm\\" onclick=\\"OpenP('" + row.key + "',this,'" + row.docid + "')\\">PDF</button></div>";
+    tr.appendChild(first);
+    row.cells.forEach(function (value) {
+      var td = document.createElement("td");
+      td.textContent = value;
+      tr.appendChild(td);
+    });
+    body.appendChild(tr);
+  });
+}
+
+function OpenP(key, element, docid) {
+  var existing = document.querySelector(".pdf-viewer");
+  if (existing) { existing.remove(); }
+  var viewer = document.createElement("div");
+  viewer.className = "pdf-viewer";
+  viewer.innerHTML = '<button class="pdf-close">Close</button>' +
+    '<iframe src="document.php?key=' + encodeURIComponent(key) + '&docid=' + encodeURIComponent(docid) + '"></iframe>';
+  viewer.querySelector(".pdf-close").onclick = function () { viewer.remove(); };
+  document.body.appendChild(viewer);
+}
+</script>
+</body>
+</html>
+"""
+
+def pdf_escape(text):
+    text = text.encode("latin-1", "replace").decode("latin-1")
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+def wrap_lines(text, width=90):
+    lines = []
+    for paragraph in text.split("  "):
+        paragraph = paragraph.strip()
+        while len(paragraph) > width:
+            cut = paragraph.rfind(" ", 0, width)
+            cut = cut if cut > 0 else width
+            lines.append(paragraph[:cut])
+            paragraph = paragraph[cut:].strip()
+        if paragraph:
+            lines.append(paragraph)
+    return lines
+
+def build_pdf(text, watermark=WATERMARK, lines_per_page=50):
+    """
+    Build a small text PDF with a watermark Tj on every page, like the county's copies.
+    """
+    lines = wrap_lines(text) or [""]
+    pages = [lines[i:i + lines_per_page] for i in range(0, len(lines), lines_per_page)]
+
+    objects = []
+    page_ids = []
+    font_id = 3
+    objects.append(None)  # 1: catalog
+    objects.append(None)  # 2: pages
+    objects.append(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+
+    for page_lines in pages:
+        stream = [f"BT /F1 40 Tf 0.9 g 150 400 Td ({watermark} COPY) Tj ET", "BT /F1 10 Tf 0 g 72 750 Td 12 TL"]
+        for line in page_lines:
+            stream.append(f"({pdf_escape(line)}) '")
+        stream.append("ET")
+        content = "\n".join(stream).encode("latin-1")
+        objects.append(b"<< /Length " + str(len(content)).encode() + b" >>\nstream\n" + content + b"\nendstream")
+        content_id = len(objects)
+        objects.append(f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+                       f"/Resources << /Font << /F1 {font_id} 0 R >> >> /Contents {content_id} 0 R >>".encode())
+        page_ids.append(len(objects))
+
+    objects[0] = b"<< /Type /Catalog /Pages 2 0 R >>"
+    kids = " ".join(f"{page_id} 0 R" for page_id in page_ids)
+    objects[1] = f"<< /Type /Pages /Kids [{kids}] /Count {len(page_ids)} >>".encode()
+
+    output = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(output))
+        output += f"{number} 0 obj\n".encode() + body + b"\nendobj\n"
+    xref = len(output)
+    output += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    for offset in offsets:
+        output += f"{offset:010d} 00000 n \n".encode()
+    output += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode()
+    return bytes(output)
+
+class MockOkcc:
+    def __init__(self, liens=300, days=120, latency=0.0, jitter=0.0, error_rate=0.0,
+                 error_status=503, pdf_dir=None, page_size=PAGE_SIZE, seed=0):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.page_size = page_size
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.stats = {"search": 0, "document": 0, "errors": 0}
+        self.pdf_files = sorted(glob.glob(os.path.join(pdf_dir, "*.pdf"))) if pdf_dir else []
+        self.samples = self.load_samples()
+        self.liens = self.generate_liens(liens, days)
+        self.by_docid = {lien["docid"]: lien for lien in self.liens}
+
+    @staticmethod
+    def load_samples():
+        samples = []
+        for path in sorted(glob.glob(os.path.join(MERGED_TEXT_DIR, "*.txt"))):
+            with open(path, "r", encoding="utf-8") as file:
+                samples.append(file.read().strip())
+        return samples or ["MECHANIC'S OR MATERIALMAN'S LIEN STATEMENT Claimant: ACME SUPPLY LLC Amount of Claim $1,000.00"]
+
+    def generate_liens(self, count, days):
+        today = date.today()
+        liens = []
+        for i in range(count):
+            recorded = today - timedelta(days=self.random.randint(0, days))
+            instrument = f"{recorded:%Y%m%d}0{1040000 + i:07d}"
+            docid = f"{9000000 + i}"
+            liens.append({
+                "key": instrument,
+                "docid": docid,
+                "date": recorded,
+                "cells": [
+                    instrument,
+                    "ML - MECHANIC LIEN",
+                    f"{recorded:%m/%d/%Y}",
+                    str(16000 + i // 40),
+                    str(1 + (i * 7) % 1900),
+                    "", "", "", "",
+                ],
+                "sample": i % len(self.samples),
+            })
+        liens.sort(key=lambda lien: (lien["date"], lien["key"]))
+        return liens
+
+    def delay(self):
+        with self.lock:
+            pause = max(0.0, self.latency + self.random.uniform(-self.jitter, self.jitter))
+            fail = self.random.random() < self.error_rate
+        if pause:
+            time.sleep(pause)
+        return fail
+
+    def search(self, doc_type, date_from, date_to):
+        with self.lock:
+            self.stats["search"] += 1
+        rows = []
+        for lien in self.liens:
+            if doc_type and not lien["cells"][1].startswith(doc_type + " "):
+                continue
+            if date_from and lien["date"] < date_from:
+                continue
+            if date_to and lien["date"] > date_to:
+                continue
+            rows.append({"key": lien["key"], "docid": lien["docid"], "cells": lien["cells"]})
+        return rows
+
+    def document(self, docid):
+        lien = self.by_docid.get(docid)
+        if lien is None:
+            return None
+        with self.lock:
+            self.stats["document"] += 1
+        if self.pdf_files:
+            path = self.pdf_files[zlib.crc32(docid.encode()) % len(self.pdf_files)]
+            with open(path, "rb") as file:
+                return file.read()
+        return build_pdf(self.samples[lien["sample"]])
+
+def parse_date(value):
+    try:
+        return datetime.strptime(value, "%m/%d/%Y").date()
+    except (TypeError, ValueError):
+        return None
+
+def make_handler(site):
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, format, *args):
+            pass
+
+        def send_body(self, status, body, content_type, headers=None):
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            for name, value in (headers or {}).items():
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(body)
+
+        def send_error_status(self):
+            with site.lock:
+                site.stats["errors"] += 1
+            headers = {"Retry-After": "1"} if site.error_status in (429, 503) else None
+            self.send_body(site.error_status, b"Service Unavailable", "text/plain", headers)
+
+        def do_GET(self):
+            url = urlparse(self.path)
+            query = {key: values[0] for key, values in parse_qs(url.query).items()}
+
+            if url.path in ("/", "/index.php"):
+                html = INDEX_HTML.replace("__PAGE_SIZE__", str(site.page_size))
+                html = html.replace("__HEADERS__", "".join(f"<th>{title}</th>" for title in TABLE_HEADERS))
+                self.send_body(200, html.encode("utf-8"), "text/html; charset=utf-8")
+
+            elif url.path == "/search.php":
+                if site.delay():
+                    self.send_error_status()
+                    return
+                rows = site.search(query.get("type"), parse_date(query.get("from")), parse_date(query.get("to")))
+                self.send_body(200, json.dumps({"rows": rows}).encode("utf-8"), "application/json")
+
+            elif url.path == "/document.php":
+                if site.delay():
+                    self.send_error_status()
+                    return
+                pdf = site.document(query.get("docid", ""))
+                if pdf is None:
+                    self.send_body(404, b"Document not found", "text/plain")
+                    return
+                self.send_body(200, pdf, "application/pdf")
+
+            elif url.path == "/stats":
+                with site.lock:
+                    body = json.dumps(site.stats).encode("utf-8")
+                self.send_body(200, body, "application/json")
+
+            else:
+                self.send_body(404, b"Not found", "text/plain")
+
+    return Handler
+
+def serve(site, host="127.0.0.1", port=8765):
+    server = ThreadingHTTPServer((host, port), make_handler(site))
+    print(f"Mock okcc serving {len(site.liens)} liens at http://{host}:{server.server_port}/index.php")
+    return server
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve a local stand-in for okcc.online.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--liens", type=int, default=300, help="number of synthetic liens")
+    parser.add_argument("--days", type=int, default=120, help="spread liens over this many past days")
+    parser.add_argument("--page-size", type=int, default=PAGE_SIZE)
+    parser.add_argument("--latency", type=float, default=0.0, help="mean seconds added to search/document requests")
+    parser.add_argument("--jitter", type=float, default=0.0, help="+/- seconds of uniform latency jitter")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of requests that fail")
+    parser.add_argument("--error-status", type=int, default=503, help="HTTP status returned for failures")
+    parser.add_argument("--pdf-dir", help="serve PDFs from this directory instead of generated ones")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    site = MockOkcc(liens=args.liens, days=args.days, latency=args.latency, jitter=args.jitter,
+                    error_rate=args.error_rate, error_status=args.error_status, pdf_dir=args.pdf_dir,
+                    page_size=args.page_size, seed=args.seed)
+    server = serve(site, args.host, args.port)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print(f"Stats: {site.stats}")
+
+if __name__ == "__main__":
+    main()
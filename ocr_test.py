@@ -1,17 +1,11 @@
-import zipfile
 import os
 from datetime import datetime
 from sdk.extract_text_info_from_pdf import ExtractTextInfoFromPDF
 from sdk.extract_text_info_with_char_bounds_from_pdf import ExtractTextInfoWithCharBoundsFromPDF
 import json
 import re
-from PIL import Image
-from io import BytesIO
-import usaddress
-import spacy
-from spacy.matcher import Matcher
-
-nlp = spacy.load("en_core_web_sm")
+from lien_extraction import (extract_address, extract_company_name, get_merged_text, remove_watermark,
+                             remove_zip_file, unzip_file)
 
 def extract_largest_dollar_amount(json_file_path):
     with open(json_file_path, 'r', encoding='utf-8') as file:
@@ -28,159 +22,6 @@ def extract_largest_dollar_amount(json_file_path):
 
     return max(dollar_values, default=None)
 
-def unzip_file(zip_file_path, output_folder):
-    with zipfile.ZipFile(zip_file_path, 'r') as zip_ref:
-        zip_ref.extractall(output_folder)
-
-def remove_zip_file(zip_file_path):
-    try:
-        os.remove(zip_file_path)
-    except Exception as e:
-        print(f"Error removing zip file: {e}")
-
-def remove_watermark(wm_text, inputFile, outputFile):
-    from PyPDF4 import PdfFileReader, PdfFileWriter
-    from PyPDF4.pdf import ContentStream
-    from PyPDF4.generic import TextStringObject, NameObject
-    from PyPDF4.utils import b_
-    
-    with open(inputFile, "rb") as f:
-        source = PdfFileReader(f, "rb")
-        output = PdfFileWriter()
-
-        for page in range(source.getNumPages()):
-            page = source.getPage(page)
-            content_object = page["/Contents"].getObject()
-            content = ContentStream(content_object, source)
-
-            for operands, operator in content.operations:
-                if operator == b_("Tj"):
-                    text = operands[0]
-
-                    if isinstance(text, str) and text.startswith(wm_text):
-                        operands[0] = TextStringObject('')
-
-            page.__setitem__(NameObject('/Contents'), content)
-            output.addPage(page)
-
-        with open(outputFile, "wb") as outputStream:
-            output.write(outputStream)
-
-def extract_address(text):
-    try:
-        if not text:
-            return None, None, None, None
-
-        def clean_text(text):
-            return re.sub(r'[^\x00-\x7F]+', ' ', text).strip()
-
-        text = clean_text(text)
-        text = re.sub(r'\s+', ' ', text)
-
-        print("Cleaned Text:", text)  
-
-        try:
-            parsed_address = usaddress.parse(text)
-            print("usaddress.parse output:", parsed_address) 
-
-            address_number = None
-            street_name = []
-            street_name_post_type = None
-            place_name = None
-            state_name = None
-            zip_code = None
-
-            for component, label in parsed_address:
-                if label == "AddressNumber" and not address_number:
-                    address_number = component
-                elif label == "StreetName" and not street_name:
-                    street_name.append(component)
-                elif label == "StreetNamePostType" and not street_name_post_type:
-                    street_name_post_type = component
-                elif label == "PlaceName" and not place_name:
-                    place_name = component.strip(",")
-                elif label == "StateName" and not state_name:
-                    state_name = component
-                elif label == "ZipCode" and not zip_code:
-                    zip_code = component
-
-            if address_number and street_name and street_name_post_type:
-                best_address = " ".join([address_number] + street_name + [street_name_post_type])
-            elif street_name:
-                best_address = " ".join([address_number] + street_name) if address_number else " ".join(street_name)
-
-            best_city = place_name
-            best_state = state_name
-            best_zipcode = zip_code
-
-            print("Final Address:", best_address, best_city, best_state, best_zipcode)
-
-        except usaddress.RepeatedLabelError:
-            print("usaddress.parse failed")
-
-        return best_address, best_city, best_state, best_zipcode
-
-    except Exception as e:
-        print(f"Error in extract_address: {e}")
-        return None, None, None, None
-    
-def get_merged_text(file_path: str) -> str:
-    with open(file_path, 'r') as file:
-        json_data = json.load(file)
-
-    merged_text = ""
-    for element in json_data.get("elements", []):
-        if "Text" in element:
-            merged_text += element["Text"] + " "
-    
-    return merged_text.strip()
-
-def extract_company_name(text):
-    doc = nlp(text)
-    
-    matcher = Matcher(nlp.vocab)
-    
-    company_patterns = [
-        [{"TEXT": {"in": ["INC", "LLC", "CORP", "CORPORATION", "GROUP", "ENTERPRISES", "HOLDINGS", "DBA", "CO", "LIMITED", "PARTNERSHIP", "ASSOCIATION"]}}],  
-        [{"IS_ALPHA": True, "OP": "+"}, {"TEXT": {"in": ["INC", "LLC", "CORP", "CORPORATION", "GROUP", "ENTERPRISES", "HOLDINGS", "DBA", "CO", "LIMITED", "PARTNERSHIP", "ASSOCIATION"]}}],  
-        [{"IS_ALPHA": True, "OP": "+"}, {"IS_PUNCT": True}, {"IS_ALPHA": True, "OP": "+"}, {"TEXT": {"in": ["INC", "LLC", "CORPORATION", "GROUP", "ENTERPRISES", "HOLDINGS", "DBA", "ASSOCIATION"]}}],  
-        [{"IS_ALPHA": True, "OP": "+"}, {"TEXT": {"in": ["GROUP", "ENTERPRISES", "HOLDINGS", "CORPORATION", "COMPANY", "LLC", "ASSOCIATION"]}}],  
-        [{"TEXT": {"in": ["DBA"]}}, {"IS_ALPHA": True, "OP": "+"}, {"IS_ALPHA": True, "OP": "+"}],  
-    ]
-    
-    for pattern in company_patterns:
-        matcher.add("COMPANY_NAME_PATTERN", [pattern])
-    
-    matches = matcher(doc)
-    
-    company_names = []
-    for match_id, start, end in matches:
-        span = doc[start:end]
-        company_names.append(span.text.strip())
-    
-    company_names = [name for name in company_names if not re.search(r'\d{1,5}\s\w+(\s\w+)*', name)]  
-
-    if company_names:
-        company_names.sort(key=len, reverse=True)
-        if len(company_names[0].split()) > 1:  
-            return company_names[0]  
-    
-    company_names = []
-    for ent in doc.ents:
-        if ent.label_ == "ORG" and len(ent.text.split()) > 1 and ent.text not in company_names:
-            company_names.append(ent.text.strip())
-
-    if company_names:
-        company_names.sort(key=len, reverse=True)
-        return company_names[0]
-    
-    company_regex = re.search(r'\b[A-Z][A-Za-z&,\s]+(?:INC|LLC|CORP|CORPORATION|GROUP|ENTERPRISES|HOLDINGS|DBA|CO|LIMITED|PARTNERSHIP|ASSOCIATION)\b', text)
-    
-    if company_regex:
-        return company_regex.group().strip()
-    
-    return None
-
 if __name__ == "__main__":
     # input_pdf_path = "downloads/ocr_test.pdf"
     # pdf_filename = os.path.splitext(os.path.basename(input_pdf_path))[0]
@@ -0,0 +1,71 @@
+"""
+Pick the pages of a lien worth uploading for extraction.
+
+Claimant, owner, amount and property are nearly always on the first pages; exhibits with
+legal descriptions and invoices follow. Pages are scored from the PDF's own text layer and
+only the best few are uploaded, falling back to the whole document when fields go missing.
+"""
+
+import re
+
+MAX_PAGES = 3
+PAGE_KEYWORDS = {
+    "claimant": 3,
+    "owner": 3,
+    "contractor": 2,
+    "property": 2,
+    "amount": 2,
+    "$": 2,
+    "lien": 1,
+    "address": 1,
+}
+# With the amount (checked in missing_required_fields), the fields whose absence sends the
+# whole document again. Owner and address are often missing from complete liens too.
+REQUIRED_FIELDS = ("claimant",)
+
+
+def score_page(text: str) -> int:
+    text = text.lower()
+    score = 0
+    for keyword, weight in PAGE_KEYWORDS.items():
+        count = text.count(keyword) if keyword == "$" else len(re.findall(r"\b" + keyword, text))
+        if count:
+            # Presence matters most; repeats add a little so a dense cover page wins ties.
+            score += weight + min(count, 5) - 1
+    return score
+
+
+def select_pages(page_texts: list, max_pages=MAX_PAGES):
+    """
+    Zero-based page numbers to upload, or None to upload the whole document.
+
+    The first page is always kept. Documents without a text layer (scans) or with no
+    more than max_pages pages are left whole.
+    """
+    if len(page_texts) <= max_pages or not any(text.strip() for text in page_texts):
+        return None
+
+    scores = [score_page(text) for text in page_texts]
+    ranked = sorted(range(1, len(page_texts)), key=lambda page: (-scores[page], page))
+    selected = [0] + [page for page in ranked[:max_pages - 1] if scores[page] > 0]
+    return sorted(selected)
+
+
+def build_subset_pdf(input_path: str, output_path: str, pages: list):
+    from PyPDF4 import PdfFileReader, PdfFileWriter
+
+    with open(input_path, "rb") as f:
+        source = PdfFileReader(f, strict=False)
+        output = PdfFileWriter()
+        for page_number in pages:
+            output.addPage(source.getPage(page_number))
+
+        with open(output_path, "wb") as outputStream:
+            output.write(outputStream)
+
+
+def missing_required_fields(info: dict) -> list:
+    missing = [field for field in REQUIRED_FIELDS if not info.get(field)]
+    if info.get("dollar") in (None, "$0", "0"):
+        missing.append("dollar")
+    return missing
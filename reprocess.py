@@ -0,0 +1,147 @@
+"""
+Re-run field extraction over stored extraction results, without the browser or Adobe.
+
+Walks structuredData.json files (or result zips) saved by bot.py in extraction_cache/,
+extracts every field again with the current heuristics in parallel, writes a fresh table
+and a per-field diff against the previous values (the result store, or result.xlsx when
+there is none, matched on the File column).
+
+    python reprocess.py                         # extraction_cache/ against results.db
+    python reprocess.py path/to/jsons --processes 8 --previous old.csv
+"""
+
+import argparse
+import glob
+import os
+import sys
+import time
+
+import pandas as pd
+
+from lien_extraction import extract_batch, normalize_results
+from result_store import HEADERS, RESULT_DB, ResultStore
+
+CACHE_DIR = os.getenv("EXTRACTION_CACHE_DIR", "extraction_cache")
+PREVIOUS_FILE = RESULT_DB if os.path.isfile(RESULT_DB) else "result.xlsx"
+OUTPUT_FILE = "reprocessed.xlsx"
+DIFF_FILE = "reprocess_diff.csv"
+
+# Field name -> result.xlsx header.
+FIELD_HEADERS = {
+    "claimant": "Claimant",
+    "contractor": "Contractor",
+    "owner": "Owner",
+    "address": "Property Address",
+    "city": "Property City",
+    "state": "Property State",
+    "zipcode": "Property Zip",
+    "dollar": "Dollar Amount",
+    "phone": "Phone Number",
+}
+
+
+def find_documents(sources) -> list:
+    paths = []
+    for source in sources:
+        if os.path.isdir(source):
+            paths.extend(glob.glob(os.path.join(source, "**", "*.json"), recursive=True))
+            paths.extend(glob.glob(os.path.join(source, "**", "*.zip"), recursive=True))
+        else:
+            paths.extend(glob.glob(source))
+    return sorted(set(paths))
+
+
+def read_table(path: str) -> pd.DataFrame:
+    if path.endswith(".db"):
+        store = ResultStore(path)
+        try:
+            return pd.DataFrame(store.rows(), columns=HEADERS)
+        finally:
+            store.close()
+    if path.endswith(".csv"):
+        return pd.read_csv(path, dtype=str, keep_default_na=False)
+    return pd.read_excel(path, dtype=str, keep_default_na=False)
+
+
+def write_table(frame: pd.DataFrame, path: str):
+    if path.endswith(".csv"):
+        frame.to_csv(path, index=False)
+    else:
+        frame.to_excel(path, index=False)
+
+
+def fresh_table(fields: pd.DataFrame) -> pd.DataFrame:
+    table = fields.rename(columns=FIELD_HEADERS)
+    table.insert(0, "File", [os.path.splitext(os.path.basename(path))[0] + ".pdf" for path in fields["path"]])
+    return table.rename(columns={"path": "Source", "error": "Error"})
+
+
+def normalize_values(values: pd.Series) -> pd.Series:
+    # Missing values are None in a fresh table but "N/A" or "None" once written to result.xlsx.
+    return values.fillna("").astype(str).str.strip().replace({"None": "", "N/A": ""})
+
+
+def diff_tables(previous: pd.DataFrame, current: pd.DataFrame) -> pd.DataFrame:
+    """
+    One row per (File, Field) whose value differs between the two tables.
+    """
+    headers = [header for header in FIELD_HEADERS.values() if header in previous.columns]
+    merged = current[["File"] + headers].merge(previous[["File"] + headers].drop_duplicates("File", keep="last"),
+                                               on="File", how="inner", suffixes=("", " (previous)"))
+    changes = []
+    for header in headers:
+        new = normalize_values(merged[header])
+        old = normalize_values(merged[f"{header} (previous)"])
+        changed = new != old
+        changes.append(pd.DataFrame({
+            "File": merged.loc[changed, "File"],
+            "Field": header,
+            "Previous": old[changed],
+            "Reprocessed": new[changed],
+        }))
+    return pd.concat(changes, ignore_index=True) if changes else pd.DataFrame(
+        columns=["File", "Field", "Previous", "Reprocessed"])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Re-extract fields from stored structuredData.json files.")
+    parser.add_argument("sources", nargs="*", default=[CACHE_DIR],
+                        help="directories, files or globs of structuredData.json / result zips")
+    parser.add_argument("--processes", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--previous", default=PREVIOUS_FILE, help="results to diff against (.db result store, .xlsx or .csv)")
+    parser.add_argument("--output", default=OUTPUT_FILE, help="fresh result table (.xlsx or .csv)")
+    parser.add_argument("--diff", default=DIFF_FILE, help="per-field changes (.csv or .xlsx)")
+    args = parser.parse_args(argv)
+
+    paths = find_documents(args.sources)
+    if not paths:
+        print(f"No extraction results found in {args.sources}")
+        return 1
+
+    started = time.perf_counter()
+    fields = extract_batch(paths, processes=args.processes)
+    elapsed = time.perf_counter() - started
+    print(f"Reprocessed {len(paths)} documents in {elapsed:.1f}s with {args.processes} processes.")
+
+    table = normalize_results(fresh_table(fields))
+    write_table(table, args.output)
+    print(f"Fresh results written to {args.output}")
+
+    errors = table[table["Error"].notna()]
+    for _, row in errors.iterrows():
+        print(f"❌ {row['Source']}: {row['Error']}")
+
+    if not os.path.isfile(args.previous):
+        print(f"No previous results at {args.previous}, skipping the diff.")
+        return 0
+
+    changes = diff_tables(read_table(args.previous), table)
+    write_table(changes, args.diff)
+    print(f"{len(changes)} changed values in {changes['File'].nunique()} documents written to {args.diff}")
+    for header, count in changes["Field"].value_counts().items():
+        print(f"  {header}: {count}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,271 @@
+"""
+SQLite store for scraped lien rows, keyed on instrument number.
+
+Rows are upserted in batches inside one transaction; date recorded and document type are
+indexed for range/report queries. Every row has a status: "complete" once its document was
+extracted and parsed, "incomplete" while it is only listed (no PDF, an error, retries
+given up), so later runs skip only complete rows. result.xlsx and CSV files are exports of the store
+rather than the store itself. Rows are written as extracted and normalized in one
+vectorized pass (lien_extraction.postprocess) at the end of a run:
+
+    python result_store.py normalize --from 2025-01-01 --to 2025-03-31
+    python result_store.py export result.xlsx --from 2025-01-01 --to 2025-03-31
+    python result_store.py import old_result.xlsx
+
+Like work_queue.py, the database runs in WAL mode on one host; set
+SQLITE_JOURNAL_MODE=DELETE when workers on several hosts share it on a volume.
+"""
+
+import argparse
+import csv
+import os
+import sqlite3
+import sys
+import time
+from datetime import datetime
+
+RESULT_DB = os.getenv("RESULT_DB", "results.db")
+SQLITE_JOURNAL_MODE = os.getenv("SQLITE_JOURNAL_MODE", "WAL").upper()
+
+# Result headers (the order bot.py writes rows in) -> column names.
+COLUMNS = {
+    "File": "file",
+    "Instrument Number": "instrument_number",
+    "Type": "doc_type",
+    "Date Recorded": "date_recorded",
+    "Book": "book",
+    "Page": "page",
+    "Claimant": "claimant",
+    "Contractor": "contractor",
+    "Owner": "owner",
+    "Property Address": "address",
+    "Property City": "city",
+    "Property State": "state",
+    "Property Zip": "zipcode",
+    "Dollar Amount": "dollar",
+    "Phone Number": "phone",
+    "Duplicate Of": "duplicate_of",
+}
+HEADERS = list(COLUMNS)
+COMPLETE = "complete"
+INCOMPLETE = "incomplete"
+# known() queries in chunks to stay under SQLite's bound-variable limit.
+QUERY_CHUNK = 500
+
+
+def normalize_date(value):
+    """
+    okcc shows MM/DD/YYYY; store ISO dates so the index serves range queries.
+    """
+    if not value:
+        return value
+    for fmt in ("%m/%d/%Y", "%m/%d/%Y %I:%M:%S %p", "%Y-%m-%d"):
+        try:
+            return datetime.strptime(value.strip(), fmt).date().isoformat()
+        except ValueError:
+            continue
+    return value
+
+
+class ResultStore:
+    def __init__(self, path=RESULT_DB):
+        self.path = path
+        self.connection = sqlite3.connect(path)
+        self.connection.execute(f"PRAGMA journal_mode={SQLITE_JOURNAL_MODE}")
+        self.connection.execute("PRAGMA synchronous=NORMAL" if SQLITE_JOURNAL_MODE == "WAL" else "PRAGMA synchronous=FULL")
+        columns = ", ".join(f"{column} TEXT" for column in COLUMNS.values() if column != "instrument_number")
+        with self.connection:
+            self.connection.execute(
+                f"CREATE TABLE IF NOT EXISTS results (instrument_number TEXT PRIMARY KEY, {columns}, updated_at REAL, "
+                f"status TEXT NOT NULL DEFAULT '{INCOMPLETE}')")
+            if "status" not in {row[1] for row in self.connection.execute("PRAGMA table_info(results)")}:
+                # Stores from before statuses: a row with an amount went through extraction.
+                self.connection.execute(
+                    f"ALTER TABLE results ADD COLUMN status TEXT NOT NULL DEFAULT '{INCOMPLETE}'")
+                self.connection.execute(f"UPDATE results SET status = '{COMPLETE}' WHERE dollar IS NOT NULL")
+            self.connection.execute("CREATE INDEX IF NOT EXISTS results_date_recorded ON results (date_recorded)")
+            self.connection.execute("CREATE INDEX IF NOT EXISTS results_doc_type ON results (doc_type)")
+
+    def has(self, instrument_number) -> bool:
+        row = self.connection.execute(
+            "SELECT 1 FROM results WHERE instrument_number = ?", (instrument_number,)).fetchone()
+        return row is not None
+
+    def is_complete(self, instrument_number) -> bool:
+        row = self.connection.execute(
+            "SELECT status FROM results WHERE instrument_number = ?", (instrument_number,)).fetchone()
+        return row is not None and row[0] == COMPLETE
+
+    def known(self, instrument_numbers) -> set:
+        instrument_numbers = list(instrument_numbers)
+        found = set()
+        for i in range(0, len(instrument_numbers), QUERY_CHUNK):
+            chunk = instrument_numbers[i:i + QUERY_CHUNK]
+            placeholders = ", ".join("?" * len(chunk))
+            found.update(row[0] for row in self.connection.execute(
+                f"SELECT instrument_number FROM results WHERE instrument_number IN ({placeholders})", chunk))
+        return found
+
+    def upsert_rows(self, rows, headers=HEADERS, complete=False) -> int:
+        """
+        Insert or update rows (sequences in headers order, or dicts by header) in one transaction.
+
+        complete=True is for rows whose document was extracted and parsed: they replace the
+        stored row outright, so a re-extraction can clear a wrong value. Other rows only
+        fill in: a None keeps the stored value, so re-listing a row without its document
+        data does not wipe fields parsed earlier, and a complete row stays complete.
+        """
+        return self.write(self.records(rows, headers), replace=complete, status=COMPLETE if complete else None)
+
+    def records(self, rows, headers=HEADERS) -> list:
+        records = []
+        for row in rows:
+            values = row if isinstance(row, dict) else dict(zip(headers, row))
+            record = {column: values.get(header) for header, column in COLUMNS.items()}
+            if not record["instrument_number"] or record["instrument_number"] == "N/A":
+                print(f"Skipping row without an instrument number: {row}")
+                continue
+            record["date_recorded"] = normalize_date(record["date_recorded"])
+            record["updated_at"] = time.time()
+            records.append(record)
+        return records
+
+    def write(self, records, replace=False, status=None) -> int:
+        if not records:
+            return 0
+
+        columns = list(records[0])
+        updates = [f"{column} = excluded.{column}" if replace else f"{column} = COALESCE(excluded.{column}, {column})"
+                   for column in columns if column != "instrument_number"]
+        if status:
+            columns.append("status")
+            updates.append("status = excluded.status")
+            records = [dict(record, status=status) for record in records]
+        with self.connection:
+            self.connection.executemany(
+                f"INSERT INTO results ({', '.join(columns)}) VALUES ({', '.join(':' + c for c in columns)}) "
+                f"ON CONFLICT (instrument_number) DO UPDATE SET {', '.join(updates)}",
+                records,
+            )
+        return len(records)
+
+    def rows(self, date_from=None, date_to=None, doc_type=None) -> list:
+        conditions, parameters = [], []
+        if date_from:
+            conditions.append("date_recorded >= ?")
+            parameters.append(str(date_from))
+        if date_to:
+            conditions.append("date_recorded <= ?")
+            parameters.append(str(date_to))
+        if doc_type:
+            conditions.append("doc_type = ?")
+            parameters.append(doc_type)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        return self.connection.execute(
+            f"SELECT {', '.join(COLUMNS.values())} FROM results {where} ORDER BY date_recorded, instrument_number",
+            parameters,
+        ).fetchall()
+
+    def frame(self, **filters):
+        """
+        The (filtered) rows as a DataFrame with the result headers as columns.
+        """
+        import pandas as pd
+
+        return pd.DataFrame(self.rows(**filters), columns=HEADERS)
+
+    def upsert_frame(self, frame) -> int:
+        """
+        Write back a (normalized) frame: its values replace the stored ones, statuses are kept.
+        """
+        frame = frame.astype(object).where(frame.notna(), None)
+        return self.write(self.records(frame.to_dict("records")), replace=True)
+
+    def normalize(self, **filters) -> int:
+        """
+        Run the end-of-run normalization over the (filtered) rows and write them back.
+        """
+        from lien_extraction.postprocess import normalize_results
+
+        started = time.perf_counter()
+        count = self.upsert_frame(normalize_results(self.frame(**filters)))
+        print(f"Normalized {count} rows in {time.perf_counter() - started:.2f}s")
+        return count
+
+    def export(self, path, **filters) -> int:
+        """
+        Write the (filtered) rows to an .xlsx or .csv file with the result headers.
+        """
+        rows = self.rows(**filters)
+        if path.endswith(".csv"):
+            with open(path, "w", newline="", encoding="utf-8") as file:
+                writer = csv.writer(file)
+                writer.writerow(HEADERS)
+                writer.writerows(rows)
+        else:
+            from openpyxl import Workbook
+
+            wb = Workbook(write_only=True)
+            ws = wb.create_sheet()
+            ws.append(HEADERS)
+            for row in rows:
+                ws.append(row)
+            wb.save(path)
+        print(f"Exported {len(rows)} rows to {path}")
+        return len(rows)
+
+    def import_file(self, path) -> int:
+        """
+        Upsert the rows of an existing result .xlsx or .csv.
+        """
+        if path.endswith(".csv"):
+            with open(path, "r", newline="", encoding="utf-8") as file:
+                rows = list(csv.DictReader(file))
+        else:
+            from openpyxl import load_workbook
+
+            ws = load_workbook(path, read_only=True).active
+            values = list(ws.iter_rows(values_only=True))
+            headers = [str(header) for header in values[0]] if values else []
+            rows = [dict(zip(headers, ["" if v is None else str(v) for v in row])) for row in values[1:]]
+        # As when a store gains statuses: a row with an amount went through extraction.
+        extracted = [row for row in rows if row.get("Dollar Amount")]
+        listed = [row for row in rows if not row.get("Dollar Amount")]
+        return self.upsert_rows(extracted, complete=True) + self.upsert_rows(listed)
+
+    def close(self):
+        self.connection.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Export or import the lien result store.")
+    parser.add_argument("--db", default=RESULT_DB)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    export = commands.add_parser("export", help="write rows to an .xlsx or .csv file")
+    export.add_argument("path")
+    normalize = commands.add_parser("normalize", help="normalize amounts, phones, ZIPs and names in place")
+    for command in (export, normalize):
+        command.add_argument("--from", dest="date_from", help="first date recorded, YYYY-MM-DD")
+        command.add_argument("--to", dest="date_to", help="last date recorded, YYYY-MM-DD")
+        command.add_argument("--type", dest="doc_type")
+
+    load = commands.add_parser("import", help="upsert the rows of an existing .xlsx or .csv result file")
+    load.add_argument("path")
+
+    args = parser.parse_args(argv)
+    store = ResultStore(args.db)
+    try:
+        if args.command == "export":
+            store.export(args.path, date_from=args.date_from, date_to=args.date_to, doc_type=args.doc_type)
+        elif args.command == "normalize":
+            store.normalize(date_from=args.date_from, date_to=args.date_to, doc_type=args.doc_type)
+        else:
+            print(f"Imported {store.import_file(args.path)} rows from {args.path}")
+    finally:
+        store.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
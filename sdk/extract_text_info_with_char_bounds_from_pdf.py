@@ -8,6 +8,7 @@
 
 import logging
 import os
+import uuid
 from datetime import datetime
 
 from adobe.pdfservices.operation.auth.service_principal_credentials import ServicePrincipalCredentials
@@ -32,6 +33,8 @@ logging.basicConfig(level=logging.INFO)
 #
 class ExtractTextInfoWithCharBoundsFromPDF:
     def __init__(self, input_pdf_path=None):
+        self.output_file_path = None
+        self.error = None
         try:
             with open(input_pdf_path, 'rb') as file:
                 input_stream = file.read()
@@ -70,17 +73,20 @@ class ExtractTextInfoWithCharBoundsFromPDF:
             output_file_path = self.create_output_file_path()
             with open(output_file_path, "wb") as file:
                 file.write(stream_asset.get_input_stream())
+            self.output_file_path = output_file_path
 
         except (ServiceApiException, ServiceUsageException, SdkException) as e:
+            self.error = e
             logging.exception(f'Exception encountered while executing operation: {e}')
 
-    # Generates a string containing a directory structure and file name for the output file
+    # Generates a string containing a directory structure and file name for the output file.
+    # Several jobs run at once and can finish within the same second, hence the uuid.
     @staticmethod
     def create_output_file_path() -> str:
         now = datetime.now()
         time_stamp = now.strftime("%Y-%m-%dT%H-%M-%S")
         os.makedirs("output/ExtractTextInfoWithCharBoundsFromPDF", exist_ok=True)
-        return f"output/ExtractTextInfoWithCharBoundsFromPDF/extract{time_stamp}.zip"
+        return f"output/ExtractTextInfoWithCharBoundsFromPDF/extract{time_stamp}-{uuid.uuid4().hex[:12]}.zip"
 
 
 if __name__ == "__main__":
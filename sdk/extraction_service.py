@@ -0,0 +1,186 @@
+"""
+Extraction services turn a PDF into the result zip holding structuredData.json.
+
+AdobeExtractionService wraps the PDF Services sample, FakeExtractionService serves
+fixture structuredData.json files locally with tunable latency, queueing and failure
+injection so the rest of the pipeline can be benchmarked without credentials, and
+LocalOCRService (sdk/local_ocr_service.py) runs Tesseract over scanned liens offline.
+"""
+
+import glob
+import itertools
+import json
+import logging
+import os
+import random
+import threading
+import time
+import zipfile
+import zlib
+from datetime import datetime
+
+OUTPUT_FOLDER = "output/ExtractTextInfoWithCharBoundsFromPDF"
+FIXTURES_DIR = os.path.join("fixtures", "structured")
+
+
+class ExtractionError(Exception):
+    """Raised when an extraction job fails; retryable marks transient failures."""
+
+    def __init__(self, message, status_code=None, retryable=False):
+        super().__init__(message)
+        self.status_code = status_code
+        self.retryable = retryable
+
+
+class ExtractionQuotaError(ExtractionError):
+    """Raised when the service reports the usage quota is exhausted."""
+
+    def __init__(self, message, status_code=429):
+        super().__init__(message, status_code=status_code, retryable=True)
+
+
+class ExtractionService:
+    def extract(self, input_pdf_path: str) -> str:
+        """
+        Extract text with char bounds from input_pdf_path and return the result zip path.
+        """
+        raise NotImplementedError
+
+
+class AdobeExtractionService(ExtractionService):
+    def extract(self, input_pdf_path: str) -> str:
+        from adobe.pdfservices.operation.exception.exceptions import ServiceApiException, ServiceUsageException
+        from sdk.extract_text_info_with_char_bounds_from_pdf import ExtractTextInfoWithCharBoundsFromPDF
+
+        job = ExtractTextInfoWithCharBoundsFromPDF(input_pdf_path)
+
+        if isinstance(job.error, ServiceUsageException):
+            raise ExtractionQuotaError(str(job.error))
+        if isinstance(job.error, ServiceApiException):
+            status_code = job.error.get_status_code() if hasattr(job.error, "get_status_code") else None
+            retryable = status_code in (429, 500, 502, 503, 504)
+            raise ExtractionError(str(job.error), status_code=status_code, retryable=retryable)
+        if job.error is not None:
+            raise ExtractionError(str(job.error), retryable=True)
+        if not job.output_file_path:
+            raise ExtractionError(f"No result produced for {input_pdf_path}")
+
+        return job.output_file_path
+
+
+class FakeExtractionService(ExtractionService):
+    """
+    Local stand-in for Adobe PDF Services.
+
+    A document named <docid>.pdf gets fixtures_dir/<docid>.json when it exists, otherwise
+    a fixture picked deterministically from the corpus. At most max_running_jobs run at
+    once, the rest queue like Adobe jobs waiting in "in progress".
+    """
+
+    def __init__(self, fixtures_dir=FIXTURES_DIR, latency=2.0, jitter=0.5, upload_bytes_per_second=2_000_000,
+                 max_running_jobs=4, failure_rate=0.0, quota_failure_rate=0.0, seed=None,
+                 output_folder=OUTPUT_FOLDER):
+        self.fixtures = sorted(glob.glob(os.path.join(fixtures_dir, "*.json")))
+        if not self.fixtures:
+            raise ValueError(f"No structuredData.json fixtures found in {fixtures_dir}")
+        self.fixtures_dir = fixtures_dir
+        self.latency = latency
+        self.jitter = jitter
+        self.upload_bytes_per_second = upload_bytes_per_second
+        self.failure_rate = failure_rate
+        self.quota_failure_rate = quota_failure_rate
+        self.output_folder = output_folder
+        self.random = random.Random(seed)
+        self.slots = threading.BoundedSemaphore(max_running_jobs)
+        self.lock = threading.Lock()
+        self.counter = itertools.count()
+        self.stats = {"submitted": 0, "completed": 0, "failed": 0, "queued": 0, "queue_seconds": 0.0}
+
+    def pick_fixture(self, input_pdf_path):
+        name = os.path.splitext(os.path.basename(input_pdf_path))[0]
+        exact = os.path.join(self.fixtures_dir, f"{name}.json")
+        if os.path.isfile(exact):
+            return exact
+        return self.fixtures[zlib.crc32(name.encode()) % len(self.fixtures)]
+
+    def extract(self, input_pdf_path: str) -> str:
+        fixture = self.pick_fixture(input_pdf_path)
+        upload_seconds = os.path.getsize(input_pdf_path) / self.upload_bytes_per_second
+
+        with self.lock:
+            self.stats["submitted"] += 1
+            self.stats["queued"] += 1
+            job_seconds = max(0.0, self.latency + self.random.uniform(-self.jitter, self.jitter))
+            roll = self.random.random()
+
+        time.sleep(upload_seconds)
+
+        queued_at = time.perf_counter()
+        with self.slots:
+            with self.lock:
+                self.stats["queued"] -= 1
+                self.stats["queue_seconds"] += time.perf_counter() - queued_at
+            time.sleep(job_seconds)
+
+        if roll < self.quota_failure_rate:
+            with self.lock:
+                self.stats["failed"] += 1
+            raise ExtractionQuotaError("Fake quota exhausted")
+        if roll < self.quota_failure_rate + self.failure_rate:
+            with self.lock:
+                self.stats["failed"] += 1
+            raise ExtractionError("Fake extraction job failed", status_code=503, retryable=True)
+
+        with open(fixture, "r", encoding="utf-8") as file:
+            structured_data = json.load(file)
+
+        os.makedirs(self.output_folder, exist_ok=True)
+        time_stamp = datetime.now().strftime("%Y-%m-%dT%H-%M-%S")
+        zip_file_path = os.path.join(self.output_folder, f"extract{time_stamp}-{next(self.counter)}.zip")
+        with zipfile.ZipFile(zip_file_path, "w", zipfile.ZIP_DEFLATED) as zip_file:
+            zip_file.writestr("structuredData.json", json.dumps(structured_data, indent=4))
+
+        with self.lock:
+            self.stats["completed"] += 1
+        return zip_file_path
+
+
+def get_local_ocr_service() -> ExtractionService:
+    from sdk.local_ocr_service import OCR_CACHE_DIR, OCR_DPI, OCR_LANG, LocalOCRService
+
+    return LocalOCRService(
+        workers=int(os.getenv("OCR_WORKERS", "0")) or None,
+        dpi=int(os.getenv("OCR_DPI", str(OCR_DPI))),
+        lang=os.getenv("OCR_LANG", OCR_LANG),
+        cache_dir=os.getenv("OCR_CACHE_DIR", OCR_CACHE_DIR),
+    )
+
+
+def get_scanned_extraction_service():
+    """
+    The service for image-only PDFs when OCR_SCANNED=1, otherwise None (use the main one).
+    """
+    if os.getenv("OCR_SCANNED", "0") == "1":
+        return get_local_ocr_service()
+    return None
+
+
+def get_extraction_service() -> ExtractionService:
+    """
+    Pick the extraction service from EXTRACTION_SERVICE ("adobe", "fake" or "ocr").
+    """
+    kind = os.getenv("EXTRACTION_SERVICE", "adobe").lower()
+    if kind == "ocr":
+        return get_local_ocr_service()
+    if kind == "fake":
+        return FakeExtractionService(
+            fixtures_dir=os.getenv("FAKE_EXTRACTION_FIXTURES", FIXTURES_DIR),
+            latency=float(os.getenv("FAKE_EXTRACTION_LATENCY", "2.0")),
+            jitter=float(os.getenv("FAKE_EXTRACTION_JITTER", "0.5")),
+            max_running_jobs=int(os.getenv("FAKE_EXTRACTION_SLOTS", "4")),
+            failure_rate=float(os.getenv("FAKE_EXTRACTION_FAILURE_RATE", "0")),
+            quota_failure_rate=float(os.getenv("FAKE_EXTRACTION_QUOTA_RATE", "0")),
+        )
+    if kind != "adobe":
+        logging.warning(f"Unknown EXTRACTION_SERVICE {kind!r}, using Adobe")
+    return AdobeExtractionService()
@@ -0,0 +1,179 @@
+"""
+Offline extraction for scanned liens with Tesseract.
+
+Pages are rasterized and OCR'd in a shared process pool, one task per page, and each
+page's result is cached under OCR_CACHE_DIR by a hash of its rendered pixels, so a scan
+seen before is never OCR'd again. The output is the same structuredData.json zip the
+Adobe service produces: one element per OCR line with Bounds and CharBounds in PDF
+points (origin bottom-left) and a zero-based Page.
+"""
+
+import hashlib
+import itertools
+import json
+import os
+import threading
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+from sdk.extraction_service import OUTPUT_FOLDER, ExtractionError, ExtractionService
+
+OCR_CACHE_DIR = "ocr_cache"
+OCR_DPI = 300
+OCR_LANG = "eng"
+# Words Tesseract is less sure of than this are dropped; scanner noise scores near 0.
+MIN_WORD_CONFIDENCE = 30
+POINTS_PER_INCH = 72.0
+
+
+def count_pages(input_pdf_path: str) -> int:
+    from pdf2image import pdfinfo_from_path
+
+    return int(pdfinfo_from_path(input_pdf_path)["Pages"])
+
+
+def page_elements(words: dict, page_number: int, page_height: float, scale: float) -> list:
+    """
+    Group Tesseract's word boxes (image_to_data dict, pixels, origin top-left) into line elements.
+    """
+    lines = {}
+    for i, word in enumerate(words["text"]):
+        word = word.strip()
+        if not word or float(words["conf"][i]) < MIN_WORD_CONFIDENCE:
+            continue
+        key = (words["block_num"][i], words["par_num"][i], words["line_num"][i])
+        left, top = words["left"][i] * scale, words["top"][i] * scale
+        right, bottom = left + words["width"][i] * scale, top + words["height"][i] * scale
+        lines.setdefault(key, []).append((word, left, page_height - bottom, right, page_height - top))
+
+    elements = []
+    for key in sorted(lines):
+        text = ""
+        char_bounds = []
+        line = lines[key]
+        for position, (word, x0, y0, x1, y1) in enumerate(line):
+            # Tesseract only boxes words, so spread each word's width evenly over its characters.
+            width = (x1 - x0) / len(word)
+            char_bounds.extend([x0 + width * c, y0, x0 + width * (c + 1), y1] for c in range(len(word)))
+            gap_end = line[position + 1][1] if position + 1 < len(line) else x1 + width
+            char_bounds.append([x1, y0, max(x1, gap_end), y1])
+            text += word + " "
+
+        elements.append({
+            "Bounds": [min(w[1] for w in line), min(w[2] for w in line),
+                       max(w[3] for w in line), max(w[4] for w in line)],
+            "CharBounds": char_bounds,
+            "Page": page_number,
+            "Path": f"//Document/P[{len(elements) + 1}]",
+            "Text": text,
+            "TextSize": round(max(w[4] - w[2] for w in line), 1),
+        })
+    return elements
+
+
+def ocr_page(input_pdf_path: str, page_number: int, dpi: int, lang: str, cache_dir: str) -> dict:
+    """
+    Rasterize and OCR one zero-based page; runs inside a pool worker process.
+    """
+    import pytesseract
+    from pdf2image import convert_from_path
+
+    image = convert_from_path(input_pdf_path, dpi=dpi, first_page=page_number + 1, last_page=page_number + 1)[0]
+    image = image.convert("L")
+    scale = POINTS_PER_INCH / dpi
+    width, height = image.width * scale, image.height * scale
+
+    page_hash = hashlib.sha256(f"{dpi}:{lang}:{image.width}x{image.height}:".encode() + image.tobytes()).hexdigest()
+    cache_path = os.path.join(cache_dir, f"{page_hash}.json")
+    if os.path.isfile(cache_path):
+        with open(cache_path, "r", encoding="utf-8") as file:
+            cached = json.load(file)
+        for element in cached["elements"]:
+            element["Page"] = page_number
+        cached["cached"] = True
+        return cached
+
+    words = pytesseract.image_to_data(image, lang=lang, output_type=pytesseract.Output.DICT)
+    result = {
+        "width": width,
+        "height": height,
+        "elements": page_elements(words, page_number, height, scale),
+        "cached": False,
+    }
+
+    os.makedirs(cache_dir, exist_ok=True)
+    temp_path = f"{cache_path}.{os.getpid()}.tmp"
+    with open(temp_path, "w", encoding="utf-8") as file:
+        json.dump(result, file)
+    os.replace(temp_path, cache_path)
+    return result
+
+
+class LocalOCRService(ExtractionService):
+    """
+    Tesseract-backed stand-in for Adobe on image-only PDFs.
+
+    The process pool is shared by every extract() call, so concurrent documents queue
+    their pages on the same workers instead of oversubscribing the cores.
+    """
+
+    def __init__(self, workers=None, dpi=OCR_DPI, lang=OCR_LANG, cache_dir=OCR_CACHE_DIR,
+                 output_folder=OUTPUT_FOLDER):
+        self.workers = workers or os.cpu_count() or 1
+        self.dpi = dpi
+        self.lang = lang
+        self.cache_dir = cache_dir
+        self.output_folder = output_folder
+        self.pool = None
+        self.lock = threading.Lock()
+        self.counter = itertools.count()
+        self.stats = {"documents": 0, "pages": 0, "cached_pages": 0}
+
+    def executor(self) -> ProcessPoolExecutor:
+        with self.lock:
+            if self.pool is None:
+                self.pool = ProcessPoolExecutor(max_workers=self.workers)
+            return self.pool
+
+    def extract(self, input_pdf_path: str) -> str:
+        try:
+            page_count = count_pages(input_pdf_path)
+            futures = [self.executor().submit(ocr_page, input_pdf_path, page_number, self.dpi, self.lang,
+                                              self.cache_dir)
+                       for page_number in range(page_count)]
+            pages = [future.result() for future in futures]
+        except Exception as e:
+            raise ExtractionError(f"Local OCR failed for {input_pdf_path}: {e}") from e
+
+        structured_data = {
+            "extended_metadata": {"page_count": page_count, "language": self.lang},
+            "elements": [element for page in pages for element in page["elements"]],
+            "pages": [{
+                "boxes": {"CropBox": [0, 0, page["width"], page["height"]],
+                          "MediaBox": [0, 0, page["width"], page["height"]]},
+                "height": page["height"],
+                "is_scanned": True,
+                "page_number": page_number,
+                "rotation": 0,
+                "width": page["width"],
+            } for page_number, page in enumerate(pages)],
+        }
+
+        os.makedirs(self.output_folder, exist_ok=True)
+        time_stamp = datetime.now().strftime("%Y-%m-%dT%H-%M-%S")
+        zip_file_path = os.path.join(self.output_folder, f"ocr{time_stamp}-{next(self.counter)}.zip")
+        with zipfile.ZipFile(zip_file_path, "w", zipfile.ZIP_DEFLATED) as zip_file:
+            zip_file.writestr("structuredData.json", json.dumps(structured_data, indent=4))
+
+        with self.lock:
+            self.stats["documents"] += 1
+            self.stats["pages"] += page_count
+            self.stats["cached_pages"] += sum(1 for page in pages if page["cached"])
+        return zip_file_path
+
+    def close(self):
+        with self.lock:
+            if self.pool is not None:
+                self.pool.shutdown()
+                self.pool = None
@@ -0,0 +1,112 @@
+"""
+Browser session that keeps long runs at a flat memory profile.
+
+Driving the okcc viewer on one page for thousands of documents piles up viewer DOM and
+cached PDF blobs until Chromium eats the host. BrowserSession hands out the page to
+scrape with and, between results pages or queue jobs, throws the page or its whole
+context away once it has served RECYCLE_DOCUMENTS documents or the Python + Playwright +
+Chromium process tree grows past RECYCLE_RSS_MB (needs psutil). The fresh page is brought
+back to where the old one was by the caller's restore coroutine (search, results page).
+"""
+
+import os
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+RECYCLE_DOCUMENTS = int(os.getenv("RECYCLE_DOCUMENTS", "300"))
+RECYCLE_RSS_MB = float(os.getenv("RECYCLE_RSS_MB", "2048"))
+# "context" drops cookies and the HTTP cache too; "page" only the page and its DOM.
+RECYCLE_SCOPE = os.getenv("RECYCLE_SCOPE", "context")
+
+
+def process_tree_rss_mb():
+    """
+    Resident memory of this process and its children (Playwright driver, Chromium), or None without psutil.
+    """
+    if psutil is None:
+        return None
+    process = psutil.Process()
+    total = 0
+    for member in [process] + process.children(recursive=True):
+        try:
+            total += member.memory_info().rss
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            continue
+    return total / (1024 * 1024)
+
+
+class BrowserSession:
+    def __init__(self, browser, restore=None, max_documents=RECYCLE_DOCUMENTS, max_rss_mb=RECYCLE_RSS_MB,
+                 scope=RECYCLE_SCOPE):
+        self.browser = browser
+        # async restore(page) navigates a fresh page back to the current search state.
+        self.restore = restore
+        self.max_documents = max_documents
+        self.max_rss_mb = max_rss_mb
+        self.scope = scope
+        self.context = None
+        self.page = None
+        self.documents = 0
+        self.recycles = 0
+        self.peak_rss_mb = 0.0
+        if max_rss_mb and psutil is None:
+            print("⚠️ psutil is not installed, recycling the browser by document count only.")
+
+    async def open(self):
+        if self.context is None:
+            self.context = await self.browser.new_context()
+        self.page = await self.context.new_page()
+        return self.page
+
+    def count_documents(self, count=1):
+        self.documents += count
+
+    def recycle_reason(self):
+        if self.max_documents and self.documents >= self.max_documents:
+            return f"{self.documents} documents"
+        rss = process_tree_rss_mb()
+        if rss is not None:
+            self.peak_rss_mb = max(self.peak_rss_mb, rss)
+            if self.max_rss_mb and rss >= self.max_rss_mb:
+                return f"{rss:.0f} MB resident"
+        return None
+
+    async def recycle(self, reason="requested", restore=None):
+        """
+        Replace the page (or context) and restore it; returns the new page.
+
+        `restore` overrides the session's restore coroutine for this recycle.
+        """
+        print(f"♻️ Recycling the browser {self.scope} after {reason}.")
+        await self.page.close()
+        if self.scope == "context":
+            await self.context.close()
+            self.context = None
+        page = await self.open()
+        self.documents = 0
+        self.recycles += 1
+        restore = restore or self.restore
+        if restore:
+            await restore(page)
+        return page
+
+    async def maybe_recycle(self, restore=None):
+        """
+        The page to keep scraping with: the current one, or a restored fresh one when over a limit.
+        """
+        reason = self.recycle_reason()
+        if reason:
+            return await self.recycle(reason, restore)
+        return self.page
+
+    @property
+    def stats(self) -> dict:
+        return {"recycles": self.recycles, "peak_rss_mb": round(self.peak_rss_mb)}
+
+    async def close(self):
+        if self.context is not None:
+            await self.context.close()
+            self.context = None
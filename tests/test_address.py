@@ -0,0 +1,35 @@
+import json
+
+from extract_address import extract_address
+from lien_extraction.address import AddressLocator
+from lien_extraction.fields import get_property_address
+
+BASELINE = json.load(open("fixtures/benchmark_baseline.json", encoding="utf-8"))
+
+
+def merged_text(name):
+    with open(f"fixtures/merged_text/{name}.txt", encoding="utf-8") as file:
+        return file.read()
+
+
+def anchors(text):
+    return [text[position:].split()[0] for position, _, _ in AddressLocator(text).candidates]
+
+
+def test_recording_stamp_is_not_a_zip_anchor():
+    assert "16042" not in anchors("2025032501040838 B: 16042 P: 803 03/25/2025 Pgs: 3")
+    assert "73122" in anchors("4418 58th St Oklahoma City, OK 73122")
+
+
+def test_property_addresses_match_the_baseline():
+    expected = BASELINE["get_property_address"]["outputs"]
+    for name in ("paydar_properties", "clark_construction", "ridgeline_roofing"):
+        assert list(get_property_address(merged_text(name))) == expected[f"{name}.txt"]
+    assert get_property_address(merged_text("paydar_properties")) == (None, None, None, None)
+    assert get_property_address(merged_text("ridgeline_roofing")) == ("4418 58th St", "Oklahoma", "OK", "73122")
+
+
+def test_extract_address_script_uses_the_package():
+    expected = BASELINE["extract_address"]["outputs"]
+    assert list(extract_address(merged_text("heritage_landscape"))) == expected["heritage_landscape.txt"]
+    assert extract_address("") == (None, None, None, None)
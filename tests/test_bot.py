@@ -0,0 +1,52 @@
+import asyncio
+
+import bot
+from dedup import DuplicateIndex, minhash_signature
+from lien_extraction import get_merged_text
+from throttle import RetryPolicy, RetryQueue
+
+SUNSTATE = "fixtures/structured/sunstate_equipment.json"
+
+
+def test_near_duplicate_reuses_names_and_rereads_cheap_fields(tmp_path, monkeypatch, capsys):
+    index = DuplicateIndex(str(tmp_path / "duplicates.json"))
+    stale = {"claimant": "Sunstate Equipment Co., LLC", "contractor": None, "owner": None, "address": None,
+             "city": None, "state": None, "zipcode": None, "dollar": "1.00", "phone": None}
+    index.add("I1", "merged", minhash_signature(get_merged_text(SUNSTATE)), fields=stale)
+    monkeypatch.setattr(bot, "duplicate_index", index)
+    monkeypatch.setattr(bot, "gazetteer", None)
+
+    info = bot.parse_or_reuse("I2", SUNSTATE)
+    assert info["claimant"] == "Sunstate Equipment Co., LLC"
+    assert info["dollar"] == "23443.00"
+    assert info["duplicate_of"] == "I1 (1.00)"
+    assert "'dollar': ('1.00', '23443.00')" in capsys.readouterr().out
+
+
+def test_identical_text_layer_is_reused(tmp_path, monkeypatch):
+    index = DuplicateIndex(str(tmp_path / "duplicates.json"))
+    monkeypatch.setattr(bot, "duplicate_index", index)
+    pages = [get_merged_text(SUNSTATE)]
+    assert bot.reuse_text_layer_duplicate("I1", pages) is None
+    index.add("I1", "text_layer", None, fields={"dollar": "23443.00"})
+
+    assert bot.reuse_text_layer_duplicate("I2", pages) == {"dollar": "23443.00", "duplicate_of": "I1 (1.00)"}
+    assert bot.reuse_text_layer_duplicate("I3", [pages[0].replace("23,443.00", "23,443.01")]) is None
+
+
+def test_retry_drain_survives_non_retryable_errors(monkeypatch):
+    written = []
+
+    async def handle_document(page, journal, instrument_number, cell_values, doc_id, pdf_url):
+        if instrument_number == "I1":
+            raise RuntimeError("okcc returned 404")
+        return cell_values + ["parsed"]
+
+    monkeypatch.setattr(bot, "handle_document", handle_document)
+    monkeypatch.setattr(bot, "write_rows", lambda journal, rows: written.extend(rows))
+    retry_queue = RetryQueue(RetryPolicy(max_attempts=2, base_delay=0.0))
+    retry_queue.push(("I1", ["I1"], "1", "url"))
+    retry_queue.push(("I2", ["I2"], "2", "url"))
+
+    asyncio.run(bot.retry_failed_documents(None, retry_queue, None))
+    assert sorted(written) == [("I1", ["I1"], False), ("I2", ["I2", "parsed"], True)]
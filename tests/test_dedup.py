@@ -0,0 +1,52 @@
+from dedup import FLAG_THRESHOLD, REUSE_THRESHOLD, DuplicateIndex, diff_fields, minhash_signature, text_hash
+
+
+def merged_text(name):
+    with open(f"fixtures/merged_text/{name}.txt", encoding="utf-8") as file:
+        return file.read()
+
+
+def test_query_thresholds(tmp_path):
+    index = DuplicateIndex(str(tmp_path / "duplicates.json"))
+    text = merged_text("van_eaton_amended")
+    index.add("I1", "merged", minhash_signature(text), fields={"claimant": "Van Eaton"})
+
+    key, score, fields = index.query("merged", minhash_signature(text + " Amended."), FLAG_THRESHOLD)
+    assert key == "I1" and score >= REUSE_THRESHOLD and fields == {"claimant": "Van Eaton"}
+    assert index.query("merged", minhash_signature(merged_text("clark_construction")), FLAG_THRESHOLD) is None
+    assert index.query("merged", minhash_signature(text), FLAG_THRESHOLD, exclude="I1") is None
+    assert minhash_signature("too short to judge") is None
+
+
+def test_exact_hash_keeps_every_key(tmp_path):
+    index = DuplicateIndex(str(tmp_path / "duplicates.json"))
+    digest = text_hash(merged_text("sunstate_equipment"))
+    assert digest != text_hash(merged_text("sunstate_equipment").replace("23,443.00", "23,443.01"))
+
+    index.add_hash("I1", "text_layer", digest)
+    index.add_hash("I2", "text_layer", digest)
+    index.add("I2", "text_layer", None, fields={"dollar": "23443.00"})
+    assert index.hashes[("text_layer", digest)] == ["I1", "I2"]
+    # I1 has no fields yet, so the match is the key that does.
+    assert index.query_exact("text_layer", digest, exclude="I3") == ("I2", {"dollar": "23443.00"})
+    assert index.query_exact("text_layer", digest, exclude="I2") == ("I1", None)
+
+
+def test_save_merges_concurrent_workers(tmp_path):
+    path = str(tmp_path / "duplicates.json")
+    first, second = DuplicateIndex(path), DuplicateIndex(path)
+    first.add("I1", "merged", minhash_signature(merged_text("clark_construction")), fields={"claimant": "Clark"})
+    second.add("I2", "merged", minhash_signature(merged_text("paydar_properties")), fields={"claimant": "Paydar"})
+    first.save()
+    second.save()
+
+    assert set(second.documents) == {"I1", "I2"}
+    reloaded = DuplicateIndex(path)
+    assert set(reloaded.documents) == {"I1", "I2"}
+    assert reloaded.query("merged", minhash_signature(merged_text("clark_construction")))[0] == "I1"
+
+
+def test_diff_fields_ignores_duplicate_of():
+    old = {"dollar": "800.00", "phone": None, "duplicate_of": "I1 (0.97)"}
+    new = {"dollar": "850.00", "phone": None}
+    assert diff_fields(old, new) == {"dollar": ("800.00", "850.00")}
@@ -0,0 +1,53 @@
+from lien_extraction.gazetteer import Gazetteer, TokenAutomaton
+
+INFO = {"claimant": "Acme Roofing LLC", "contractor": None, "owner": "Smith Holdings LLC",
+        "phone": "+1-405-606-4448", "address": "4418 58th St", "city": "Oklahoma", "state": "OK", "zipcode": "73122"}
+LISTED = {"claimant": "ACME ROOFING, LLC", "contractor": "", "owner": "SMITH HOLDINGS LLC"}
+
+
+def test_automaton_finds_overlapping_phrases():
+    automaton = TokenAutomaton()
+    automaton.add(["acme", "roofing"], "short")
+    automaton.add(["acme", "roofing", "llc"], "long")
+    automaton.add(["roofing", "llc"], "suffix")
+    found = sorted(automaton.build().find("the acme roofing llc".split()))
+    assert found == [(1, 2, "short"), (1, 3, "long"), (2, 2, "suffix")]
+
+
+def test_lookup_only_returns_entities_known_in_the_role():
+    gazetteer = Gazetteer(None)
+    gazetteer.learn(INFO, LISTED)
+    window = "New Supplier Inc, furnished materials to Smith Holdings LLC"
+    assert gazetteer.lookup_name(window, "claimant") is None
+    gazetteer.learn(INFO, LISTED)
+    assert gazetteer.lookup_name(window, "claimant") is None
+    assert gazetteer.lookup_name(window, "owner") == "Smith Holdings LLC"
+    assert gazetteer.lookup_name("Claimant: ACME ROOFING, LLC 4418 58th St", "claimant") == "Acme Roofing LLC"
+    assert gazetteer.phone_in("Acme Roofing LLC (405) 606-4448") == "+1-405-606-4448"
+    assert gazetteer.entities["smith holdings llc"]["addresses"] == ["4418 58th St, Oklahoma, OK, 73122"]
+    # spaCy still parses the window for the claimant.
+    assert gazetteer.matches(window, "claimant") == [] and len(gazetteer.matches(window)) == 1
+
+
+def test_only_names_the_listing_confirms_are_learned():
+    gazetteer = Gazetteer(None)
+    gazetteer.learn(dict(INFO, claimant="Wrong Name LLC"), LISTED)
+    assert set(gazetteer.entities) == {"smith holdings llc"}
+    assert gazetteer.entities["smith holdings llc"]["phones"] == []
+
+    gazetteer.learn(dict(INFO, owner=None), {"claimant": "Someone Else LLC"})
+    assert set(gazetteer.entities) == {"smith holdings llc"}
+    assert gazetteer.stats["learned"] == 1
+
+
+def test_save_adds_up_concurrent_workers(tmp_path):
+    path = str(tmp_path / "gazetteer.json")
+    first, second = Gazetteer(path), Gazetteer(path)
+    first.learn(INFO, LISTED)
+    second.learn(INFO, LISTED)
+    first.save()
+    second.save()
+
+    entity = Gazetteer(path).entities["acme roofing llc"]
+    assert entity["seen"] == 2 and entity["roles"] == {"claimant": 2}
+    assert second.lookup_name("Claimant: Acme Roofing LLC", "claimant") == "Acme Roofing LLC"
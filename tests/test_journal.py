@@ -0,0 +1,36 @@
+from journal import CheckpointJournal
+
+
+def test_torn_last_line_is_skipped_and_terminated(tmp_path):
+    path = str(tmp_path / "checkpoint.jsonl")
+    journal = CheckpointJournal(path)
+    journal.record("I1", "downloaded")
+    journal.record("I1", "extracted", json_path="output/1/structuredData.json")
+    journal.close()
+    with open(path, "a", encoding="utf-8") as file:
+        file.write('{"instrument": "I1", "stage": "par')
+
+    journal = CheckpointJournal(path)
+    assert journal.stage("I1") == "extracted"
+    assert journal.data("I1") == {"json_path": "output/1/structuredData.json"}
+    journal.record("I2", "listed")
+    journal.close()
+
+    journal = CheckpointJournal(path)
+    assert journal.stage("I1") == "extracted" and journal.stage("I2") == "listed"
+    assert journal.unfinished() == ["I1", "I2"]
+    journal.close()
+
+
+def test_forget_starts_the_instrument_over(tmp_path):
+    path = str(tmp_path / "checkpoint.jsonl")
+    journal = CheckpointJournal(path)
+    journal.record("I1", "parsed", info={"claimant": "Acme Roofing LLC"})
+    assert journal.reached("I1", "extracted")
+    journal.forget("I1")
+    assert not journal.reached("I1", "downloaded")
+    journal.close()
+
+    journal = CheckpointJournal(path)
+    assert journal.stage("I1") is None and journal.data("I1") == {}
+    journal.close()
@@ -0,0 +1,20 @@
+from datetime import date, timedelta
+
+from mock_okcc import MockOkcc
+
+
+def test_search_filters_by_type_and_date():
+    site = MockOkcc(liens=50, days=30)
+    since = date.today() - timedelta(days=10)
+    rows = site.search("ML", since, date.today())
+    assert rows and all(site.by_docid[row["docid"]]["date"] >= since for row in rows)
+    assert len(rows) == sum(1 for lien in site.liens if lien["date"] >= since)
+    assert site.search("RL", None, None) == []
+    assert site.stats["search"] == 2
+
+
+def test_document_is_a_pdf_of_a_sample():
+    site = MockOkcc(liens=3)
+    assert site.document(site.liens[0]["docid"]).startswith(b"%PDF")
+    assert site.document("missing") is None
+    assert site.stats["document"] == 1
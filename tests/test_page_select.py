@@ -0,0 +1,14 @@
+from page_select import missing_required_fields, select_pages
+
+
+def test_select_pages_keeps_the_first_and_best_pages():
+    pages = ["Mechanic's lien", "Exhibit A legal description", "Claimant: Acme Owner: Smith Amount $800.00",
+             "Invoice", "Property address"]
+    assert select_pages(pages) == [0, 2, 4]
+    assert select_pages(pages[:3]) is None
+    assert select_pages(["", "", "", ""]) is None
+
+
+def test_only_claimant_and_amount_are_required():
+    assert missing_required_fields({"claimant": "Acme Roofing LLC", "dollar": "800.00", "address": None}) == []
+    assert missing_required_fields({"claimant": None, "dollar": "$0"}) == ["claimant", "dollar"]
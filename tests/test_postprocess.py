@@ -0,0 +1,27 @@
+import pandas as pd
+
+from lien_extraction.postprocess import normalize_amounts, normalize_phones, normalize_results, normalize_zips
+
+
+def test_amounts_phones_zips():
+    amounts = normalize_amounts(pd.Series(["22.692.92", "$ 1,650.00", "abc", None]))
+    assert amounts[:3].tolist() == ["$22692.92", "$1650.00", "$0"] and pd.isna(amounts[3])
+    assert normalize_phones(pd.Series(["+1-405-606-4448", "(405) 606-4448", "1 405 606 4448", "ext. 12"])).tolist() == [
+        "+1-405-606-4448", "+1-405-606-4448", "+1-405-606-4448", "ext. 12"]
+    assert normalize_zips(pd.Series(["73122", "73122 - 1234", "OK"])).tolist() == ["73122", "73122-1234", "OK"]
+
+
+def test_na_only_in_okcc_table_cells():
+    frame = pd.DataFrame({
+        "Instrument Number": ["I1", "I2", "I2"],
+        "Book": ["", "16042", "16042"],
+        "Claimant": ["N/A", None, "acme roofing, inc."],
+        "Owner": [None, None, "Smith Holdings LLC"],
+        "Property Address": [None, None, "4418 58th St"],
+        "Phone Number": [None, None, "+1-405-606-4448"],
+    })
+    rows = normalize_results(frame).to_dict("records")
+    assert len(rows) == 3
+    assert rows[0]["Book"] == "N/A" and rows[0]["Claimant"] == "N/A"
+    assert all(pd.isna(rows[1][column]) for column in ("Claimant", "Owner", "Property Address"))
+    assert rows[2]["Claimant"] == "acme roofing INC" and rows[2]["Phone Number"] == "+1-405-606-4448"
@@ -0,0 +1,49 @@
+import sqlite3
+
+from result_store import COLUMNS, HEADERS, ResultStore
+
+
+def row(instrument, claimant=None, dollar=None):
+    values = dict.fromkeys(HEADERS)
+    values.update({"Instrument Number": instrument, "Date Recorded": "03/25/2025", "Claimant": claimant,
+                   "Dollar Amount": dollar})
+    return values
+
+
+def test_only_extracted_rows_are_complete(tmp_path):
+    store = ResultStore(str(tmp_path / "results.db"))
+    store.upsert_rows([row("I1")])
+    assert store.has("I1") and not store.is_complete("I1")
+
+    store.upsert_rows([row("I1", "Acme Roofing LLC", "$800.00")], complete=True)
+    assert store.is_complete("I1")
+    # Listing the row again without its document data keeps the fields and the status.
+    store.upsert_rows([row("I1")])
+    assert store.is_complete("I1")
+    assert store.frame()["Claimant"].tolist() == ["Acme Roofing LLC"]
+    assert store.frame()["Date Recorded"].tolist() == ["2025-03-25"]
+    store.close()
+
+
+def test_reextraction_overwrites_wrong_values(tmp_path):
+    store = ResultStore(str(tmp_path / "results.db"))
+    store.upsert_rows([row("I1", "Wrong Name LLC", "$800.00")], complete=True)
+    store.upsert_rows([row("I1", None, "$850.00")], complete=True)
+    frame = store.frame()
+    assert frame["Claimant"].tolist() == [None] and frame["Dollar Amount"].tolist() == ["$850.00"]
+    store.close()
+
+
+def test_stores_from_before_statuses_are_migrated(tmp_path):
+    path = str(tmp_path / "results.db")
+    connection = sqlite3.connect(path)
+    columns = ", ".join(f"{column} TEXT" for column in COLUMNS.values() if column != "instrument_number")
+    connection.execute(f"CREATE TABLE results (instrument_number TEXT PRIMARY KEY, {columns}, updated_at REAL)")
+    connection.executemany("INSERT INTO results (instrument_number, dollar) VALUES (?, ?)",
+                           [("I1", "$800.00"), ("I2", None)])
+    connection.commit()
+    connection.close()
+
+    store = ResultStore(path)
+    assert store.is_complete("I1") and not store.is_complete("I2")
+    store.close()
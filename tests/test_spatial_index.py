@@ -0,0 +1,32 @@
+from lien_extraction.fields import CLAIMANT_LABELS
+from lien_extraction.spatial_index import ElementIndex
+
+
+def element(text, bounds, page=0):
+    return {"Text": text, "Bounds": list(bounds), "Page": page}
+
+
+def test_value_right_of_and_below_the_label():
+    index = ElementIndex([
+        element("Owner:", (72, 700, 110, 712)),
+        element("Smith Holdings LLC", (120, 700, 250, 712)),
+        element("Claimant", (72, 600, 130, 612)),
+        element("Acme Roofing LLC", (72, 585, 200, 597)),
+        element("1200 Walker Ave", (72, 570, 180, 582)),
+        element("Acme Roofing LLC", (72, 585, 200, 597), page=1),
+    ])
+    assert index.value_for("Owner") == "Smith Holdings LLC"
+    assert index.value_for("Claimant", lines=2) == "Acme Roofing LLC 1200 Walker Ave"
+    assert index.value_for("Contractor") is None
+
+
+def test_query_spans_grid_cells_and_pages():
+    index = ElementIndex([element("wide", (10, 10, 400, 20)), element("other page", (10, 10, 400, 20), page=1)])
+    assert index.query(0, (300, 0, 310, 30)) == [0]
+    assert index.query(0, (500, 0, 510, 30)) == []
+    assert index.query(1, (0, 0, 50, 50)) == [1]
+
+
+def test_claimant_block_of_a_fixture():
+    index = ElementIndex.from_json("fixtures/structured/blackmon_mooring.json")
+    assert index.value_for(CLAIMANT_LABELS, lines=4).startswith("BLACKMON MOORING OF OKC, LLC 1101 Enterprise Ave")
@@ -0,0 +1,66 @@
+import asyncio
+
+from throttle import AdaptiveLimiter, RetryableError, RetryPolicy, RetryQueue, call_with_retry, parse_retry_after
+
+
+def test_retry_after_seconds_and_garbage():
+    assert parse_retry_after("7") == 7.0
+    assert parse_retry_after("-3") == 0.0
+    assert parse_retry_after("soon") is None
+    assert parse_retry_after(None) is None
+
+
+def test_limiter_grows_on_success_and_halves_once_per_burst():
+    limiter = AdaptiveLimiter("test", initial=4, max_limit=8)
+
+    async def run():
+        started = [await limiter.acquire() for _ in range(2)]
+        await limiter.release(started[0], "throttled")
+        # A call already in flight when the limit dropped does not shrink it again.
+        await limiter.release(started[1], "throttled")
+        after_burst = limiter.limit
+        await limiter.release(await limiter.acquire(), "success")
+        return after_burst
+
+    assert asyncio.run(run()) == 2.0
+    assert limiter.limit == 2.5
+    assert limiter.stats == {"success": 1, "throttled": 2, "error": 0}
+
+
+def test_call_with_retry_retries_then_raises():
+    calls = []
+
+    async def flaky():
+        calls.append(1)
+        raise RetryableError("503", throttled=True)
+
+    policy = RetryPolicy(max_attempts=3, base_delay=0.0)
+    try:
+        asyncio.run(call_with_retry(AdaptiveLimiter("test"), flaky, policy))
+    except RetryableError:
+        pass
+    else:
+        raise AssertionError("expected RetryableError")
+    assert len(calls) == 3
+
+
+def test_retry_queue_pending_and_give_up():
+    queue = RetryQueue(RetryPolicy(max_attempts=2, base_delay=0.0))
+    queue.push(("I1", "doc 1"))
+    queue.push(("I2", "doc 2"))
+    assert sorted(queue.pending()) == [("I1", "doc 1"), ("I2", "doc 2")]
+
+    handled, given_up = [], []
+
+    async def handler(item):
+        handled.append(item[0])
+        if item[0] == "I1":
+            raise RetryableError("still failing")
+
+    async def on_give_up(item):
+        given_up.append(item[0])
+
+    asyncio.run(queue.drain(handler, on_give_up))
+    assert sorted(handled) == ["I1", "I1", "I2"]
+    assert given_up == ["I1"]
+    assert len(queue) == 0 and queue.pending() == []
@@ -0,0 +1,48 @@
+import asyncio
+
+from work_queue import PolitenessGate, SQLiteWorkQueue
+
+
+def test_lease_extend_complete_through_to_thread(tmp_path):
+    queue = SQLiteWorkQueue(str(tmp_path / "queue.db"))
+    queue.enqueue("document", "I2025-000001", {"doc_id": "1"})
+
+    async def work():
+        job = await asyncio.to_thread(queue.lease, "worker-a", ("document",), 60)
+        extended = await asyncio.to_thread(queue.extend, job, "worker-a", 60)
+        await asyncio.to_thread(queue.complete, job, "worker-a")
+        again = await asyncio.to_thread(queue.lease, "worker-a", ("document",), 60)
+        return job, extended, again
+
+    job, extended, again = asyncio.run(work())
+    assert job.key == "I2025-000001" and job.payload == {"doc_id": "1"} and job.attempts == 1
+    assert extended
+    assert again is None
+    assert queue.counts() == {"document": {"done": 1}}
+    queue.close()
+
+
+def test_gate_wait_from_the_event_loop(tmp_path):
+    gate = PolitenessGate(str(tmp_path / "queue.db"), min_interval=0.01)
+
+    async def wait_twice():
+        await gate.wait()
+        await gate.wait()
+
+    asyncio.run(wait_twice())
+    assert gate.reserve() > 0
+
+
+def test_enqueue_resets_only_failed_jobs(tmp_path):
+    queue = SQLiteWorkQueue(str(tmp_path / "queue.db"), max_attempts=1)
+    assert queue.enqueue("document", "I2025-000001", {"doc_id": "1"})
+    assert not queue.enqueue("document", "I2025-000001", {"doc_id": "1"})
+
+    job = queue.lease("worker-a", ("document",), 60)
+    assert queue.fail(job, "worker-a", "okcc kept failing")
+    assert queue.counts() == {"document": {"failed": 1}}
+
+    assert queue.enqueue("document", "I2025-000001", {"doc_id": "2"})
+    job = queue.lease("worker-a", ("document",), 60)
+    assert job.payload == {"doc_id": "2"} and job.attempts == 1
+    queue.close()
@@ -0,0 +1,170 @@
+"""
+Adaptive concurrency and retries for the upstream services (okcc document fetches, Adobe jobs).
+
+Each upstream gets an AdaptiveLimiter that grows its concurrency by one slot per window
+of successful calls and halves it when the service pushes back (429/503, quota errors),
+so throughput settles near the highest rate the service tolerates.
+"""
+
+import asyncio
+import heapq
+import itertools
+import random
+import time
+from email.utils import parsedate_to_datetime
+
+THROTTLE_STATUSES = (429, 503)
+TRANSIENT_STATUSES = (408, 500, 502, 504)
+
+
+class RetryableError(Exception):
+    """A failure worth retrying; throttled marks the upstream asking us to slow down."""
+
+    def __init__(self, message, retry_after=None, throttled=False):
+        super().__init__(message)
+        self.retry_after = retry_after
+        self.throttled = throttled
+
+
+def parse_retry_after(value):
+    """
+    Parse a Retry-After header (seconds or HTTP date) into seconds, or None.
+    """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class RetryPolicy:
+    def __init__(self, max_attempts=5, base_delay=1.0, max_delay=60.0):
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    def backoff(self, attempt, retry_after=None):
+        """
+        Exponential backoff with full jitter; a server-supplied Retry-After is a floor.
+        """
+        delay = random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+        if retry_after is not None:
+            delay = max(delay, min(retry_after, self.max_delay))
+        return delay
+
+
+class AdaptiveLimiter:
+    """
+    AIMD concurrency limit: +increase per window of successes, *decrease on throttling.
+    """
+
+    def __init__(self, name, initial=1, min_limit=1, max_limit=16, increase=1.0, decrease=0.5):
+        self.name = name
+        self.limit = float(initial)
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.increase = increase
+        self.decrease = decrease
+        self.in_flight = 0
+        self.last_decrease = 0.0
+        self.stats = {"success": 0, "throttled": 0, "error": 0}
+        self._condition = None
+
+    @property
+    def condition(self):
+        # Created lazily so the limiter can be built at import time, outside the event loop.
+        if self._condition is None:
+            self._condition = asyncio.Condition()
+        return self._condition
+
+    async def acquire(self) -> float:
+        async with self.condition:
+            await self.condition.wait_for(lambda: self.in_flight < int(self.limit))
+            self.in_flight += 1
+        return time.monotonic()
+
+    async def release(self, started, outcome):
+        async with self.condition:
+            self.in_flight -= 1
+            self.stats[outcome] += 1
+            if outcome == "success":
+                self.limit = min(self.max_limit, self.limit + self.increase / max(self.limit, 1.0))
+            elif outcome == "throttled" and started >= self.last_decrease:
+                # Only the first rejection of a burst counts; calls already in flight when we
+                # backed off would otherwise shrink the limit again for the same congestion.
+                self.limit = max(self.min_limit, self.limit * self.decrease)
+                self.last_decrease = time.monotonic()
+                print(f"⚠️ {self.name}: throttled, concurrency limit now {self.limit:.2f}")
+            self.condition.notify_all()
+
+
+async def call_with_retry(limiter, fn, policy, classify=None):
+    """
+    Run the coroutine factory fn under limiter, retrying RetryableErrors with backoff.
+
+    classify can map other exceptions to a RetryableError (or return None to re-raise).
+    """
+    for attempt in range(policy.max_attempts):
+        started = await limiter.acquire()
+        try:
+            result = await fn()
+        except Exception as e:
+            error = e if isinstance(e, RetryableError) else (classify(e) if classify else None)
+            if error is None:
+                await limiter.release(started, "error")
+                raise
+            await limiter.release(started, "throttled" if error.throttled else "error")
+            if attempt + 1 >= policy.max_attempts:
+                if error is e:
+                    raise
+                raise error from e
+            delay = policy.backoff(attempt, error.retry_after)
+            print(f"🔁 {limiter.name}: {error} (attempt {attempt + 1}/{policy.max_attempts}), retrying in {delay:.1f}s")
+            await asyncio.sleep(delay)
+        else:
+            await limiter.release(started, "success")
+            return result
+
+
+class RetryQueue:
+    """
+    Items whose calls exhausted their in-line retries, retried later in ready-time order.
+    """
+
+    def __init__(self, policy):
+        self.policy = policy
+        self.heap = []
+        self.counter = itertools.count()
+
+    def __len__(self):
+        return len(self.heap)
+
+    def pending(self) -> list:
+        """
+        The items still waiting for a retry, in no particular order.
+        """
+        return [item for _, _, _, item in self.heap]
+
+    def push(self, item, attempt=0, retry_after=None):
+        ready_at = time.monotonic() + self.policy.backoff(attempt, retry_after)
+        heapq.heappush(self.heap, (ready_at, next(self.counter), attempt, item))
+
+    async def drain(self, handler, on_give_up=None):
+        """
+        Retry every queued item with handler until it succeeds or runs out of attempts.
+        """
+        while self.heap:
+            ready_at, _, attempt, item = heapq.heappop(self.heap)
+            await asyncio.sleep(max(0.0, ready_at - time.monotonic()))
+            try:
+                await handler(item)
+            except RetryableError as e:
+                if attempt + 1 < self.policy.max_attempts:
+                    self.push(item, attempt + 1, e.retry_after)
+                elif on_give_up:
+                    await on_give_up(item)
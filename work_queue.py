@@ -0,0 +1,226 @@
+"""
+Leased job queue shared by bot workers, backed by one SQLite file.
+
+Workers on one host, or on several hosts sharing a volume, lease jobs for a visibility
+timeout and extend the lease while they work; a job whose worker died becomes leasable
+again once its lease expires. Job keys are unique, so enqueueing the same instrument
+twice is a no-op unless its job failed for good. PolitenessGate spaces requests to okcc
+across every worker using the same database, so adding workers never raises the rate
+okcc sees above the configured one.
+
+By default the database runs in WAL mode, which needs shared memory between the
+processes using it and so only works on one host. Workers on several hosts set
+SQLITE_JOURNAL_MODE=DELETE on every host: the rollback journal needs only the volume's
+file locks (NFSv4 or SMB; not NFS without lockd).
+"""
+
+import asyncio
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import namedtuple
+
+WORK_QUEUE_DB = os.getenv("WORK_QUEUE_DB", "work_queue.db")
+# WAL on one host, DELETE when the databases live on a volume shared by several hosts.
+SQLITE_JOURNAL_MODE = os.getenv("SQLITE_JOURNAL_MODE", "WAL").upper()
+LEASE_SECONDS = float(os.getenv("WORK_LEASE_SECONDS", "300"))
+MAX_ATTEMPTS = int(os.getenv("WORK_MAX_ATTEMPTS", "5"))
+
+Job = namedtuple("Job", ["id", "kind", "key", "payload", "attempts"])
+
+
+def connect(path: str) -> sqlite3.Connection:
+    # Autocommit mode so transactions are opened explicitly with BEGIN IMMEDIATE. Workers
+    # call in through asyncio.to_thread, so the connection is shared across threads and
+    # every use goes through its owner's lock.
+    connection = sqlite3.connect(path, timeout=30, isolation_level=None, check_same_thread=False)
+    connection.execute(f"PRAGMA journal_mode={SQLITE_JOURNAL_MODE}")
+    # Without WAL every commit is synced, so another host never reads a torn write.
+    connection.execute("PRAGMA synchronous=NORMAL" if SQLITE_JOURNAL_MODE == "WAL" else "PRAGMA synchronous=FULL")
+    return connection
+
+
+class SQLiteWorkQueue:
+    def __init__(self, path=WORK_QUEUE_DB, max_attempts=MAX_ATTEMPTS):
+        self.path = path
+        self.max_attempts = max_attempts
+        self.lock = threading.Lock()
+        self.connection = connect(path)
+        self.connection.executescript("""
+            CREATE TABLE IF NOT EXISTS jobs (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                kind TEXT NOT NULL,
+                key TEXT NOT NULL UNIQUE,
+                payload TEXT NOT NULL,
+                status TEXT NOT NULL DEFAULT 'pending',
+                attempts INTEGER NOT NULL DEFAULT 0,
+                available_at REAL NOT NULL DEFAULT 0,
+                lease_owner TEXT,
+                lease_expires REAL,
+                error TEXT,
+                updated_at REAL
+            );
+            CREATE INDEX IF NOT EXISTS jobs_ready ON jobs (status, kind, available_at);
+        """)
+
+    def transaction(self):
+        return Transaction(self.connection, self.lock)
+
+    def enqueue(self, kind, key, payload, replace=False) -> bool:
+        """
+        Add a job unless one with this key exists; replace=True resets an existing one to pending.
+
+        A job that failed for good is reset either way, so listing its instrument again retries it.
+        """
+        now = time.time()
+        with self.transaction():
+            if replace:
+                self.connection.execute(
+                    "INSERT INTO jobs (kind, key, payload, updated_at) VALUES (?, ?, ?, ?) "
+                    "ON CONFLICT (key) DO UPDATE SET payload = excluded.payload, status = 'pending', "
+                    "attempts = 0, available_at = 0, lease_owner = NULL, lease_expires = NULL, error = NULL, "
+                    "updated_at = excluded.updated_at",
+                    (kind, key, json.dumps(payload), now))
+                return True
+            cursor = self.connection.execute(
+                "INSERT INTO jobs (kind, key, payload, updated_at) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT (key) DO UPDATE SET payload = excluded.payload, status = 'pending', attempts = 0, "
+                "available_at = 0, error = NULL, updated_at = excluded.updated_at WHERE status = 'failed'",
+                (kind, key, json.dumps(payload), now))
+            return cursor.rowcount > 0
+
+    def lease(self, owner, kinds, lease_seconds=LEASE_SECONDS):
+        """
+        Lease the oldest ready job of one of kinds, or None. Expired leases count as ready.
+        """
+        now = time.time()
+        placeholders = ", ".join("?" * len(kinds))
+        with self.transaction():
+            row = self.connection.execute(
+                f"SELECT id, kind, key, payload, attempts FROM jobs "
+                f"WHERE kind IN ({placeholders}) AND available_at <= ? "
+                f"AND (status = 'pending' OR (status = 'leased' AND lease_expires < ?)) "
+                f"ORDER BY available_at, id LIMIT 1",
+                (*kinds, now, now)).fetchone()
+            if row is None:
+                return None
+            self.connection.execute(
+                "UPDATE jobs SET status = 'leased', lease_owner = ?, lease_expires = ?, attempts = attempts + 1, "
+                "updated_at = ? WHERE id = ?",
+                (owner, now + lease_seconds, now, row[0]))
+        job_id, kind, key, payload, attempts = row
+        return Job(job_id, kind, key, json.loads(payload), attempts + 1)
+
+    def extend(self, job, owner, lease_seconds=LEASE_SECONDS) -> bool:
+        """
+        Push the lease out; False means the lease expired and another worker took the job.
+        """
+        with self.transaction():
+            cursor = self.connection.execute(
+                "UPDATE jobs SET lease_expires = ? WHERE id = ? AND status = 'leased' AND lease_owner = ?",
+                (time.time() + lease_seconds, job.id, owner))
+            return cursor.rowcount > 0
+
+    def complete(self, job, owner):
+        with self.transaction():
+            self.connection.execute(
+                "UPDATE jobs SET status = 'done', lease_owner = NULL, lease_expires = NULL, error = NULL, "
+                "updated_at = ? WHERE id = ? AND lease_owner = ?",
+                (time.time(), job.id, owner))
+
+    def fail(self, job, owner, error, retry_delay=0.0) -> bool:
+        """
+        Release a failed job for a later retry; returns True once it ran out of attempts.
+        """
+        gave_up = job.attempts >= self.max_attempts
+        with self.transaction():
+            self.connection.execute(
+                "UPDATE jobs SET status = ?, available_at = ?, lease_owner = NULL, lease_expires = NULL, "
+                "error = ?, updated_at = ? WHERE id = ? AND lease_owner = ?",
+                ("failed" if gave_up else "pending", time.time() + retry_delay, str(error), time.time(), job.id, owner))
+        return gave_up
+
+    def counts(self) -> dict:
+        counts = {}
+        with self.lock:
+            rows = self.connection.execute("SELECT kind, status, COUNT(*) FROM jobs GROUP BY kind, status").fetchall()
+        for kind, status, count in rows:
+            counts.setdefault(kind, {})[status] = count
+        return counts
+
+    def outstanding(self, kinds) -> int:
+        """
+        Jobs of kinds that are pending or leased, i.e. not done or failed for good.
+        """
+        placeholders = ", ".join("?" * len(kinds))
+        with self.lock:
+            return self.connection.execute(
+                f"SELECT COUNT(*) FROM jobs WHERE kind IN ({placeholders}) AND status IN ('pending', 'leased')",
+                kinds).fetchone()[0]
+
+    def close(self):
+        with self.lock:
+            self.connection.close()
+
+
+class Transaction:
+    """
+    BEGIN IMMEDIATE ... COMMIT, so concurrent leases serialize on SQLite's write lock.
+
+    The thread lock keeps two threads from interleaving statements on the shared connection.
+    """
+
+    def __init__(self, connection, lock):
+        self.connection = connection
+        self.lock = lock
+
+    def __enter__(self):
+        self.lock.acquire()
+        try:
+            self.connection.execute("BEGIN IMMEDIATE")
+        except BaseException:
+            self.lock.release()
+            raise
+        return self.connection
+
+    def __exit__(self, exc_type, exc, traceback):
+        try:
+            self.connection.execute("ROLLBACK" if exc_type else "COMMIT")
+        finally:
+            self.lock.release()
+
+
+class PolitenessGate:
+    """
+    Global minimum interval between requests, shared through a SQLite row.
+
+    Each caller reserves the next free slot in one transaction and sleeps until it, so N
+    workers together never exceed one request per min_interval.
+    """
+
+    def __init__(self, path=WORK_QUEUE_DB, name="okcc", min_interval=1.0):
+        self.name = name
+        self.min_interval = min_interval
+        self.lock = threading.Lock()
+        self.connection = connect(path)
+        self.connection.execute("CREATE TABLE IF NOT EXISTS gates (name TEXT PRIMARY KEY, next_at REAL NOT NULL)")
+
+    def reserve(self) -> float:
+        """
+        Reserve a slot and return the seconds to wait for it.
+        """
+        now = time.time()
+        with Transaction(self.connection, self.lock):
+            row = self.connection.execute("SELECT next_at FROM gates WHERE name = ?", (self.name,)).fetchone()
+            slot = max(now, row[0] if row else 0.0)
+            self.connection.execute(
+                "INSERT INTO gates (name, next_at) VALUES (?, ?) ON CONFLICT (name) DO UPDATE SET next_at = excluded.next_at",
+                (self.name, slot + self.min_interval))
+        return slot - now
+
+    async def wait(self):
+        delay = await asyncio.to_thread(self.reserve)
+        if delay > 0:
+            await asyncio.sleep(delay)
@@ -0,0 +1,229 @@
+"""
+Coordinator and workers sharing one backfill through work_queue.py.
+
+    python worker.py enqueue --from 2025-01-01 --to 2025-03-31 --shard-days 7
+    python worker.py work --id a                  # as many as you like, on any host
+    python worker.py status
+
+The coordinator splits the date range into "shard" jobs. A worker leasing a shard runs the
+search for it, walks every results page and enqueues one "document" job per lien (the PDF
+URL comes from the viewer, so listing stays in the shard job). Document jobs fetch,
+de-watermark, extract and parse exactly like bot.py and upsert the row into the shared
+result store. Every okcc request from every worker passes one PolitenessGate.
+
+The queue and the result store are SQLite databases, and duplicates.json and gazetteer.json
+are merged under file locks. Workers on several hosts put all of them on one shared volume,
+run from it, and set SQLITE_JOURNAL_MODE=DELETE (see work_queue.py).
+"""
+
+import argparse
+import asyncio
+import os
+import socket
+import sys
+import time
+from datetime import date, timedelta
+
+from playwright.async_api import async_playwright
+
+import bot
+from journal import CheckpointJournal
+from session import BrowserSession
+from throttle import RetryableError
+from work_queue import LEASE_SECONDS, WORK_QUEUE_DB, PolitenessGate, SQLiteWorkQueue
+
+OKCC_MIN_INTERVAL = float(os.getenv("OKCC_MIN_INTERVAL", "1.0"))
+POLL_SECONDS = 5.0
+KINDS = ("shard", "document")
+
+
+def date_shards(date_from: date, date_to: date, days: int) -> list:
+    shards = []
+    start = date_from
+    while start <= date_to:
+        end = min(date_to, start + timedelta(days=days - 1))
+        shards.append((start, end))
+        start = end + timedelta(days=1)
+    return shards
+
+
+def enqueue_shards(queue, date_from, date_to, days, replace=False) -> int:
+    added = 0
+    for start, end in date_shards(date_from, date_to, days):
+        payload = {"date_from": start.isoformat(), "date_to": end.isoformat()}
+        added += queue.enqueue("shard", f"shard:{start.isoformat()}:{end.isoformat()}", payload, replace=replace)
+    return added
+
+
+async def keep_leased(queue, job, owner, lease_seconds):
+    while True:
+        await asyncio.sleep(lease_seconds / 3)
+        if not await asyncio.to_thread(queue.extend, job, owner, lease_seconds):
+            print(f"⚠️ Lost the lease on {job.key}; another worker may be running it.")
+            return
+
+
+async def handle_shard(session, queue, job, refresh):
+    date_from = date.fromisoformat(job.payload["date_from"])
+    date_to = date.fromisoformat(job.payload["date_to"])
+    page = session.page
+    await bot.run_search(page, date_from, date_to)
+    num_pages = await bot.count_results_pages(page)
+    print(f"Shard {date_from} - {date_to}: {num_pages} results pages.")
+    current_page = 0
+
+    async def restore(page):
+        print(f"Restoring shard {date_from} - {date_to} on results page {current_page + 1}.")
+        await bot.run_search(page, date_from, date_to)
+        await bot.goto_results_page(page, current_page)
+
+    for page_index in range(num_pages):
+        listed = []
+        for row in await page.query_selector_all(bot.TABLE_ROW_SELECTOR):
+            instrument_number, doc_id, cell_values = await bot.read_row(row)
+            if not instrument_number:
+                listed.append(cell_values)
+                continue
+            if not refresh and bot.result_store.is_complete(instrument_number):
+                continue
+
+            pdf_url = await bot.open_pdf_viewer(page, key=instrument_number, docid=doc_id)
+            session.count_documents()
+            await asyncio.sleep(bot.ROW_DELAY_SECONDS)
+            if not pdf_url:
+                listed.append(cell_values)
+                continue
+            payload = {"instrument_number": instrument_number, "doc_id": doc_id,
+                       "cell_values": cell_values, "pdf_url": pdf_url, "enqueued_at": time.time()}
+            queue.enqueue("document", instrument_number, payload, replace=refresh)
+
+        # Rows without a document have nothing to process; store them as listed.
+        bot.result_store.upsert_rows(listed)
+        if page_index + 1 < num_pages:
+            current_page = page_index + 1
+            reason = session.recycle_reason()
+            if reason:
+                page = await session.recycle(reason, restore)
+            else:
+                await page.click(bot.NEXT_PAGE_SELECTOR)
+
+
+async def handle_document(page, journal, job):
+    payload = job.payload
+    instrument_number = payload["instrument_number"]
+    # The journal resumes retries of this job; checkpoints of an earlier enqueue of the
+    # instrument (e.g. before a --refresh replaced the job) must not be reused.
+    if journal.data(instrument_number).get("enqueued_at") != payload.get("enqueued_at"):
+        if journal.stage(instrument_number) is not None:
+            journal.forget(instrument_number)
+        journal.record(instrument_number, "listed", enqueued_at=payload.get("enqueued_at"))
+    cell_values = await bot.handle_document(page, journal, payload["instrument_number"], list(payload["cell_values"]),
+                                            payload["doc_id"], payload["pdf_url"])
+    bot.write_rows(journal, [(payload["instrument_number"], cell_values, True)])
+
+
+async def run_worker(queue, worker_id, kinds, lease_seconds, refresh, exit_when_idle):
+    bot.open_services()
+    journal = CheckpointJournal(f"checkpoint-{worker_id}.jsonl")
+
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(headless=bot.HEADLESS)
+
+        async def open_site(page):
+            # Document fetches go through page.request and need the site's session cookies.
+            await page.goto(bot.TARGET_URL, timeout=60000)
+
+        session = BrowserSession(browser, restore=open_site)
+        await open_site(await session.open())
+
+        processed = 0
+        while True:
+            job = await asyncio.to_thread(queue.lease, worker_id, kinds, lease_seconds)
+            if job is None:
+                if exit_when_idle and queue.outstanding(kinds) == 0:
+                    break
+                await asyncio.sleep(POLL_SECONDS)
+                continue
+
+            print(f"▶️ {worker_id}: {job.kind} {job.key} (attempt {job.attempts})")
+            heartbeat = asyncio.create_task(keep_leased(queue, job, worker_id, lease_seconds))
+            try:
+                if job.kind == "shard":
+                    await handle_shard(session, queue, job, refresh)
+                else:
+                    await handle_document(session.page, journal, job)
+                    session.count_documents()
+            except RetryableError as e:
+                if queue.fail(job, worker_id, e, retry_delay=e.retry_after or bot.retry_policy.backoff(job.attempts)):
+                    give_up(journal, job)
+            except Exception as e:
+                print(f"❌ {worker_id}: {job.key} failed: {e}")
+                if queue.fail(job, worker_id, e, retry_delay=bot.retry_policy.backoff(job.attempts)):
+                    give_up(journal, job)
+            else:
+                queue.complete(job, worker_id)
+                processed += 1
+            finally:
+                heartbeat.cancel()
+            await session.maybe_recycle()
+
+        print(f"{worker_id}: processed {processed} jobs; okcc limiter {bot.okcc_limiter.stats}, "
+              f"adobe limiter {bot.adobe_limiter.stats}, browser session {session.stats}")
+        if exit_when_idle:
+            # The backfill is drained; normalize what every worker wrote.
+            bot.result_store.normalize()
+        bot.tracer.export()
+        journal.close()
+        await session.close()
+        await browser.close()
+
+
+def give_up(journal, job):
+    print(f"❌ {job.key}: giving up after {job.attempts} attempts.")
+    if job.kind == "document":
+        bot.write_rows(journal, [(job.payload["instrument_number"], job.payload["cell_values"], False)])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Share one okcc backfill between several bot workers.")
+    parser.add_argument("--queue", default=WORK_QUEUE_DB, help="SQLite work queue file (on a shared volume)")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    enqueue = commands.add_parser("enqueue", help="split a date range into shard jobs")
+    enqueue.add_argument("--from", dest="date_from", type=date.fromisoformat)
+    enqueue.add_argument("--to", dest="date_to", type=date.fromisoformat)
+    enqueue.add_argument("--shard-days", type=int, default=7)
+    enqueue.add_argument("--refresh", action="store_true", help="re-run shards that were already done")
+
+    work = commands.add_parser("work", help="lease and run jobs until stopped")
+    work.add_argument("--id", default=f"{socket.gethostname()}-{os.getpid()}")
+    work.add_argument("--kinds", nargs="+", choices=KINDS, default=list(KINDS))
+    work.add_argument("--lease-seconds", type=float, default=LEASE_SECONDS)
+    work.add_argument("--min-interval", type=float, default=OKCC_MIN_INTERVAL,
+                      help="seconds between okcc requests across all workers")
+    work.add_argument("--refresh", action="store_true",
+                      help=f"re-process instruments already complete in {bot.RESULT_DB}")
+    work.add_argument("--exit-when-idle", action="store_true")
+
+    commands.add_parser("status", help="print job counts")
+
+    args = parser.parse_args(argv)
+    queue = SQLiteWorkQueue(args.queue)
+    try:
+        if args.command == "enqueue":
+            default_from, default_to = bot.default_date_range()
+            added = enqueue_shards(queue, args.date_from or default_from, args.date_to or default_to,
+                                   args.shard_days, replace=args.refresh)
+            print(f"Enqueued {added} shards.")
+        elif args.command == "work":
+            bot.okcc_gate = PolitenessGate(args.queue, "okcc", args.min_interval)
+            asyncio.run(run_worker(queue, args.id, args.kinds, args.lease_seconds, args.refresh,
+                                   args.exit_when_idle))
+        print(queue.counts())
+    finally:
+        queue.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())